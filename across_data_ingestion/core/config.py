@@ -23,9 +23,19 @@ class Config(BaseConfig):
     ACROSS_SERVER_SECRET: str = "local-service-account-key"
     ACROSS_SERVER_ID_PATH: str = "data-ingestion/core-server/client_id"
     ACROSS_SERVER_SECRET_PATH: str = "data-ingestion/core-server/client_secret"
+    SPACETRACK_USER_PATH: str = "spacetrack/username"
+    SPACETRACK_PWD_PATH: str = "spacetrack/password"
+
+    # Local directory for on-disk caches
+    CACHE_DIR: str = ".cache"
 
     AWS_REGION: str = "us-east-2"
     AWS_PROFILE: str | None = None
+    # Optional endpoint override, e.g. a local moto server
+    AWS_ENDPOINT_URL: str | None = None
+
+    # Seconds SSM parameters are cached for before being fetched again
+    SSM_CACHE_TTL_SECONDS: int = 300
 
     # Logging
     LOG_LEVEL: str = "DEBUG"
@@ -45,6 +55,15 @@ class Config(BaseConfig):
     def is_local(self):
         return self.RUNTIME_ENV == Environments.LOCAL
 
+    def ssm_parameter_names(self) -> list[str]:
+        """Names of the SSM parameters this service reads under APP_ENV"""
+        return [
+            self.ACROSS_SERVER_ID_PATH,
+            self.ACROSS_SERVER_SECRET_PATH,
+            self.SPACETRACK_USER_PATH,
+            self.SPACETRACK_PWD_PATH,
+        ]
+
     def base_url(self):
         return f"{self.HOST}:{self.PORT}{self.ROOT_PATH}"
 
@@ -1,12 +1,18 @@
 from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
 
+import numpy as np
+import numpy.typing as npt
 import structlog
-from astropy.table import Row, Table, join  # type: ignore[import-untyped]
-from astropy.time import Time  # type: ignore[import-untyped]
+from astropy.table import Table, join  # type: ignore[import-untyped]
+from astropy.time import TimeDelta  # type: ignore[import-untyped]
 from fastapi_utilities import repeat_at  # type: ignore
 
+from ....core import config
 from ....util.across_server import client, sdk
-from ....util.vo_service import VOService
+from ....util.table_cache import TableCache
+from ....util.time_conversion import to_time
+from ....util.vo_service import ResultFormat, VOService
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger()
 
@@ -73,47 +79,112 @@ CHANDRA_OBSERVATION_TYPES: dict[str, sdk.ObservationType] = {
 
 CHANDRA_TAP_URL = "https://cda.cfa.harvard.edu/cxctap/async"
 
+# Cache TAP results when running locally to avoid re-querying while debugging
+CHANDRA_TAP_CACHE_TTL = timedelta(hours=1)
 
-def match_instrument_from_tap_observation(
-    instruments_by_short_name: dict[str, sdk.TelescopeInstrument], tap_obs: Row
-) -> sdk.TelescopeInstrument:
+
+class ChandraObservation(NamedTuple):
+    """Values of a TAP observation row converted for the ACROSS observation"""
+
+    obs_id: str
+    target_name: str
+    begin: str
+    end: str
+    ra: float
+    dec: float
+    exposure_time: float
+    instrument_short_name: str
+
+
+def match_instrument_short_names(tap_observations: Table) -> npt.NDArray[np.str_]:
     """
-    Constructs the instrument name from the observation parameters and
-    returns both the name and the instrument id in across-server
+    Constructs the instrument short name of every observation from the
+    instrument, grating and exposure_mode columns, with one mask per rule
+    instead of branching row by row. Unmatched observations get "".
     """
+    instrument = np.asarray(tap_observations["instrument"]).astype(str)
+    grating = np.asarray(tap_observations["grating"]).astype(str)
+    exposure_mode = np.asarray(tap_observations["exposure_mode"]).astype(str)
+
+    is_acis = np.char.find(instrument, "ACIS") >= 0
+    is_hrc = ~is_acis & (np.char.find(instrument, "HRC") >= 0)
+    has_grating = np.isin(grating, ["HETG", "LETG"])
+    no_grating = grating == "NONE"
+
+    # the rules are checked in order, the first match wins
+    return np.select(
+        [
+            is_acis & no_grating & (exposure_mode != "CC"),
+            is_acis & has_grating,
+            is_acis & (exposure_mode == "CC"),
+            is_hrc & (exposure_mode != ""),
+            is_hrc & no_grating,
+            is_hrc & has_grating,
+        ],
+        [
+            "ACIS",
+            np.char.add("ACIS-", grating),
+            "ACIS-CC",
+            "HRC-Timing",
+            "HRC",
+            np.char.add("HRC-", grating),
+        ],
+        default="",
+    )
+
 
-    short_name = None
-    if "ACIS" in tap_obs["instrument"]:
-        if tap_obs["grating"] == "NONE" and tap_obs["exposure_mode"] != "CC":
-            short_name = "ACIS"
-        elif tap_obs["grating"] in ["HETG", "LETG"]:
-            short_name = f"ACIS-{tap_obs['grating']}"
-        elif tap_obs["exposure_mode"] == "CC":
-            short_name = "ACIS-CC"
-
-    elif "HRC" in tap_obs["instrument"]:
-        if tap_obs["exposure_mode"] != "":
-            short_name = "HRC-Timing"
-        elif tap_obs["grating"] == "NONE":
-            short_name = "HRC"
-        elif tap_obs["grating"] in ["HETG", "LETG"]:
-            short_name = f"HRC-{tap_obs['grating']}"
-
-    if not short_name:
+def match_instrument(
+    instruments_by_short_name: dict[str, sdk.TelescopeInstrument],
+    observation: ChandraObservation,
+) -> sdk.TelescopeInstrument:
+    """
+    Returns the instrument in across-server for the matched short name,
+    logging the observation when its instrument could not be matched
+    """
+    if not observation.instrument_short_name:
         logger.warning(
             "Could not parse observation parameters for correct instrument",
-            tap_observation=tap_obs,
+            tap_observation=observation,
         )
         return sdk.TelescopeInstrument(
             id="", name="", short_name="", created_on=datetime.now()
         )
 
-    return instruments_by_short_name[short_name]
+    return instruments_by_short_name[observation.instrument_short_name]
+
+
+def prepare_observations(tap_observations: Table) -> list[ChandraObservation]:
+    """
+    Converts the end times, instrument short names and coordinates of the
+    TAP observations as whole columns, so the ingest loop only assembles
+    the ACROSS models
+    """
+    begins = np.asarray(tap_observations["start_date"]).astype(str)
+    exposure_times = np.asarray(tap_observations["t_plan_exptime"], dtype=float)
+    ends = (
+        to_time(begins, format="isot") + TimeDelta(exposure_times, format="sec")
+    ).isot
+
+    return [
+        ChandraObservation(*values)
+        for values in zip(
+            np.asarray(tap_observations["obs_id"]).astype(str).tolist(),
+            np.asarray(tap_observations["target_name"]).astype(str).tolist(),
+            begins.tolist(),
+            ends.tolist(),
+            np.asarray(tap_observations["ra"], dtype=float).tolist(),
+            np.asarray(tap_observations["dec"], dtype=float).tolist(),
+            exposure_times.tolist(),
+            match_instrument_short_names(tap_observations).tolist(),
+        )
+    ]
 
 
 def create_schedule(telescope_id: str, tap_observations: Table) -> sdk.ScheduleCreate:
-    begin = f"{min([data['start_date'] for data in tap_observations])}"
-    end = f"{max([data['start_date'] for data in tap_observations])}"
+    # isot strings sort chronologically, numpy has no min/max for strings
+    start_dates = np.sort(np.asarray(tap_observations["start_date"]).astype(str))
+    begin = str(start_dates[0])
+    end = str(start_dates[-1])
 
     return sdk.ScheduleCreate(
         telescope_id=telescope_id,
@@ -129,9 +200,20 @@ def create_schedule(telescope_id: str, tap_observations: Table) -> sdk.ScheduleC
 
 async def get_observation_data_from_tap() -> Table:
     """Query Chandra TAP service to get most of the observation parameters"""
-    async with VOService(CHANDRA_TAP_URL) as vo_service:
-        # Query for initial parameters
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    cache = (
+        TableCache("chandra_tap", ttl=CHANDRA_TAP_CACHE_TTL)
+        if config.is_local()
+        else None
+    )
+
+    async with VOService(
+        CHANDRA_TAP_URL, result_format=ResultFormat.VOTABLE_BINARY2, cache=cache
+    ) as vo_service:
+        # Query for initial parameters. When caching, the current time is
+        # truncated to the hour so repeated runs produce the same query text
+        now = datetime.now(timezone.utc)
+        if cache:
+            now = now.replace(minute=0, second=0, microsecond=0)
         observations_query = (
             "SELECT "
             "   o.obsid, "
@@ -143,7 +225,7 @@ async def get_observation_data_from_tap() -> Table:
             "   o.exposure_mode "
             "FROM cxc.observation o "
             "WHERE "
-            f"  o.start_date > '{now}' AND o.status='scheduled' "
+            f"  o.start_date > '{now:%Y-%m-%d %H:%M:%S}' AND o.status='scheduled' "
             "ORDER BY "
             "   o.start_date DESC"
         )
@@ -155,7 +237,7 @@ async def get_observation_data_from_tap() -> Table:
 
         # Query for exposure times needs ids to be strings, since
         # they are VARCHARs in from TAP Schema
-        obs_ids = "', '".join(str(obsid["obsid"]) for obsid in observations_table)
+        obs_ids = [str(obsid) for obsid in observations_table["obsid"]]
 
         exposure_times_query = (
             "SELECT "
@@ -164,9 +246,13 @@ async def get_observation_data_from_tap() -> Table:
             "   t_plan_exptime "
             "FROM ivoa.obsplan "
             "WHERE "
-            f"   obs_id in ('{obs_ids}')"
+            "   obs_id in ({keys})"
+        )
+        # the obsids are looked up in bounded chunks, each returning one
+        # exposure time record per observation
+        exposure_times_table = await vo_service.query_by_keys(
+            exposure_times_query, keys=obs_ids, expected_rows_per_key=1
         )
-        exposure_times_table = await vo_service.query(exposure_times_query)
 
         if not exposure_times_table:
             logger.warning("No exposure times for observations found")
@@ -193,33 +279,23 @@ async def get_observation_data_from_tap() -> Table:
 
 
 def transform_to_observation(
-    tap_obs: Row, instrument: sdk.TelescopeInstrument
+    observation: ChandraObservation, instrument: sdk.TelescopeInstrument
 ) -> sdk.ObservationCreate:
-    begin = tap_obs["start_date"]
-    end = (
-        Time(begin, format="isot") + timedelta(seconds=tap_obs["t_plan_exptime"])
-    ).isot
+    position = sdk.Coordinate(ra=observation.ra, dec=observation.dec)
 
     return sdk.ObservationCreate(
         instrument_id=instrument.id,
-        object_name=tap_obs["target_name"],
-        pointing_position=sdk.Coordinate(
-            ra=float(tap_obs["ra"]),
-            dec=float(tap_obs["dec"]),
-        ),
-        object_position=sdk.Coordinate(
-            ra=float(tap_obs["ra"]),
-            dec=float(tap_obs["dec"]),
+        object_name=observation.target_name,
+        pointing_position=position,
+        object_position=position,
+        date_range=sdk.DateRange.model_validate(
+            {"begin": observation.begin, "end": observation.end}
         ),
-        date_range=sdk.DateRange(
-            begin=begin,
-            end=end,
-        ),
-        external_observation_id=tap_obs["obs_id"],
+        external_observation_id=observation.obs_id,
         type=CHANDRA_OBSERVATION_TYPES[instrument.short_name or ""],
         status=sdk.ObservationStatus.SCHEDULED,
         pointing_angle=0.0,
-        exposure_time=float(tap_obs["t_plan_exptime"]),
+        exposure_time=observation.exposure_time,
         bandpass=CHANDRA_BANDPASSES[instrument.short_name or ""],
     )
 
@@ -253,10 +329,8 @@ async def ingest() -> None:
         if instrument.short_name
     }
 
-    for observation_data in tap_observation_table:
-        instrument = match_instrument_from_tap_observation(
-            instruments_by_short_name, observation_data
-        )
+    for observation_data in prepare_observations(tap_observation_table):
+        instrument = match_instrument(instruments_by_short_name, observation_data)
         observation = transform_to_observation(observation_data, instrument)
         schedule.observations.append(observation)
 
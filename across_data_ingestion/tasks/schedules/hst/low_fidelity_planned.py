@@ -1,17 +1,19 @@
+import re
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from itertools import accumulate
 from typing import NamedTuple, Type, cast
 
-import astropy.units as u  # type: ignore[import-untyped]
-import bs4
 import httpx
+import numpy as np
 import pandas as pd
 import pydantic
 import structlog
-from astropy.coordinates import SkyCoord  # type: ignore[import-untyped]
 from fastapi_utilities import repeat_at  # type: ignore
 
 from ....util.across_server import client, sdk
-from ..types import Position
+from ....util.coordinates import dms_to_degrees, hms_to_degrees
+from ....util.fixed_width import FixedWidthColumn, read_fixed_width
 
 
 def get_logger() -> structlog.stdlib.BoundLogger:
@@ -68,6 +70,22 @@ TIMELINE_FILE_COLUMNS: list[Col] = [
     Col(name="ex", type=str, spacing=(143, 146)),
 ]
 
+TIMELINE_FILE_FIXED_WIDTH_COLUMNS = [
+    FixedWidthColumn(c.name, *c.spacing, type=c.type) for c in TIMELINE_FILE_COLUMNS
+]
+
+# Timeline files are linked from the directory listing as "timeline_MM_DD_YY"
+TIMELINE_LINK_PATTERN = re.compile(r"""href=(["'])(timeline_\d{2}_\d{2}_\d{2})\1""")
+TIMELINE_LINK_DATE_FORMAT = "timeline_%m_%d_%y"
+# Characters kept between streamed chunks, so links split across chunks still match
+TIMELINE_LINK_MAX_LENGTH = 64
+
+# Validators and newest file of the last timeline listing that was read
+latest_timeline_listing: dict[str, str] = {}
+
+# Observation rows start with a date (YYYY.DDD), other rows are page headers
+TIMELINE_ROW_PATTERN = re.compile(r"\d{4}.\d{3}")
+
 # List of target names found in observations to ignore
 # Mostly calibration observations
 TARGET_NAMES_TO_IGNORE = [
@@ -83,6 +101,12 @@ TARGET_NAMES_TO_IGNORE = [
     "DARK-EARTH-CALIB",
 ]
 
+TIMELINE_DATETIME_FORMAT = "%Y.%j %H:%M:%S"
+
+# Timeline target names are matched on their first characters, since the
+# planned exposure catalog names are longer
+TARGET_NAME_MATCH_LENGTH = 16
+
 
 class InstrumentInfo(pydantic.BaseModel):
     id: str
@@ -125,6 +149,94 @@ class TimelineRow(NamedTuple):
     exp_time: float
 
 
+class PlannedExposureIndex:
+    """
+    Index over the planned exposure catalog that resolves timeline target names
+    to pointing coordinates without scanning the whole catalog for every row.
+    The coordinates of the whole catalog are converted to degrees up front.
+
+    A target resolves to the first catalog object that has the same name,
+    otherwise that starts with, or finally that contains, the first
+    `TARGET_NAME_MATCH_LENGTH` characters of the target name.
+    """
+
+    def __init__(self, planned_exposures_df: pd.DataFrame) -> None:
+        self._object_names: list[str] = (
+            planned_exposures_df["object_name"].astype(str).tolist()
+        )
+        self._ra = hms_to_degrees(
+            planned_exposures_df["ra_h"].astype(str)
+            + ":"
+            + planned_exposures_df["ra_m"].astype(str)
+            + ":"
+            + planned_exposures_df["ra_s"].astype(str),
+            errors="coerce",
+        )
+        self._dec = dms_to_degrees(
+            planned_exposures_df["dec_d"].astype(str)
+            + ":"
+            + planned_exposures_df["dec_m"].astype(str)
+            + ":"
+            + planned_exposures_df["dec_s"].astype(str),
+            errors="coerce",
+        )
+
+        # first row index for each exact name and for each name prefix
+        self._by_name: dict[str, int] = {}
+        self._by_prefix: dict[str, int] = {}
+        for index, object_name in enumerate(self._object_names):
+            self._by_name.setdefault(object_name, index)
+            for length in range(1, min(len(object_name), TARGET_NAME_MATCH_LENGTH) + 1):
+                self._by_prefix.setdefault(object_name[:length], index)
+
+        # newline separated names so a substring search finds the first row
+        # containing the target, then maps the offset back to the row
+        self._names_text = "\n".join(self._object_names)
+        self._name_offsets = [0] + list(
+            accumulate(len(object_name) + 1 for object_name in self._object_names)
+        )
+
+        self._resolved: dict[str, int | None] = {}
+
+    def find(self, target_name: str) -> sdk.Coordinate | None:
+        """Returns the pointing coordinates of the target, if it is in the catalog"""
+        if target_name not in self._resolved:
+            self._resolved[target_name] = self._find_index(target_name)
+
+        index = self._resolved[target_name]
+        if index is None or np.isnan(self._ra[index]) or np.isnan(self._dec[index]):
+            return None
+
+        return sdk.Coordinate(ra=float(self._ra[index]), dec=float(self._dec[index]))
+
+    def _find_index(self, target_name: str) -> int | None:
+        if not target_name:
+            return None
+
+        if target_name in self._by_name:
+            return self._by_name[target_name]
+
+        target_prefix = target_name[:TARGET_NAME_MATCH_LENGTH]
+        if target_prefix in self._by_prefix:
+            return self._by_prefix[target_prefix]
+
+        # names cannot span rows of the newline separated text
+        offset = -1 if "\n" in target_prefix else self._names_text.find(target_prefix)
+        if offset == -1:
+            return None
+
+        return bisect_right(self._name_offsets, offset) - 1
+
+
+class PreparedObservation(NamedTuple):
+    """Values of a timeline row converted for the ACROSS observation"""
+
+    begin_at: datetime
+    end_at: datetime
+    exposure_time: float
+    external_observation_id: str
+
+
 def read_planned_exposure_catalog() -> pd.DataFrame:
     """
     Method to read the planned and archived exposure catalog as a pandas DataFrame object
@@ -151,25 +263,45 @@ def read_planned_exposure_catalog() -> pd.DataFrame:
 
 def get_latest_timeline_file() -> str:
     """
-    Method to scrape the webpage of planned timeline files,
-    retrieving the latest file
+    Method to scan the webpage of planned timeline files,
+    retrieving the latest file.
+    Streams the listing while keeping only the newest link, and sends the
+    validators of the last listing so an unchanged listing returns immediately.
     """
-    response = httpx.get(BASE_TIMELINE_URL)
-
-    html_content = response.text
-    soup = bs4.BeautifulSoup(html_content, "html.parser")
-    a_tags = list(soup.find_all("a"))
-    href_links: list[str] = []
-    for tag in a_tags:
-        href = tag.get("href")
-        if isinstance(href, str) and "timeline_" in href:
-            href_links.append(href)
-
-    # Sort the links by ascending chronological order, grab latest
-    href_links.sort(
-        key=lambda date: datetime.strptime(date.replace("timeline_", ""), "%m_%d_%y")
-    )
-    newest_link = href_links[-1]
+    headers: dict[str, str] = {}
+    if "etag" in latest_timeline_listing:
+        headers["If-None-Match"] = latest_timeline_listing["etag"]
+    if "last_modified" in latest_timeline_listing:
+        headers["If-Modified-Since"] = latest_timeline_listing["last_modified"]
+
+    with httpx.stream("GET", BASE_TIMELINE_URL, headers=headers) as response:
+        if response.status_code == 304 and "filename" in latest_timeline_listing:
+            logger.debug("Timeline listing unchanged.")
+            return latest_timeline_listing["filename"]
+
+        response.raise_for_status()
+
+        newest_link, newest_date = None, None
+        tail = ""
+        for chunk in response.iter_text():
+            text = tail + chunk
+            for match in TIMELINE_LINK_PATTERN.finditer(text):
+                link = match[2]
+                link_date = datetime.strptime(link, TIMELINE_LINK_DATE_FORMAT)
+                if newest_date is None or link_date > newest_date:
+                    newest_link, newest_date = link, link_date
+
+            tail = text[-TIMELINE_LINK_MAX_LENGTH:]
+
+        if newest_link is None:
+            raise ValueError("No timeline files found in the timeline listing")
+
+        latest_timeline_listing.clear()
+        latest_timeline_listing["filename"] = newest_link
+        if "etag" in response.headers:
+            latest_timeline_listing["etag"] = response.headers["etag"]
+        if "last-modified" in response.headers:
+            latest_timeline_listing["last_modified"] = response.headers["last-modified"]
 
     return newest_link
 
@@ -177,32 +309,21 @@ def get_latest_timeline_file() -> str:
 def read_timeline_file(filename: str) -> pd.DataFrame:
     """
     Method to read an HST timeline file as a pandas DataFrame.
-    Scapes the HTML using BeautifulSoup, separates columns based on
-    fixed number of characters, and returns the data as a DataFrame object.
+    Separates columns based on fixed number of characters, keeping only
+    the observation rows, and returns the data as a DataFrame object.
     """
     timeline_url = BASE_TIMELINE_URL + filename
-    timeline_df = pd.read_fwf(
-        timeline_url,
-        colspecs=[c.spacing for c in TIMELINE_FILE_COLUMNS],
-        names=[c.name for c in TIMELINE_FILE_COLUMNS],
+    response = httpx.get(timeline_url)
+    response.raise_for_status()
+
+    # Drop rows that are not observations while scanning the file
+    return read_fixed_width(
+        response.text,
+        TIMELINE_FILE_FIXED_WIDTH_COLUMNS,
+        row_pattern=TIMELINE_ROW_PATTERN,
+        empty_as_na=False,
     )
 
-    # Drop rows that are not observations by filtering rows that do not have a date format (YYYY.DDD)
-    is_date_format = timeline_df["date"].astype(str).str.match(r"\d{4}.\d{3}")
-    # reset the index for all "complete" rows of data
-    schedules = timeline_df[is_date_format].reset_index(drop=True)
-
-    # Apply type conversions after reading and filtering
-    for col in TIMELINE_FILE_COLUMNS:
-        if col.type is str:
-            schedules[col.name] = schedules[col.name].astype(str).str.strip()
-        elif col.type is int:
-            schedules[col.name] = pd.to_numeric(schedules[col.name]).astype("int64")
-        elif col.type is float:
-            schedules[col.name] = pd.to_numeric(schedules[col.name])
-
-    return schedules
-
 
 def transform_to_across_schedule(
     filename: str, telescope_id: str
@@ -222,39 +343,17 @@ def transform_to_across_schedule(
 
 
 def extract_observation_pointing_coordinates(
-    planned_exposures_df: pd.DataFrame,
+    planned_exposure_index: PlannedExposureIndex,
     observation_data: TimelineRow,
-) -> Position | None:
+) -> sdk.Coordinate | None:
     """
     Extract the coordinates from the planned exposures catalog and
     add them to the observation data payload.
-    If coordinates cannot be found, return an empty dict.
+    If coordinates cannot be found, return None.
     """
-    # The planned exposure 'name' column is longer, so we need to check if it contains or equals
-    # the target name from the timeline observation data
-    object_name = planned_exposures_df["object_name"]
-    target_name = observation_data.target_name
-
-    planned_observation_data = planned_exposures_df[
-        (object_name.str.contains(target_name[:16])) | (object_name == target_name)
-    ]
-    if len(planned_observation_data) == 0:
-        # Could not find coordinates for this target in the planned exposure catalog, so skip
-        # (this is likely a ToO or DDT observation)
-        return None
-
-    ra = (
-        f"{planned_observation_data['ra_h'].values[0]}:"
-        f"{planned_observation_data['ra_m'].values[0]}:"
-        f"{planned_observation_data['ra_s'].values[0]}"
-    )
-    dec = (
-        f"{planned_observation_data['dec_d'].values[0]}:"
-        f"{planned_observation_data['dec_m'].values[0]}:"
-        f"{planned_observation_data['dec_s'].values[0]}"
-    )
-
-    return Position(ra=ra, dec=dec)
+    # Could not find coordinates for this target in the planned exposure catalog
+    # if None (this is likely a ToO or DDT observation)
+    return planned_exposure_index.find(observation_data.target_name)
 
 
 def extract_instrument_info(
@@ -364,56 +463,99 @@ def extract_instrument_info(
     )
 
 
+class InstrumentInfoResolver:
+    """
+    Memoizes the instrument info for each (instrument, element, aperture)
+    combination, since a weekly timeline only uses a handful of them.
+    """
+
+    def __init__(self, instruments: list[sdk.Instrument]) -> None:
+        self._instruments = instruments
+        self._resolved: dict[tuple[str, str, str], InstrumentInfo | None] = {}
+
+    def resolve(self, observation_data: TimelineRow) -> InstrumentInfo | None:
+        """Returns the instrument info for the observation, resolving it on first sight"""
+        key = (
+            observation_data.instrument,
+            observation_data.element,
+            observation_data.aperture,
+        )
+
+        if key not in self._resolved:
+            self._resolved[key] = extract_instrument_info(
+                observation_data, self._instruments
+            )
+
+        return self._resolved[key]
+
+
+def prepare_observations(observations_df: pd.DataFrame) -> list[PreparedObservation]:
+    """
+    Convert the timestamps, exposure times and observation IDs of the timeline
+    observations as whole columns, returning the prepared values for each row
+    """
+    dates = observations_df["date"].astype(str) + " "
+    begin_at = pd.DatetimeIndex(
+        pd.to_datetime(
+            dates + observations_df["begin_time"].astype(str),
+            format=TIMELINE_DATETIME_FORMAT,
+        )
+    )
+    end_at = pd.DatetimeIndex(
+        pd.to_datetime(
+            dates + observations_df["end_time"].astype(str),
+            format=TIMELINE_DATETIME_FORMAT,
+        )
+    )
+    exposure_times = pd.to_numeric(observations_df["exp_time"]).astype(float)
+    external_observation_ids = observations_df["obs_id"].astype(str)
+
+    return [
+        PreparedObservation(*values)
+        for values in zip(
+            begin_at.to_pydatetime(),
+            end_at.to_pydatetime(),
+            exposure_times.tolist(),
+            external_observation_ids.tolist(),
+        )
+    ]
+
+
 def transform_to_across_observation(
-    planned_exposures_df: pd.DataFrame,
+    planned_exposure_index: PlannedExposureIndex,
     observation_data: TimelineRow,
-    instruments: list[sdk.Instrument],
+    instrument_resolver: InstrumentInfoResolver,
+    prepared_observation: PreparedObservation,
 ) -> sdk.ObservationCreate | None:
     """
     Format the observation data in the ACROSS format
     Runs methods to extract pointing coordinates and
-    instrument info from the raw observation data.
+    instrument info from the raw observation data, and assembles the
+    observation with the values from `prepare_observations`.
     """
-    pointing_coord_dict = extract_observation_pointing_coordinates(
-        planned_exposures_df, observation_data
+    pointing_position = extract_observation_pointing_coordinates(
+        planned_exposure_index, observation_data
     )
 
-    if not pointing_coord_dict:
+    if pointing_position is None:
         # Ignoring observations without matching coordinates
         return None
 
-    instrument_info = extract_instrument_info(observation_data, instruments)
+    instrument_info = instrument_resolver.resolve(observation_data)
     if instrument_info is None:
         return None
 
-    pointing_coord = SkyCoord(
-        pointing_coord_dict["ra"], pointing_coord_dict["dec"], unit=(u.hourangle, u.deg)
-    )
-
-    begin_at = datetime.strptime(
-        f"{observation_data.date} {observation_data.begin_time}",
-        "%Y.%j %H:%M:%S",
-    )
-    end_at = datetime.strptime(
-        f"{observation_data.date} {observation_data.end_time}",
-        "%Y.%j %H:%M:%S",
-    )
-
     return sdk.ObservationCreate(
         instrument_id=instrument_info.id,
         object_name=observation_data.target_name,
-        external_observation_id=str(observation_data.obs_id),
-        pointing_position=sdk.Coordinate(
-            ra=pointing_coord.ra.deg,
-            dec=pointing_coord.dec.deg,
-        ),
-        object_position=sdk.Coordinate(
-            ra=pointing_coord.ra.deg,
-            dec=pointing_coord.dec.deg,
-        ),
+        external_observation_id=prepared_observation.external_observation_id,
+        pointing_position=pointing_position,
+        object_position=pointing_position,
         pointing_angle=0.0,  # Assuming no roll
-        date_range=sdk.DateRange(begin=begin_at, end=end_at),
-        exposure_time=float(observation_data.exp_time),
+        date_range=sdk.DateRange(
+            begin=prepared_observation.begin_at, end=prepared_observation.end_at
+        ),
+        exposure_time=prepared_observation.exposure_time,
         status=sdk.ObservationStatus.PLANNED,
         type=instrument_info.type,
         bandpass=instrument_info.bandpass,
@@ -449,17 +591,24 @@ def ingest() -> None:
     # leverage pandas masking with vectorization to filter
     non_calibration = ~timeline_df["target_name"].isin(TARGET_NAMES_TO_IGNORE)
     non_acq_mode = ~timeline_df["mode"].str.contains("ACQ", na=False)
-    filtered_observation_data = list(
-        timeline_df[non_calibration & non_acq_mode].itertuples()
-    )
+    filtered_observations_df = timeline_df[non_calibration & non_acq_mode]
 
-    if len(filtered_observation_data) == 0:
+    if len(filtered_observations_df) == 0:
         return None
 
-    for observation_data in filtered_observation_data:
+    planned_exposure_index = PlannedExposureIndex(planned_exposures_df)
+    instrument_resolver = InstrumentInfoResolver(instruments)
+    prepared_observations = prepare_observations(filtered_observations_df)
+
+    for observation_data, prepared_observation in zip(
+        filtered_observations_df.itertuples(), prepared_observations
+    ):
         # Format observation data in ACROSS format
         across_observation = transform_to_across_observation(
-            planned_exposures_df, cast(TimelineRow, observation_data), instruments
+            planned_exposure_index,
+            cast(TimelineRow, observation_data),
+            instrument_resolver,
+            prepared_observation,
         )
         if across_observation:
             across_schedule.observations.append(across_observation)
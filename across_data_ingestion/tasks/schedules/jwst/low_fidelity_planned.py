@@ -1,15 +1,21 @@
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
 import astroquery.mast  # type: ignore[import-untyped]
 import httpx
+import numpy as np
 import pandas as pd
 import structlog
 from astropy.table import Table as ATable  # type: ignore[import-untyped]
+from astropy.table import vstack  # type: ignore[import-untyped]
 from astropy.time import Time  # type: ignore[import-untyped]
 from bs4 import BeautifulSoup  # type: ignore[import-untyped]
 from fastapi_utilities import repeat_at  # type: ignore
 
 from ....util.across_server import client, sdk
+from ....util.fixed_width import FixedWidthColumn, read_fixed_width
+from ....util.table_cache import TableCache
+from ....util.time_conversion import to_datetime_column
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger()
 
@@ -17,92 +23,116 @@ JWST_SCIENCE_EXECUTION_PLAN_URL = (
     "https://www.stsci.edu/jwst/science-execution/observing-schedules"
 )
 
-
-def gen_proposal_id(row: pd.Series) -> str:
+MAST_OBSERVATION_COLUMNS = [
+    "instrument_name",
+    "filters",
+    "obs_id",
+    "target_name",
+    "s_ra",
+    "s_dec",
+    "em_min",
+    "em_max",
+]
+
+# MAST observation columns added to the schedule by the crossmatch
+MAST_CROSSMATCH_COLUMNS = {
+    "s_ra": "RA",
+    "s_dec": "DEC",
+    "instrument_name": "INSTRUMENT",
+    "filters": "FILTERS",
+    "em_min": "EM_MIN",
+    "em_max": "EM_MAX",
+}
+CROSSMATCH_RESULT_COLUMNS = [
+    "RA",
+    "DEC",
+    "INSTRUMENT",
+    "INSTRUMENT_ID",
+    "OBSERVATION_TYPE",
+    "FILTERS",
+    "EM_MIN",
+    "EM_MAX",
+    "VALID",
+]
+SPECTROSCOPY_MODE_PATTERN = "SLIT|SLITLESS|GRISM"
+SCHEDULED_TIME_COLUMNS = ["SCHEDULED_START_TIME", "SCHEDULED_END_TIME"]
+
+# Proposals are queried from MAST in chunks, a few chunks at a time
+MAST_PROPOSAL_CHUNK_SIZE = 20
+MAST_MAX_CONCURRENT_QUERIES = 4
+
+# Planned proposals rarely change, so MAST results are cached per proposal
+mast_proposal_cache = TableCache("jwst_mast_proposals", ttl=timedelta(days=7))
+
+
+def gen_proposal_ids(visit_ids: pd.Series) -> pd.Series:
     """
-    Pandas apply function
-    Generates a proposal ID based on the VISIT_ID
+    Generates the proposal IDs based on the VISIT_IDs
     """
-    visit_id_split = str(row["VISIT_ID"]).split(":")
-
-    return visit_id_split[0]
+    return visit_ids.astype(str).str.split(":").str[0]
 
 
-def find_missing_params_from_mast_result(
-    row: pd.Series, mast_observations: pd.DataFrame, instruments_info: dict
-) -> pd.Series:
+def with_observation_datetimes(data: pd.DataFrame) -> pd.DataFrame:
     """
-    Pandas apply function:
-    This function attempts to find the RA, DEC, INSTRUMENT, and bandpass info
-    for a given row in the JWST planned execution schedule.
-    It uses the MAST observations DataFrame to find the corresponding values.
-    If the target name is not found, it returns None for those parameters.
+    Converts the scheduled start and end time columns into UTC datetimes once,
+    so observations can use them directly
     """
-
-    empty_return = pd.Series(
-        {
-            "RA": None,
-            "DEC": None,
-            "INSTRUMENT": None,
-            "INSTRUMENT_ID": None,
-            "OBSERVATION_TYPE": None,
-            "FILTERS": None,
-            "EM_MIN": None,
-            "EM_MAX": None,
-            "VALID": False,
+    return data.assign(
+        **{
+            column: to_datetime_column(
+                pd.to_datetime(data[column], utc=True).dt.tz_localize(None)
+            )
+            for column in SCHEDULED_TIME_COLUMNS
         }
     )
 
-    # sometimes even the target name observation is not in the mast results
-    in_mast_observations = (
-        row["TARGET_NAME"] in mast_observations["target_name"].to_list()
-    )
-    if not in_mast_observations:
-        return empty_return
 
-    mast_observation: pd.Series = (
-        mast_observations.loc[mast_observations["target_name"] == row["TARGET_NAME"]]
-        .iloc[0]
-        .fillna(0)
+def crossmatch_mast_observations(
+    ddf: pd.DataFrame, mast_observations: pd.DataFrame, instruments_info: dict
+) -> pd.DataFrame:
+    """
+    Finds the RA, DEC, INSTRUMENT, and bandpass info for the rows in the JWST
+    planned execution schedule from the first MAST observation of each target.
+    Rows are only VALID if the target is in the MAST results (sometimes it is
+    not), has bandpass information, and has a known instrument.
+    """
+    # first MAST observation of each target, joined in once
+    first_mast_observations = (
+        mast_observations.drop_duplicates(subset="target_name", keep="first")
+        .set_index("target_name")[list(MAST_CROSSMATCH_COLUMNS)]
+        .rename(columns=MAST_CROSSMATCH_COLUMNS)
     )
+    crossmatched = ddf.join(first_mast_observations, on="TARGET_NAME")
 
-    # I have seen somtimes the bandpass information is nulled for planned information, ignore
-    if all([mast_observation[col] == 0 for col in ["em_min", "em_max"]]):
-        return empty_return
+    numeric_columns = ["RA", "DEC", "EM_MIN", "EM_MAX"]
+    crossmatched[numeric_columns] = (
+        crossmatched[numeric_columns].astype(float).fillna(0.0)
+    )
 
     # Get the instrument ID from the record instrument name
-    split_observation_instrument = mast_observation["instrument_name"].split("/")
-    instrument_short_name = f"JWST_{split_observation_instrument[0]}"
-
-    # off chance the instrument name isn't in the instrument dictionary
-    if instrument_short_name not in instruments_info.keys():
-        return empty_return
-
-    instrument_id = instruments_info[instrument_short_name]
+    split_instrument = crossmatched["INSTRUMENT"].astype(object).str.split("/")
+    crossmatched["INSTRUMENT_ID"] = ("JWST_" + split_instrument.str[0]).map(
+        instruments_info
+    )
 
     # Find out what the observation type by hints from the instrument name
-    spectroscopy_keys = ["SLIT", "SLITLESS", "GRISM"]
-    if len(split_observation_instrument) > 1 and any(
-        key in split_observation_instrument[1] for key in spectroscopy_keys
-    ):
-        observation_type = "spectroscopy"
-    else:
-        observation_type = "imaging"
-
-    return pd.Series(
-        {
-            "RA": mast_observation["s_ra"],
-            "DEC": mast_observation["s_dec"],
-            "INSTRUMENT": mast_observation["instrument_name"],
-            "INSTRUMENT_ID": instrument_id,
-            "OBSERVATION_TYPE": observation_type,
-            "FILTERS": mast_observation["filters"],
-            "EM_MIN": mast_observation["em_min"],
-            "EM_MAX": mast_observation["em_max"],
-            "VALID": True,
-        }
+    is_spectroscopy = split_instrument.str[1].str.contains(
+        SPECTROSCOPY_MODE_PATTERN, na=False
+    )
+    crossmatched["OBSERVATION_TYPE"] = np.where(
+        is_spectroscopy, "spectroscopy", "imaging"
     )
 
+    # I have seen somtimes the bandpass information is nulled for planned information, ignore
+    has_bandpass = (crossmatched["EM_MIN"] != 0) | (crossmatched["EM_MAX"] != 0)
+    crossmatched["VALID"] = (
+        ddf["TARGET_NAME"].isin(first_mast_observations.index)
+        & has_bandpass
+        & crossmatched["INSTRUMENT_ID"].notna()
+    )
+
+    return crossmatched[[*ddf.columns, *CROSSMATCH_RESULT_COLUMNS]]
+
 
 def get_most_recent_jwst_planned_url() -> str:
     """Fetches the most recent JWST planned execution schedule URL from the STScI website."""
@@ -123,25 +153,78 @@ def get_most_recent_jwst_planned_url() -> str:
     return str(links[0])
 
 
-def read_mast_observations(mast_proposal_ids: list[str]) -> pd.DataFrame:
-    """Fetches JWST planned observations from MAST based on proposal IDs."""
-    jwst_planned_obs: ATable = astroquery.mast.Observations.query_criteria(
+def query_mast_proposals(mast_proposal_ids: list[str]) -> ATable:
+    """Queries MAST for the JWST planned observations of the proposal IDs."""
+    return astroquery.mast.Observations.query_criteria(
         obs_collection=["JWST"],
         proposal_id=mast_proposal_ids,  # , calib_level=["-1"]
     )
 
-    columns = [
-        "instrument_name",
-        "filters",
-        "obs_id",
-        "target_name",
-        "s_ra",
-        "s_dec",
-        "em_min",
-        "em_max",
+
+def read_mast_observations(mast_proposal_ids: list[str]) -> pd.DataFrame:
+    """
+    Fetches JWST planned observations from MAST based on proposal IDs.
+    Proposals cached by a previous run are read from the cache, and the rest are
+    queried in chunks concurrently, caching the observations of each proposal
+    that has any.
+    """
+    tables_by_proposal_id: dict[str, ATable] = {}
+    uncached_proposal_ids: list[str] = []
+
+    for proposal_id in mast_proposal_ids:
+        cached_table = mast_proposal_cache.get(proposal_id)
+        if cached_table is None:
+            uncached_proposal_ids.append(proposal_id)
+        else:
+            tables_by_proposal_id[proposal_id] = cached_table
+
+    logger.debug(
+        "Querying MAST for uncached proposals.",
+        cached=len(tables_by_proposal_id),
+        uncached=len(uncached_proposal_ids),
+    )
+
+    chunks = [
+        uncached_proposal_ids[i : i + MAST_PROPOSAL_CHUNK_SIZE]
+        for i in range(0, len(uncached_proposal_ids), MAST_PROPOSAL_CHUNK_SIZE)
     ]
 
-    return jwst_planned_obs[columns].to_pandas()
+    with ThreadPoolExecutor(max_workers=MAST_MAX_CONCURRENT_QUERIES) as executor:
+        for chunk, jwst_planned_obs in zip(
+            chunks, executor.map(query_mast_proposals, chunks)
+        ):
+            if not len(jwst_planned_obs):
+                continue
+
+            # MAST proposal IDs may be zero padded
+            result_proposal_ids = np.char.lstrip(
+                np.asarray(jwst_planned_obs["proposal_id"], dtype=str), "0"
+            )
+
+            for proposal_id in chunk:
+                proposal_obs = jwst_planned_obs[
+                    result_proposal_ids == proposal_id.lstrip("0")
+                ][MAST_OBSERVATION_COLUMNS]
+
+                # newly scheduled proposals may not have MAST records yet, so
+                # only cache proposals with observations to query them again
+                if not len(proposal_obs):
+                    continue
+
+                mast_proposal_cache.put(proposal_id, proposal_obs)
+                tables_by_proposal_id[proposal_id] = proposal_obs
+
+    # keep the observations in the order of the requested proposals
+    tables = [
+        tables_by_proposal_id[proposal_id]
+        for proposal_id in mast_proposal_ids
+        if proposal_id in tables_by_proposal_id
+    ]
+
+    if not tables:
+        return pd.DataFrame(columns=MAST_OBSERVATION_COLUMNS)
+
+    return vstack(tables).to_pandas()
 
 
 def parse_jwst_data_to_fwf(response_text: str) -> pd.DataFrame:
@@ -176,13 +259,13 @@ def parse_jwst_data_to_fwf(response_text: str) -> pd.DataFrame:
 
     # Optional: extract column names from header line
     header_line = data_lines[header_line_index]
-    column_names = [
-        header_line[start:end].strip().replace(" ", "_") for (start, end) in colspecs
+    columns = [
+        FixedWidthColumn(header_line[start:end].strip().replace(" ", "_"), start, end)
+        for (start, end) in colspecs
     ]
 
     # Step 3: Read data into DataFrame
-    data_text = "\n".join(data_lines[data_start_index:])
-    return pd.read_fwf(StringIO(data_text), colspecs=colspecs, names=column_names)
+    return read_fixed_width(response_text, columns, skip_rows=data_start_index)
 
 
 def filter_jwst_dataframe(df: pd.DataFrame, instruments_info: dict) -> pd.DataFrame:
@@ -212,7 +295,7 @@ def filter_jwst_dataframe(df: pd.DataFrame, instruments_info: dict) -> pd.DataFr
         columns_to_keep,
     ]
 
-    ddf["PROPOSAL_ID"] = ddf.apply(gen_proposal_id, axis=1)
+    ddf["PROPOSAL_ID"] = gen_proposal_ids(ddf["VISIT_ID"])
     ddf["SCHEDULED_START_TIME"] = pd.to_datetime(ddf["SCHEDULED_START_TIME"])
     ddf["DURATION"] = pd.to_timedelta(df["DURATION"].str.replace("/", " days "))
     ddf["SCHEDULED_END_TIME"] = ddf["SCHEDULED_START_TIME"] + ddf["DURATION"]
@@ -220,26 +303,7 @@ def filter_jwst_dataframe(df: pd.DataFrame, instruments_info: dict) -> pd.DataFr
 
     mast_observations = read_mast_observations(ddf["PROPOSAL_ID"].unique().tolist())
 
-    ddf[
-        [
-            "RA",
-            "DEC",
-            "INSTRUMENT",
-            "INSTRUMENT_ID",
-            "OBSERVATION_TYPE",
-            "FILTERS",
-            "EM_MIN",
-            "EM_MAX",
-            "VALID",
-        ]
-    ] = ddf.apply(
-        find_missing_params_from_mast_result,
-        axis=1,
-        args=(
-            mast_observations,
-            instruments_info,
-        ),
-    )
+    ddf = crossmatch_mast_observations(ddf, mast_observations, instruments_info)
     filtered_ddf = ddf[ddf["VALID"]]
     return filtered_ddf
 
@@ -298,10 +362,8 @@ def jwst_to_across_observation(row: dict) -> sdk.ObservationCreate:
     Creates a JWST observation from the provided row of data.
     Calculates the exposure time from the End - Start
     Sets the external_id a custom value based off of the P S and Pnum values
+    Expects the scheduled times to be datetimes from `with_observation_datetimes`
     """
-    obs_start_at = Time(row["SCHEDULED_START_TIME"]).to_datetime()
-    obs_end_at = Time(row["SCHEDULED_END_TIME"]).to_datetime()
-
     bandpass = sdk.WavelengthBandpass.model_validate(
         {
             "min": row["EM_MIN"],
@@ -322,7 +384,9 @@ def jwst_to_across_observation(row: dict) -> sdk.ObservationCreate:
         object_position=sdk.Coordinate(
             ra=round(row["RA"], 8), dec=round(row["DEC"], 8)
         ),
-        date_range=sdk.DateRange(begin=obs_start_at, end=obs_end_at),
+        date_range=sdk.DateRange(
+            begin=row["SCHEDULED_START_TIME"], end=row["SCHEDULED_END_TIME"]
+        ),
         external_observation_id=row["VISIT_ID"],
         type=row["OBSERVATION_TYPE"],
         status=sdk.ObservationStatus.PLANNED,
@@ -364,7 +428,9 @@ def ingest() -> None:
     )
 
     # Transform dataframe to list of dictionaries
-    schedule_observations = latest_jwst_plan.to_dict(orient="records")
+    schedule_observations = with_observation_datetimes(latest_jwst_plan).to_dict(
+        orient="records"
+    )
 
     # Transform observations
     jwst_schedule.observations = [
@@ -6,6 +6,7 @@ from astropy.time import Time  # type: ignore[import-untyped]
 from fastapi_utilities import repeat_at  # type: ignore
 
 from ....util.across_server import client, sdk
+from ....util.time_conversion import to_isot
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger()
 
@@ -62,10 +63,11 @@ def transform_to_across_schedule(
 
 
 def transform_to_across_observation(
-    instrument_id: str, row: ObservationRow
+    instrument_id: str, row: ObservationRow, begin: str, end: str
 ) -> sdk.ObservationCreate:
     """
-    Creates a NICER observation from the provided row of data.
+    Creates a NICER observation from the provided row of data,
+    with its begin and end already converted to isot.
     """
     return sdk.ObservationCreate(
         instrument_id=instrument_id,
@@ -78,10 +80,7 @@ def transform_to_across_observation(
             ra=row.RightAscension,
             dec=row.Declination,
         ),
-        date_range=sdk.DateRange(
-            begin=Time(row.Start, format="isot").isot,
-            end=Time(row.Stop, format="isot").isot,
-        ),
+        date_range=sdk.DateRange.model_validate({"begin": begin, "end": end}),
         external_observation_id=str(row.ObsID),
         type=sdk.ObservationType.IMAGING,
         status=sdk.ObservationStatus.PLANNED,
@@ -126,14 +125,18 @@ def ingest(schedule_modes: list[str] = ["Scheduled"]) -> None:
     )
 
     nicer_obs = list(nicer_df.itertuples())
+    begins = to_isot(nicer_df["Start"], format="isot")
+    ends = to_isot(nicer_df["Stop"], format="isot")
 
     # Transform observations
     schedule.observations = [
         transform_to_across_observation(
             instrument_id,
             cast(ObservationRow, obs),
+            begin,
+            end,
         )
-        for obs in nicer_obs
+        for obs, begin, end in zip(nicer_obs, begins, ends)
     ]
 
     # Post schedule
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime, timedelta
 
 import structlog
@@ -8,6 +9,8 @@ from fastapi_utilities import repeat_at  # type: ignore
 
 from ....core.constants import SECONDS_IN_A_DAY
 from ....util.across_server import client, sdk
+from ....util.state_store import StateStore
+from ....util.time_conversion import to_isot
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger()
 
@@ -22,20 +25,59 @@ NUSTAR_BANDPASS = sdk.EnergyBandpass.model_validate(
     }
 )
 
+# Only the NuMASTER columns used to transform observations are queried
+NUMASTER_COLUMNS = [
+    "name",
+    "ra",
+    "dec",
+    "time",
+    "end_time",
+    "obsid",
+    "roll_angle",
+    "observation_mode",
+]
 
-def query_nustar_catalog(start_time: int) -> Table:
+# Default window of as-flown observations to ingest
+AS_FLOWN_LOOKBACK = timedelta(days=7)
+
+# Size of each window of a historical backfill, and how many are queried at once
+BACKFILL_WINDOW = timedelta(days=7)
+BACKFILL_MAX_CONCURRENT_WINDOWS = 2
+
+
+def query_nustar_catalog(
+    start_time: float, end_time: float | None = None, raise_errors: bool = False
+) -> Table:
     """
-    Queries the NuMASTER HEASARC catalog for all NuSTAR observations
-    beginning after the input `start_time`
+    Queries the NuMASTER HEASARC catalog for the NuSTAR science observations
+    beginning after the input `start_time` and, if given, up to `end_time` (MJD).
+    The column projection and science mode filtering are done by the TAP service,
+    so only the ingested columns and rows are transferred.
+
+    A failed query returns an empty table, unless `raise_errors` is set so the
+    caller can tell a failed query apart from a window without observations.
     """
+    query = (
+        f"SELECT {', '.join(NUMASTER_COLUMNS)} "
+        "FROM numaster "
+        f"WHERE time > {start_time} "
+        "AND observation_mode = 'SCIENCE'"
+    )
+    if end_time is not None:
+        query += f" AND time <= {end_time}"
+
     try:
-        result = Heasarc.query_tap(f"SELECT * FROM numaster WHERE time > {start_time}")
+        result = Heasarc.query_tap(query)
     except ValueError as err:
         logger.warning(
             "Could not query for NuMASTER catalog on HEASARC",
             start_time=start_time,
+            end_time=end_time,
             err=err,
         )
+        if raise_errors:
+            raise
+
         return Table()
 
     table = result.to_table()
@@ -58,8 +100,12 @@ def create_schedule(telescope_id: str, data: Table) -> sdk.ScheduleCreate:
 
 
 def transform_to_observation(
-    instrument_id: str, row: Table.Row
+    instrument_id: str, row: Table.Row, begin: str, end: str
 ) -> sdk.ObservationCreate:
+    """
+    Create ACROSS observation for given instrument ID and observation row,
+    with its begin and end already converted to isot
+    """
     return sdk.ObservationCreate(
         instrument_id=instrument_id,
         object_name=f"{row['name']}",
@@ -71,8 +117,8 @@ def transform_to_observation(
         ),
         date_range=sdk.DateRange.model_validate(
             {
-                "begin": Time(f"{row['time']}", format="mjd").isot,
-                "end": Time(f"{row['end_time']}", format="mjd").isot,
+                "begin": begin,
+                "end": end,
             }
         ),
         external_observation_id=f"{row['obsid']}",
@@ -84,19 +130,119 @@ def transform_to_observation(
     )
 
 
-def ingest() -> None:
+def transform_to_observations(
+    instrument_id: str, data: Table
+) -> list[sdk.ObservationCreate]:
+    """Create ACROSS observations for every row, converting their times at once"""
+    begins = to_isot(data["time"], format="mjd")
+    ends = to_isot(data["end_time"], format="mjd")
+
+    return [
+        transform_to_observation(instrument_id, row, begin, end)
+        for row, begin, end in zip(data, begins, ends)
+    ]
+
+
+def post_schedule(schedule: sdk.ScheduleCreate) -> None:
+    try:
+        sdk.ScheduleApi(client).create_schedule(schedule)
+    except sdk.ApiException as err:
+        if err.status == 409:
+            logger.warning("Schedule already exists.", err=err.__dict__)
+        else:
+            raise err
+
+
+def split_windows(
+    begin: datetime, end: datetime, window: timedelta
+) -> list[tuple[datetime, datetime]]:
+    """Splits the date range into consecutive windows, the last one may be shorter"""
+    windows: list[tuple[datetime, datetime]] = []
+
+    window_begin = begin
+    while window_begin < end:
+        window_end = min(window_begin + window, end)
+        windows.append((window_begin, window_end))
+        window_begin = window_end
+
+    return windows
+
+
+async def backfill(
+    begin: datetime,
+    end: datetime,
+    window: timedelta = BACKFILL_WINDOW,
+    max_concurrent_windows: int = BACKFILL_MAX_CONCURRENT_WINDOWS,
+) -> None:
+    """
+    Ingests the NuSTAR as-flown schedules for a historical date range.
+
+    Splits the range into windows, querying NuMASTER for at most
+    `max_concurrent_windows` windows at a time, and uploads the schedule
+    of each window as soon as it is built. Completed windows are checkpointed
+    locally, so rerunning the same backfill after a crash resumes with the
+    windows that have not completed yet.
+    """
+    checkpoints = StateStore("nustar_as_flown_backfill")
+    semaphore = asyncio.Semaphore(max_concurrent_windows)
+
+    (telescope,) = sdk.TelescopeApi(client).get_telescopes(name="NuSTAR")
+    (instrument,) = sdk.InstrumentApi(client).get_instruments(name="FPM A/B")
+
+    async def backfill_window(window_begin: datetime, window_end: datetime) -> None:
+        checkpoint = f"{window_begin.isoformat()}_{window_end.isoformat()}"
+        if checkpoints.get(checkpoint):
+            logger.debug("Skipping completed window.", window=checkpoint)
+            return
+
+        async with semaphore:
+            # raise on a failed query so the window is not checkpointed as empty
+            data = await asyncio.to_thread(
+                query_nustar_catalog,
+                Time(window_begin).mjd,
+                Time(window_end).mjd,
+                raise_errors=True,
+            )
+
+            if len(data):
+                schedule = create_schedule(telescope.id, data)
+                schedule.observations = transform_to_observations(instrument.id, data)
+                await asyncio.to_thread(post_schedule, schedule)
+
+        checkpoints.set(checkpoint, True)
+        logger.info("Backfilled window.", window=checkpoint, observations=len(data))
+
+    windows = split_windows(begin, end, window)
+    results = await asyncio.gather(
+        *(backfill_window(*w) for w in windows), return_exceptions=True
+    )
+
+    failed_windows = [
+        f"{w[0].isoformat()}_{w[1].isoformat()}"
+        for w, result in zip(windows, results)
+        if isinstance(result, Exception)
+    ]
+    if failed_windows:
+        logger.error(
+            "Backfill failed for some windows, rerun to resume.",
+            failed_windows=failed_windows,
+        )
+
+
+def ingest(lookback: timedelta = AS_FLOWN_LOOKBACK) -> None:
     """
     Method that POSTs NuSTAR as-flown observing schedules to the ACROSS server
     Queries completed observations via the HEASARC `NUMASTER` catalog
+    that began within the `lookback` window
     """
-    last_week = datetime.now() - timedelta(days=7)
-    last_week_mjd = Time(last_week).mjd
+    window_start = datetime.now() - lookback
+    window_start_mjd = Time(window_start).mjd
 
-    nustar_observation_data = query_nustar_catalog(last_week_mjd)
+    nustar_observation_data = query_nustar_catalog(window_start_mjd)
     if len(nustar_observation_data) == 0:
         logger.info(
             "No new observations found.",
-            last_week=last_week.isoformat(),
+            window_start=window_start.isoformat(),
         )
 
         return
@@ -109,18 +255,12 @@ def ingest() -> None:
 
     schedule = create_schedule(telescope.id, nustar_observation_data)
 
-    for row in nustar_observation_data:
-        if row["observation_mode"] == "SCIENCE":
-            across_observation = transform_to_observation(instrument.id, row)
-            schedule.observations.append(across_observation)
+    # only SCIENCE mode observations are returned by the catalog query
+    schedule.observations = transform_to_observations(
+        instrument.id, nustar_observation_data
+    )
 
-    try:
-        sdk.ScheduleApi(client).create_schedule(schedule)
-    except sdk.ApiException as err:
-        if err.status == 409:
-            logger.warning("Schedule already exists.", err=err.__dict__)
-        else:
-            raise err
+    post_schedule(schedule)
 
 
 @repeat_at(cron="53 2 * * 2", logger=logger)
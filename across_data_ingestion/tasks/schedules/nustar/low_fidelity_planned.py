@@ -4,6 +4,7 @@ from astropy.time import Time  # type: ignore[import-untyped]
 from fastapi_utilities import repeat_at  # type: ignore[import-untyped]
 
 from ....util.across_server import client, sdk
+from ....util.time_conversion import to_isot
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger()
 
@@ -57,9 +58,12 @@ def create_schedule(telescope_id: str, data: pd.DataFrame) -> sdk.ScheduleCreate
 
 
 def transform_to_observation(
-    instrument_id: str, row: pd.Series
+    instrument_id: str, row: pd.Series, begin: str, end: str
 ) -> sdk.ObservationCreate:
-    """Create ACROSS observation for given instrument ID and observation row"""
+    """
+    Create ACROSS observation for given instrument ID and observation row,
+    with its begin and end already converted to isot
+    """
     return sdk.ObservationCreate(
         instrument_id=instrument_id,
         object_name=f"{row['Name']}",
@@ -71,8 +75,8 @@ def transform_to_observation(
         ),
         date_range=sdk.DateRange.model_validate(
             {
-                "begin": Time(f"{row['obs_start']}", format="yday").isot,
-                "end": Time(f"{row['obs_end']}", format="yday").isot,
+                "begin": begin,
+                "end": end,
             }
         ),
         external_observation_id=f"{row['sequenceID']}",
@@ -99,8 +103,11 @@ def ingest() -> None:
 
     schedule = create_schedule(telescope.id, nustar_observation_data)
 
-    for _, row in nustar_observation_data.iterrows():
-        across_observation = transform_to_observation(instrument.id, row)
+    begins = to_isot(nustar_observation_data["obs_start"], format="yday")
+    ends = to_isot(nustar_observation_data["obs_end"], format="yday")
+
+    for (_, row), begin, end in zip(nustar_observation_data.iterrows(), begins, ends):
+        across_observation = transform_to_observation(instrument.id, row, begin, end)
         schedule.observations.append(across_observation)
 
     try:
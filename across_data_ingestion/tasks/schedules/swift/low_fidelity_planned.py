@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable
 
@@ -71,6 +72,9 @@ SWIFT_UVOT_BANDPASS_DICT = {
     ),
 }
 
+# UVOT modes are each looked up with an HTTP request to the Swift TOO catalog
+UVOT_MODE_MAX_CONCURRENT_QUERIES = 4
+
 
 class CustomUVOTModeEntry:
     """
@@ -106,6 +110,9 @@ class CustomSwiftObsEntry:
     """
     Custom Swift_PPST_Entry to handle the UVOT mode as a string instead of a UVOTMode object.
     This is necessary to avoid multiple HTTP requests to the Swift TOO catalog.
+
+    The pointing position and date range are built once per entry and shared by the
+    observations of every Swift instrument.
     """
 
     obsid: str
@@ -122,6 +129,8 @@ class CustomSwiftObsEntry:
     fom: float
     segment: int
     target_id: str
+    pointing_position: sdk.Coordinate
+    date_range: sdk.DateRange
 
     def __init__(self, **kwargs):
         """
@@ -135,13 +144,16 @@ class CustomSwiftObsEntry:
         """
         Converts a PPSTEntry to a CustomSwiftEntry.
         """
+        begin = Time(entry.begin).isot
+        end = Time(entry.end).isot
+
         return cls(
             obsid=entry.obsid,
             targname=entry.targname,
             ra=entry.ra,
             dec=entry.dec,
-            begin=Time(entry.begin).isot,
-            end=Time(entry.end).isot,
+            begin=begin,
+            end=end,
             exposure=entry.exposure.seconds,
             roll=entry.roll,
             uvot=entry.uvot,
@@ -150,6 +162,11 @@ class CustomSwiftObsEntry:
             fom=entry.fom,
             segment=entry.segment,
             target_id=entry.target_id,
+            pointing_position=sdk.Coordinate(
+                ra=float(entry.ra),
+                dec=float(entry.dec),
+            ),
+            date_range=sdk.DateRange.model_validate({"begin": begin, "end": end}),
         )
 
 
@@ -175,11 +192,15 @@ def build_uvot_mode_dict(modes: list[str]) -> dict[str, list[CustomUVOTModeEntry
     """
     Creates a dictionary of UVOT modes from a list of mode names.
     This is used to avoid multiple HTTP requests to the Swift TOO catalog.
+    The modes are looked up concurrently.
     """
-    uvot_mode_dict = {}
-    for mode in modes:
-        entries = swift_too.UVOTMode(mode).entries
+    with ThreadPoolExecutor(max_workers=UVOT_MODE_MAX_CONCURRENT_QUERIES) as executor:
+        mode_entries = list(
+            executor.map(lambda mode: swift_too.UVOTMode(mode).entries, modes)
+        )
 
+    uvot_mode_dict = {}
+    for mode, entries in zip(modes, mode_entries):
         if not entries:
             continue
 
@@ -222,18 +243,9 @@ def swift_to_across_observation(
     return sdk.ObservationCreate(
         instrument_id=instrument_id,
         object_name=swift_obs.targname,
-        pointing_position=sdk.Coordinate(
-            ra=float(swift_obs.ra),
-            dec=float(swift_obs.dec),
-        ),
-        object_position=sdk.Coordinate(
-            ra=float(swift_obs.ra),
-            dec=float(swift_obs.dec),
-        ),
-        date_range=sdk.DateRange(
-            begin=Time(swift_obs.begin).isot,
-            end=Time(swift_obs.end).isot,
-        ),
+        pointing_position=swift_obs.pointing_position,
+        object_position=swift_obs.pointing_position,
+        date_range=swift_obs.date_range,
         external_observation_id=swift_obs.obsid,
         type=observation_type,
         status=sdk.ObservationStatus.PLANNED,
@@ -347,6 +359,25 @@ def create_swift_across_schedule(
     return schedule
 
 
+def ingest_swift_telescope(
+    telescope_name: str,
+    observation_data: list[CustomSwiftObsEntry],
+    observation_type: sdk.ObservationType,
+    create_observations: Callable = create_observations,
+    bandpass: sdk.Bandpass | None = None,
+) -> None:
+    """Creates the schedule of one Swift telescope and POSTs it"""
+    schedule = create_swift_across_schedule(
+        telescope_name=telescope_name,
+        observation_data=observation_data,
+        bandpass=bandpass,
+        observation_type=observation_type,
+        create_observations=create_observations,
+    )
+
+    sdk.ScheduleApi(client).create_schedule(schedule)
+
+
 def ingest(days_in_future: int = 4) -> None:
     """
     Method that POSTs Swift low fidelity planned observing schedules to the ACROSS server
@@ -356,6 +387,8 @@ def ingest(days_in_future: int = 4) -> None:
 
     Queries planned observations via the swifttools Swift TOO catalog
     This is a low fidelity schedule, meaning it is not guaranteed to be accurate or complete.
+
+    Each telescope's lookup, schedule creation and POST runs concurrently with the others.
     """
 
     # Get the swift telescope ids along with their instrument ids
@@ -364,36 +397,39 @@ def ingest(days_in_future: int = 4) -> None:
         logger.warning("Query returned no planned Swift observations.")
         return
 
-    # XRT
-    swift_xrt_schedule = create_swift_across_schedule(
-        telescope_name="swift_xrt",
-        observation_data=swift_observation_data,
-        bandpass=sdk.Bandpass(SWIFT_XRT_BANDPASS),
-        observation_type=sdk.ObservationType.SPECTROSCOPY,
-        create_observations=create_observations,
-    )
-
-    # BAT
-    swift_bat_schedule = create_swift_across_schedule(
-        telescope_name="swift_bat",
-        observation_data=swift_observation_data,
-        bandpass=sdk.Bandpass(SWIFT_BAT_BANDPASS),
-        observation_type=sdk.ObservationType.IMAGING,
-        create_observations=create_observations,
-    )
-
-    # UVOT
-    swift_uvot_schedule = create_swift_across_schedule(
-        telescope_name="swift_uvot",
-        observation_data=swift_observation_data,
-        observation_type=sdk.ObservationType.IMAGING,
-        create_observations=create_uvot_observations,
-    )
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [
+            # XRT
+            executor.submit(
+                ingest_swift_telescope,
+                telescope_name="swift_xrt",
+                observation_data=swift_observation_data,
+                bandpass=sdk.Bandpass(SWIFT_XRT_BANDPASS),
+                observation_type=sdk.ObservationType.SPECTROSCOPY,
+                create_observations=create_observations,
+            ),
+            # BAT
+            executor.submit(
+                ingest_swift_telescope,
+                telescope_name="swift_bat",
+                observation_data=swift_observation_data,
+                bandpass=sdk.Bandpass(SWIFT_BAT_BANDPASS),
+                observation_type=sdk.ObservationType.IMAGING,
+                create_observations=create_observations,
+            ),
+            # UVOT
+            executor.submit(
+                ingest_swift_telescope,
+                telescope_name="swift_uvot",
+                observation_data=swift_observation_data,
+                observation_type=sdk.ObservationType.IMAGING,
+                create_observations=create_uvot_observations,
+            ),
+        ]
 
-    # Post the schedules to the ACROSS API
-    sdk.ScheduleApi(client).create_schedule(swift_xrt_schedule)
-    sdk.ScheduleApi(client).create_schedule(swift_bat_schedule)
-    sdk.ScheduleApi(client).create_schedule(swift_uvot_schedule)
+    # Raise the first error after every telescope has finished
+    for future in futures:
+        future.result()
 
 
 @repeat_at(cron="44 22 * * *", logger=logger)
@@ -1,12 +1,14 @@
-from datetime import datetime
+import hashlib
+import json
 from typing import Any
 
 import pandas as pd
 import structlog
-from astropy.time import Time  # type: ignore[import-untyped]
 from fastapi_utilities import repeat_at  # type: ignore
 
 from ....util.across_server import client, sdk
+from ....util.state_store import StateStore
+from ....util.time_conversion import to_datetime_column, to_datetimes
 
 logger: structlog.stdlib.BoundLogger = structlog.getLogger()
 
@@ -25,20 +27,86 @@ TESS_POINTINGS_FILE = "https://raw.githubusercontent.com/tessgi/tesswcs/main/src
 TESS_ORBIT_TIMES_FILE = "https://tess.mit.edu/public/files/TESS_orbit_times.csv"
 
 
+def jd_to_datetime_column(jds: pd.Series) -> pd.Series:
+    """Convert a column of JD times to a column of `datetime` objects"""
+    return pd.Series(
+        to_datetimes(jds, format="jd"),
+        index=jds.index,
+        dtype=object,
+    )
+
+
+def prepare_sector_pointings(sector_pointings_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the JD start and end of every sector to datetimes at once,
+    returning a copy of the pointings with `begin` and `end` columns
+    """
+    return sector_pointings_df.assign(
+        begin=jd_to_datetime_column(sector_pointings_df["start"]),
+        end=jd_to_datetime_column(sector_pointings_df["end"]),
+    )
+
+
+def group_orbits_by_sector(
+    orbit_observations_df: pd.DataFrame,
+) -> dict[Any, pd.DataFrame]:
+    """
+    Convert the orbit start and end strings to datetimes at once, and group
+    the orbits by sector so each sector's orbits are looked up directly
+    """
+    # orbit start/end times are strings (non isot)
+    begin = pd.to_datetime(
+        orbit_observations_df["start_of_orbit"], format="%Y-%m-%d %H:%M:%S"
+    )
+    end = pd.to_datetime(
+        orbit_observations_df["end_of_orbit"], format="%Y-%m-%d %H:%M:%S"
+    )
+
+    orbits_df = orbit_observations_df.assign(
+        begin=to_datetime_column(begin),
+        end=to_datetime_column(end),
+        exposure_time=(end - begin).dt.total_seconds(),
+    )
+
+    return {sector: orbits for sector, orbits in orbits_df.groupby("sector")}
+
+
+def fingerprint_sectors(
+    sector_pointings_df: pd.DataFrame, orbits_by_sector: dict[Any, pd.DataFrame]
+) -> dict[str, str]:
+    """
+    Hash each sector's pointing row together with its orbit rows, grouped by
+    `group_orbits_by_sector`, so that a sector gets a new fingerprint whenever
+    its pointing or orbits change
+    """
+    fingerprints = {}
+    for pointing in sector_pointings_df.to_dict(orient="records"):
+        orbits = orbits_by_sector.get(pointing["sector"])
+        sector_data = json.dumps(
+            {
+                "pointing": pointing,
+                "orbits": [] if orbits is None else orbits.to_dict(orient="records"),
+            },
+            sort_keys=True,
+            default=str,
+        )
+        fingerprints[str(pointing["sector"])] = hashlib.sha256(
+            sector_data.encode()
+        ).hexdigest()
+
+    return fingerprints
+
+
 def transform_to_across_orbit_observation(
     idx: int,
     obs: Any,  # Pandas namedtuple; no good typing for it
     pointing: Any,
     instrument_id,
 ) -> sdk.ObservationCreate:
-    # orbit start/end times are strings (non isot)
-    obs_start_str = str.replace(obs.start_of_orbit, " ", "T")
-    obs_end_str = str.replace(obs.end_of_orbit, " ", "T")
-    begin: datetime = Time(obs_start_str, format="isot").to_datetime()
-    end: datetime = Time(obs_end_str, format="isot").to_datetime()
-
-    exposure_time = end - begin
-
+    """
+    Creates an observation of an orbit from the orbits grouped by
+    `group_orbits_by_sector`, with precomputed begin, end and exposure time
+    """
     object_name = f"TESS_sector_{int(obs.sector)}_obs_{idx}_orbit_{int(obs.orbit)}"
 
     return sdk.ObservationCreate(
@@ -47,8 +115,8 @@ def transform_to_across_orbit_observation(
         external_observation_id=object_name,
         pointing_position=sdk.Coordinate(ra=pointing.ra, dec=pointing.dec),
         pointing_angle=pointing.roll,
-        date_range=sdk.DateRange(begin=begin, end=end),
-        exposure_time=exposure_time.total_seconds(),
+        date_range=sdk.DateRange(begin=obs.begin, end=obs.end),
+        exposure_time=obs.exposure_time,
         status=sdk.ObservationStatus.PLANNED,
         type=sdk.ObservationType.IMAGING,
         bandpass=sdk.Bandpass(TESS_BANDPASS),
@@ -91,6 +159,9 @@ def ingest():
     It iterates over the values of the sector_pointings_file, and cross-references the orbit time files to find intervals
     in which the telescope was not observing. If it doesn't find a cross-reference to the orbit file it will default to a
     schedule with a single observation with the date range being for the entire sector.
+
+    Only sectors that are new, or whose pointing or orbits changed since they were last posted, are transformed and
+    posted. The fingerprint of each posted sector is stored locally to compare against on the next run.
     """
 
     logger.info("Gathering schedule data")
@@ -117,16 +188,35 @@ def ingest():
     telescope_id = tess_telescope.id
     instrument_id = tess_telescope.instruments[0].id
 
+    # Only ingest the sectors that changed since they were last posted
+    ingested_fingerprints = StateStore("tess_sector_fingerprints")
+    orbits_by_sector = group_orbits_by_sector(orbit_observations_df)
+    sector_fingerprints = fingerprint_sectors(sector_pointings_df, orbits_by_sector)
+    changed_fingerprints = {
+        sector: fingerprint
+        for sector, fingerprint in sector_fingerprints.items()
+        if ingested_fingerprints.get(sector) != fingerprint
+    }
+
+    if not changed_fingerprints:
+        logger.info("No new or changed sectors to ingest")
+        return []
+
+    sector_pointings_df = sector_pointings_df[
+        sector_pointings_df["sector"].astype(str).isin(changed_fingerprints.keys())
+    ]
+
     # Initialize List of Schedules to append
     schedules = []
+    schedules_by_sector: dict[str, sdk.ScheduleCreate] = {}
+
+    logger.info("Transforming schedules...", sectors=len(changed_fingerprints))
 
-    logger.info("Transforming schedules...")
+    sector_pointings_df = prepare_sector_pointings(sector_pointings_df)
 
     # Iterate pointings file by row
     for pointing in sector_pointings_df.itertuples(index=False):
         # Create base schedule from  each pointings file row and set date range
-        sched_start_at = Time(pointing.start, format="jd")
-        sched_end_at = Time(pointing.end, format="jd")
         schedule_name = f"TESS_sector_{pointing.sector}"
 
         logger.debug("Transforming schedule", name=schedule_name)
@@ -136,19 +226,18 @@ def ingest():
             telescope_id=telescope_id,
             status=sdk.ScheduleStatus.PLANNED,
             fidelity=sdk.ScheduleFidelity.LOW,
-            date_range=sdk.DateRange(
-                begin=sched_start_at.to_datetime(),
-                end=sched_end_at.to_datetime(),
-            ),
+            date_range=sdk.DateRange(begin=pointing.begin, end=pointing.end),
             observations=[],
         )
 
         # Find planned orbits from TESS_orbit_times.csv for current sector from pointings row
-        matched_orbit_observations_df = orbit_observations_df.loc[
-            orbit_observations_df.sector == pointing.sector
-        ]
+        matched_orbit_observations_df = orbits_by_sector.get(pointing.sector)
 
-        orbit_observations = list(matched_orbit_observations_df.itertuples(index=False))
+        orbit_observations = (
+            list(matched_orbit_observations_df.itertuples(index=False))
+            if matched_orbit_observations_df is not None
+            else []
+        )
 
         # When TESS_orbit_times.csv has planned orbits for current sector
         logger.debug(
@@ -174,6 +263,7 @@ def ingest():
             schedule.observations.append(placeholder_observation)
 
         schedules.append(schedule)
+        schedules_by_sector[str(pointing.sector)] = schedule
 
     try:
         logger.debug("Posting Schedules")
@@ -183,14 +273,43 @@ def ingest():
         )
         sdk.ScheduleApi(client).create_many_schedules(create_many)
     except sdk.ApiException as err:
-        if err.status == 409:
-            logger.warning("A schedule already exists", extra=err.__dict__)
-        else:
+        if err.status != 409:
             raise err
 
+        logger.warning("A schedule already exists", extra=err.__dict__)
+        # the whole batch is rejected, so post each sector on its own to
+        # ingest the new sectors and only remember the ones the server confirms
+        post_sector_schedules(
+            schedules_by_sector, changed_fingerprints, ingested_fingerprints
+        )
+        return schedules
+
+    ingested_fingerprints.update(changed_fingerprints)
+
     return schedules
 
 
+def post_sector_schedules(
+    schedules_by_sector: dict[str, sdk.ScheduleCreate],
+    changed_fingerprints: dict[str, str],
+    ingested_fingerprints: StateStore,
+) -> None:
+    """
+    Posts the sector schedules one at a time, remembering the fingerprint of
+    each sector once the server has created it or confirms it already exists
+    """
+    for sector, schedule in schedules_by_sector.items():
+        try:
+            sdk.ScheduleApi(client).create_schedule(schedule)
+        except sdk.ApiException as err:
+            if err.status != 409:
+                raise err
+
+            logger.info("Schedule already exists.", schedule_name=schedule.name)
+
+        ingested_fingerprints.set(sector, changed_fingerprints[sector])
+
+
 @repeat_at(cron="12 22 * 8 *", logger=logger)
 async def entrypoint():
     try:
@@ -1,12 +1,13 @@
 from datetime import datetime, timedelta
+from typing import NamedTuple
 
-import astropy.units as u  # type: ignore[import-untyped]
 import pandas as pd
 import structlog
-from astropy.coordinates import SkyCoord  # type: ignore[import-untyped]
 from fastapi_utilities import repeat_at  # type: ignore
 
 from ....util.across_server import client, sdk
+from ....util.coordinates import dms_to_degrees, hms_to_degrees
+from ....util.time_conversion import to_datetime_column
 
 pd.options.mode.chained_assignment = None  # Disable pandas chained assignment warning
 
@@ -100,6 +101,8 @@ OM_WHITE_BANDPASS = sdk.WavelengthBandpass.model_validate(
     }
 )
 
+OM_FILTERS = {"UVW2", "UVM2", "UVW1", "U", "B", "V", "WHITE"}
+
 XMM_BANDPASSES: dict[str, sdk.EnergyBandpass | sdk.WavelengthBandpass] = {
     "EPIC": EPIC_BANDPASS,
     "RGS": RGS_BANDPASS,
@@ -113,6 +116,21 @@ XMM_BANDPASSES: dict[str, sdk.EnergyBandpass | sdk.WavelengthBandpass] = {
 }
 
 
+class ScheduledInstrument(NamedTuple):
+    name: str
+    short_name: str
+    observation_type: sdk.ObservationType
+    bandpass: str
+
+
+# Instruments observing for the whole scheduled observation
+XMM_SCHEDULED_INSTRUMENTS = [
+    ScheduledInstrument("mos", "EPIC-MOS", sdk.ObservationType.IMAGING, "EPIC"),
+    ScheduledInstrument("rgs", "RGS", sdk.ObservationType.SPECTROSCOPY, "RGS"),
+    ScheduledInstrument("pn", "EPIC-PN", sdk.ObservationType.IMAGING, "EPIC"),
+]
+
+
 def read_planned_schedule_table() -> pd.DataFrame:
     """Read the planned schedule table as a pandas DataFrame"""
     dfs: list[pd.DataFrame] = pd.read_html(
@@ -146,68 +164,80 @@ def read_revolution_timeline_file(revolution_id: int) -> pd.DataFrame:
     return dfs[1]
 
 
-def extract_om_exposures_from_timeline_data(timeline_df: pd.DataFrame) -> dict:
-    """
-    Read individual OM exposures from the timeline data and return them.
-    Parses the timeline data to get the start and stop time of each exposure.
-    Finds the correct OM filter by parsing the string in the "OM" field.
-    Additionally parses the strings to get the exposure time per filter.
-    """
-    # Get the start and stop indices for each observation in this revolution
-    obs_start_inds = timeline_df[timeline_df["Event"] == "OBS_START"].index
-    obs_stop_inds = timeline_df[timeline_df["Event"] == "OBS_END"].index
-
-    exposures = {}
-    for start_ind, stop_ind in zip(*(obs_start_inds, obs_stop_inds)):
-        # For each observation, get the OM exposures in each filter
-        current_obs_df = timeline_df[start_ind:stop_ind]
-
-        # Get the current observation ID
-        obs_id_ind = current_obs_df[current_obs_df["Event"].str[:3] == "ID:"].index
-        # The string is of form "ID: 12345", so slice it to just get the numerical part
-        obs_id = current_obs_df["Event"][obs_id_ind].values[0][4:]
-
-        # Construct a mask to find the start indices of each exposure by matching filter names
-        om_timeline_df = current_obs_df[current_obs_df["OM"].notna()]
-        filter_list = ["UVW2", "UVM2", "UVW1", "U", "B", "V", "WHITE"]
-        # Split the value of the string and match filter names in the spit string
-        split_om_logs = om_timeline_df["OM"].str.split().str[0]
-        mask = [
-            any(filt == split_string[:4] for filt in filter_list)
-            for split_string in split_om_logs
-        ]
-        # The row that matches the filter has the start time
-        exposure_start_inds = om_timeline_df[mask].index
-        exposure_start_times = current_obs_df["Date & Time"][exposure_start_inds].values
+class OMTimelineObservation:
+    """OM exposure details collected while reading an observation's timeline rows"""
 
-        # Get the filter for each exposure
-        exposure_filters = (
-            current_obs_df["OM"][exposure_start_inds].str.split().str[0].values
-        )
+    def __init__(self) -> None:
+        self.obs_id: str | None = None
+        self.filters: list[str] = []
+        self.start_times: list[str] = []
+        # insertion ordered set of the exposure time logs
+        self.exposure_logs: dict[str, None] = {}
 
-        # Get each unique exposure time (i.e., one entry per exposure)
-        raw_exposure_times = om_timeline_df[om_timeline_df["OM"].str.endswith("sec")][
-            "OM"
-        ].unique()
+    def exposures(self) -> list[dict]:
         # exptime has the form "Image ID: 600 sec"
         exposure_times = [
-            exptime.split(":")[-1].strip() for exptime in raw_exposure_times
+            exptime.split(":")[-1].strip() for exptime in self.exposure_logs
         ]
 
-        # Add it to the dictionary
-        exposures[obs_id] = [
+        return [
             {
                 "filter": filt,
-                "start_time": start_time.replace(
-                    " | ", " "
-                ),  # start_time has form "2025-08-20 | 00:00:00"
+                "start_time": start_time,
                 "exposure_time": int(exptime.split()[0]),  # exptime has form "600 sec"
             }
             for filt, start_time, exptime in zip(
-                *(exposure_filters, exposure_start_times, exposure_times)
+                *(self.filters, self.start_times, exposure_times)
             )
         ]
 
+
+def extract_om_exposures_from_timeline_data(timeline_df: pd.DataFrame) -> dict:
+    """
+    Read individual OM exposures from the timeline data and return them.
+    Parses the timeline data to get the start and stop time of each exposure.
+    Finds the correct OM filter by parsing the string in the "OM" field.
+    Additionally parses the strings to get the exposure time per filter.
+
+    The timeline is read in a single forward pass: an OBS_START row opens an
+    observation, the rows up to its OBS_END collect its ID, filter changes and
+    exposure times, and the OBS_END row emits its exposures.
+    """
+    exposures: dict[str, list[dict]] = {}
+    observation: OMTimelineObservation | None = None
+
+    for event, date_time, om_log in zip(
+        timeline_df["Event"], timeline_df["Date & Time"], timeline_df["OM"]
+    ):
+        if event == "OBS_START":
+            observation = OMTimelineObservation()
+        elif event == "OBS_END":
+            if observation is not None and observation.obs_id is not None:
+                exposures[observation.obs_id] = observation.exposures()
+            observation = None
+            continue
+
+        if observation is None:
+            continue
+
+        # The string is of form "ID: 12345", so slice it to just get the numerical part
+        if observation.obs_id is None and str(event)[:3] == "ID:":
+            observation.obs_id = event[4:]
+
+        if pd.isna(om_log):
+            continue
+
+        # The row that matches the filter has the start time
+        split_om_log = om_log.split()
+        if split_om_log and split_om_log[0][:4] in OM_FILTERS:
+            observation.filters.append(split_om_log[0])
+            # start_time has form "2025-08-20 | 00:00:00"
+            observation.start_times.append(date_time.replace(" | ", " "))
+
+        # Get each unique exposure time (i.e., one entry per exposure)
+        if om_log.endswith("sec"):
+            observation.exposure_logs.setdefault(om_log)
+
     return exposures
 
 
@@ -233,31 +263,19 @@ def transform_to_across_schedule(
 
 
 def transform_to_across_observation(
-    row: pd.Series,
-    exposure_start: str,
+    row: dict,
+    begin: datetime,
+    end: datetime,
     exposure_time: float,
     instrument_id: str,
     observation_type: sdk.ObservationType,
     bandpass: sdk.Bandpass,
 ) -> sdk.ObservationCreate:
-    """Construct ACROSS observation for the given exposure"""
-    pointing_coord = SkyCoord(
-        row["RA hh:mm:ss"], row["DEC dd:mm:ss"], unit=(u.hourangle, u.deg)
-    )
-    pointing_position = sdk.Coordinate.model_validate(
-        {
-            "ra": pointing_coord.ra.deg,
-            "dec": pointing_coord.dec.deg,
-        }
-    )
-    start_time = datetime.strptime(exposure_start, "%Y-%m-%d %H:%M:%S")
-    end_time = start_time + timedelta(seconds=exposure_time)
-    date_range = sdk.DateRange.model_validate(
-        {
-            "begin": start_time.strftime("%Y-%m-%d %H:%M:%S"),
-            "end": end_time.strftime("%Y-%m-%d %H:%M:%S"),
-        }
-    )
+    """
+    Construct ACROSS observation for the given exposure.
+    The row must have the precomputed `pointing_position` column.
+    """
+    pointing_position = row["pointing_position"]
     return sdk.ObservationCreate(
         instrument_id=instrument_id,
         object_name=row["Target Name"],
@@ -265,7 +283,7 @@ def transform_to_across_observation(
         pointing_position=pointing_position,
         object_position=pointing_position,
         pointing_angle=row["PA ddd.dd"],
-        date_range=date_range,
+        date_range=sdk.DateRange(begin=begin, end=end),
         exposure_time=exposure_time,
         status=sdk.ObservationStatus.PLANNED,
         type=observation_type,
@@ -273,73 +291,103 @@ def transform_to_across_observation(
     )
 
 
-def create_mos_observations(
-    observations_df: pd.DataFrame, instrument_id_dict: dict
-) -> list[sdk.ObservationCreate]:
-    observations_df["max_mos_exposure"] = observations_df.apply(
-        lambda row: max(
-            # "()" exposures signify closed filter, for our case we can ignore
-            float(str(row["MOS1 Dur. Ks"]).replace("( ", "").replace(")", "")),
-            float(str(row["MOS2 Dur. Ks"]).replace("( ", "").replace(")", "")),
-        )
-        * 1000.0,
-        axis=1,
-    )
-
-    return [
-        transform_to_across_observation(
-            row,
-            row["UTC Obs Start yyyy-mm-dd hh:mm:ss"],
-            row["max_mos_exposure"],
-            instrument_id_dict["EPIC-MOS"],
-            sdk.ObservationType.IMAGING,
-            sdk.Bandpass(XMM_BANDPASSES["EPIC"]),
-        )
-        for _, row in observations_df.iterrows()
+def parse_durations(*durations: pd.Series) -> pd.Series:
+    """
+    Convert columns of durations in Ks to the longest duration of each row in
+    seconds. "()" exposures signify closed filter, for our case we can ignore
+    the parentheses and use the duration
+    """
+    seconds = [
+        duration.astype(str)
+        .str.replace("( ", "", regex=False)
+        .str.replace(")", "", regex=False)
+        .astype(float)
+        * 1000.0
+        for duration in durations
     ]
+    return pd.concat(seconds, axis=1).max(axis=1)
 
 
-def create_rgs_observations(
-    observations_df: pd.DataFrame, instrument_id_dict: dict
-) -> list[sdk.ObservationCreate]:
-    observations_df["max_rgs_exposure"] = observations_df.apply(
-        lambda row: max(
-            float(row["RGS1 Dur. Ks"]),
-            float(row["RGS2 Dur. Ks"]),
-        )
-        * 1000.0,
-        axis=1,
+def prepare_schedule_data(schedule_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compute the pointing positions, exposure times and date ranges of each
+    instrument for the whole schedule at once, returning a copy of the
+    schedule data with the columns used to build the observations
+    """
+    start = pd.to_datetime(
+        schedule_data["UTC Obs Start yyyy-mm-dd hh:mm:ss"], format="%Y-%m-%d %H:%M:%S"
     )
+    exposure_times = {
+        "mos": parse_durations(
+            schedule_data["MOS1 Dur. Ks"], schedule_data["MOS2 Dur. Ks"]
+        ),
+        "rgs": parse_durations(
+            schedule_data["RGS1 Dur. Ks"], schedule_data["RGS2 Dur. Ks"]
+        ),
+        "pn": parse_durations(schedule_data["PN Dur Ks"]),
+    }
 
-    return [
-        transform_to_across_observation(
-            row,
-            row["UTC Obs Start yyyy-mm-dd hh:mm:ss"],
-            row["max_rgs_exposure"],
-            instrument_id_dict["RGS"],
-            sdk.ObservationType.SPECTROSCOPY,
-            sdk.Bandpass(XMM_BANDPASSES["RGS"]),
-        )
-        for _, row in observations_df.iterrows()
-    ]
+    columns: dict[str, pd.Series] = {"start": to_datetime_column(start)}
+    for name, exposure_time in exposure_times.items():
+        end = start + pd.to_timedelta(exposure_time, unit="s")
+        columns[f"{name}_exposure"] = exposure_time
+        # the schedule is given to the second
+        columns[f"{name}_end"] = to_datetime_column(end.dt.floor("s"))
+
+    return with_pointing_positions(schedule_data).assign(**columns)
 
 
-def create_pn_observations(
-    observations_df: pd.DataFrame, instrument_id_dict: dict
+def create_instrument_observations(
+    observation_records: list[dict], instrument_id_dict: dict
 ) -> list[sdk.ObservationCreate]:
+    """
+    Create the EPIC-MOS, RGS and EPIC-pn observations of the prepared
+    schedule records in one pass, grouped by instrument
+    """
+    observations: dict[str, list[sdk.ObservationCreate]] = {
+        instrument.name: [] for instrument in XMM_SCHEDULED_INSTRUMENTS
+    }
+    for row in observation_records:
+        for instrument in XMM_SCHEDULED_INSTRUMENTS:
+            observations[instrument.name].append(
+                transform_to_across_observation(
+                    row,
+                    row["start"],
+                    row[f"{instrument.name}_end"],
+                    row[f"{instrument.name}_exposure"],
+                    instrument_id_dict[instrument.short_name],
+                    instrument.observation_type,
+                    sdk.Bandpass(XMM_BANDPASSES[instrument.bandpass]),
+                )
+            )
+
     return [
-        transform_to_across_observation(
-            row,
-            row["UTC Obs Start yyyy-mm-dd hh:mm:ss"],
-            float(str(row["PN Dur Ks"]).replace("( ", "").replace(")", "")) * 1000.0,
-            instrument_id_dict["EPIC-PN"],
-            sdk.ObservationType.IMAGING,
-            sdk.Bandpass(XMM_BANDPASSES["EPIC"]),
-        )
-        for _, row in observations_df.iterrows()
+        observation
+        for instrument_observations in observations.values()
+        for observation in instrument_observations
     ]
 
 
+def with_pointing_positions(schedule_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the pointing coordinates of the whole schedule to degrees at once,
+    returning a copy of the schedule data with a `pointing_position` column
+    """
+    ra = hms_to_degrees(schedule_data["RA hh:mm:ss"])
+    dec = dms_to_degrees(schedule_data["DEC dd:mm:ss"])
+
+    pointing_positions = pd.Series(
+        [
+            sdk.Coordinate(ra=float(ra_deg), dec=float(dec_deg))
+            for ra_deg, dec_deg in zip(ra, dec)
+        ],
+        index=schedule_data.index,
+        dtype=object,
+    )
+
+    return schedule_data.assign(pointing_position=pointing_positions)
+
+
 def aggregate_observations(
     schedule_data: pd.DataFrame, instrument_id_dict: dict
 ) -> list[sdk.ObservationCreate]:
@@ -349,49 +397,47 @@ def aggregate_observations(
     constructing observations using the schedule data + OM exposure data
     """
     across_observations: list[sdk.ObservationCreate] = []
-    unique_rev_ids = schedule_data["Revn #"].unique()
+    prepared_schedule_data = prepare_schedule_data(schedule_data)
+    unique_rev_ids = prepared_schedule_data["Revn #"].unique()
     for rev_id in unique_rev_ids:
         # Read the revolution timeline for this revolution
         revolution_timeline_df = read_revolution_timeline_file(rev_id)
 
         # Filter the dataframe for the current revolution
-        current_revolution_observations_df = schedule_data[
-            schedule_data["Revn #"] == rev_id
-        ]
+        current_revolution_observations = prepared_schedule_data[
+            prepared_schedule_data["Revn #"] == rev_id
+        ].to_dict(orient="records")
 
         # Create observations for each instrument
-        across_mos_observations = create_mos_observations(
-            current_revolution_observations_df, instrument_id_dict
-        )
-        across_observations.extend(across_mos_observations)
-
-        across_rgs_observations = create_rgs_observations(
-            current_revolution_observations_df, instrument_id_dict
-        )
-        across_observations.extend(across_rgs_observations)
-
-        across_pn_observations = create_pn_observations(
-            current_revolution_observations_df, instrument_id_dict
+        across_observations.extend(
+            create_instrument_observations(
+                current_revolution_observations, instrument_id_dict
+            )
         )
-        across_observations.extend(across_pn_observations)
 
         if len(revolution_timeline_df):
             # Get OM exposure info from the revolution timeline df
             om_exposures = extract_om_exposures_from_timeline_data(
                 revolution_timeline_df
             )
-            across_om_observations = [
-                transform_to_across_observation(
-                    row,
-                    exposure["start_time"],
-                    exposure["exposure_time"],
-                    instrument_id_dict["OM"],
-                    sdk.ObservationType.IMAGING,
-                    sdk.Bandpass(XMM_BANDPASSES[exposure["filter"]]),
-                )
-                for _, row in current_revolution_observations_df.iterrows()
-                for exposure in om_exposures["0" + str(row["Obs Id."])]
-            ]
+            across_om_observations = []
+            for row in current_revolution_observations:
+                for exposure in om_exposures["0" + str(row["Obs Id."])]:
+                    exposure_start = datetime.strptime(
+                        exposure["start_time"], "%Y-%m-%d %H:%M:%S"
+                    )
+                    across_om_observations.append(
+                        transform_to_across_observation(
+                            row,
+                            exposure_start,
+                            exposure_start
+                            + timedelta(seconds=exposure["exposure_time"]),
+                            exposure["exposure_time"],
+                            instrument_id_dict["OM"],
+                            sdk.ObservationType.IMAGING,
+                            sdk.Bandpass(XMM_BANDPASSES[exposure["filter"]]),
+                        )
+                    )
             across_observations.extend(across_om_observations)
 
     return across_observations
@@ -16,7 +16,9 @@ class Config(BaseConfig):
         if not core_config.is_local():
             logger.debug("Getting spacetrack credentials from SSM...")
 
-            user_param = SSM.get_parameter("spacetrack/username", core_config.APP_ENV)
+            user_param = SSM.get_parameter(
+                core_config.SPACETRACK_USER_PATH, core_config.APP_ENV
+            )
             self.SPACETRACK_USER = str(user_param.get("Value"))
 
             logger.debug(
@@ -24,7 +26,7 @@ class Config(BaseConfig):
             )
 
             password_param = SSM.get_parameter(
-                "spacetrack/password", core_config.APP_ENV
+                core_config.SPACETRACK_PWD_PATH, core_config.APP_ENV
             )
             self.SPACETRACK_PWD = str(password_param.get("Value"))
 
@@ -53,7 +53,7 @@ class SSMCredentials(CredentialStorage):
         elif cred == "secret":
             param_name = config.ACROSS_SERVER_SECRET_PATH
 
-        param = SSM.get_parameter(param_name, config.APP_ENV)
+        param = SSM.get_parameter(param_name, config.APP_ENV, force=bool(force))
 
         value = param.get("Value")
 
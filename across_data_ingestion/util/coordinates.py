@@ -0,0 +1,77 @@
+from collections.abc import Iterable
+from typing import Literal
+
+import astropy.units as u  # type: ignore[import-untyped]
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+# Matches sexagesimal angles such as "12:34:56.7", "-05:30" or "+12 34 56"
+SEXAGESIMAL_PATTERN = (
+    r"^\s*(?P<sign>[+-])?\s*(?P<whole>\d+(?:\.\d*)?)"
+    r"(?:(?:\s*:\s*|\s+)(?P<minutes>\d+(?:\.\d*)?))?"
+    r"(?:(?:\s*:\s*|\s+)(?P<seconds>\d+(?:\.\d*)?))?\s*$"
+)
+
+# astropy's own scale, which is not exactly 15
+HOURANGLE_TO_DEGREES: float = u.hourangle.to(u.deg)
+
+
+def sexagesimal_to_degrees(
+    values: Iterable[str] | pd.Series,
+    hourangle: bool = False,
+    errors: Literal["raise", "coerce"] = "raise",
+) -> npt.NDArray[np.float64]:
+    """
+    Converts a column of sexagesimal strings into an array of degrees in one
+    pass, matching the values of `astropy.coordinates.Angle`.
+
+    Args:
+        values: Strings of the form `dd:mm:ss.s` (or `hh:mm:ss.s`)
+        hourangle: Whether the values are hour angles instead of degrees
+        errors: Whether invalid values raise or are set to NaN
+
+    Returns:
+        The values in degrees
+
+    Raises:
+        ValueError: If any value is not a sexagesimal angle and errors is "raise"
+    """
+    strings = pd.Series(values, dtype=object).astype(str)
+    parts = strings.str.extract(SEXAGESIMAL_PATTERN)
+
+    invalid = parts["whole"].isna()
+    if errors == "raise" and invalid.any():
+        raise ValueError(
+            f"Could not parse sexagesimal angles: {strings[invalid].tolist()}"
+        )
+
+    whole = parts["whole"].astype(float).to_numpy()
+    minutes = parts["minutes"].astype(float).fillna(0.0).to_numpy()
+    seconds = parts["seconds"].astype(float).fillna(0.0).to_numpy()
+    sign = np.where(parts["sign"].to_numpy() == "-", -1.0, 1.0)
+
+    # same operation order as astropy to get identical floats
+    magnitude = whole + minutes / 60.0 + seconds / 3600.0
+    angle = np.copysign(magnitude, sign)
+
+    if hourangle:
+        return angle * HOURANGLE_TO_DEGREES
+
+    return angle
+
+
+def hms_to_degrees(
+    values: Iterable[str] | pd.Series,
+    errors: Literal["raise", "coerce"] = "raise",
+) -> npt.NDArray[np.float64]:
+    """Converts a column of `hh:mm:ss.s` right ascensions into degrees"""
+    return sexagesimal_to_degrees(values, hourangle=True, errors=errors)
+
+
+def dms_to_degrees(
+    values: Iterable[str] | pd.Series,
+    errors: Literal["raise", "coerce"] = "raise",
+) -> npt.NDArray[np.float64]:
+    """Converts a column of `dd:mm:ss.s` declinations into degrees"""
+    return sexagesimal_to_degrees(values, errors=errors)
@@ -1,19 +1,34 @@
 import os
+import threading
+import time
 from typing import TYPE_CHECKING, Literal, cast
 
 import boto3
+import structlog
+from botocore.exceptions import BotoCoreError, ClientError
 
 if TYPE_CHECKING:
     from types_boto3_ssm import SSMClient, type_defs
 
 from ..core.config import config
 
+logger: structlog.stdlib.BoundLogger = structlog.get_logger()
+
+# Most parameter names GetParameters accepts in one call
+GET_PARAMETERS_MAX_NAMES = 10
+
 
 class SSM:
     """Utility class to interact with AWS Systems Manager Parameter Store"""
 
     _client: "SSMClient | None" = None
 
+    # parameter name -> (expiry, parameter)
+    _cache: "dict[str, tuple[float, type_defs.ParameterTypeDef]]" = {}
+    # prefetched parameter names -> expiry, also set when the prefetch failed
+    _prefetched: dict[tuple[str, ...], float] = {}
+    _lock = threading.RLock()
+
     @classmethod
     def _get_client(cls) -> "SSMClient":
         if cls._client is None:
@@ -24,17 +39,24 @@ class SSM:
                 profile_name=config.AWS_PROFILE,
                 region_name=config.AWS_REGION,
             )
-            cls._client = session.client("ssm")
+            cls._client = session.client("ssm", endpoint_url=config.AWS_ENDPOINT_URL)
 
         return cls._client
 
     @classmethod
-    def get_parameter(cls, name: str, path: str = "") -> "type_defs.ParameterTypeDef":
+    def get_parameter(
+        cls, name: str, path: str = "", force: bool = False
+    ) -> "type_defs.ParameterTypeDef":
         """Get a parameter from AWS Parameter Store or environment variable.
 
+        The first lookup under a path prefetches the parameters this service
+        reads (`config.ssm_parameter_names()`) under that path in one call,
+        and parameters are cached for `SSM_CACHE_TTL_SECONDS`.
+
         Args:
             name: The name of the parameter to get
             path: Optional path prefix
+            force: Skip the cache and fetch the parameter from AWS
 
         Returns:
             The parameter value
@@ -45,23 +67,82 @@ class SSM:
         if config.is_local():
             return cast(type_defs.ParameterTypeDef, os.getenv(name, {"Value": ""}))
 
-        client = cls._get_client()
         param_name = cls._build_param_name(path=path, name=name)
-        param = None
 
-        try:
-            response = client.get_parameter(Name=param_name, WithDecryption=True)
-            param = response.get("Parameter", {})
+        with cls._lock:
+            if not force:
+                if path:
+                    cls.prefetch_parameters(config.ssm_parameter_names(), path)
 
-        except client.exceptions.ParameterNotFound:
-            raise ValueError(f"Parameter {param_name} not found in AWS Parameter Store")
+                cached = cls._get_cached(param_name)
+                if cached is not None:
+                    return cached
 
-        if param.get("Value") is None:
-            raise ValueError(
-                f"Parameter {param_name} has no value in AWS Parameter Store"
-            )
+            client = cls._get_client()
+
+            try:
+                response = client.get_parameter(Name=param_name, WithDecryption=True)
+                param = response.get("Parameter", {})
+
+            except client.exceptions.ParameterNotFound:
+                raise ValueError(
+                    f"Parameter {param_name} not found in AWS Parameter Store"
+                )
+
+            if param.get("Value") is None:
+                raise ValueError(
+                    f"Parameter {param_name} has no value in AWS Parameter Store"
+                )
+
+            cls._set_cached(param_name, param)
+
+            return param
+
+    @classmethod
+    def prefetch_parameters(cls, names: list[str], path: str = "") -> None:
+        """Fetch and cache the named parameters under a path in as few calls as possible.
+
+        Failures are logged and not retried until `SSM_CACHE_TTL_SECONDS` have
+        passed, so lookups fall back to fetching parameters one at a time.
+
+        Args:
+            names: The names of the parameters to fetch
+            path: Optional path prefix
+        """
+        param_names = tuple(
+            cls._build_param_name(name=name, path=path) for name in names
+        )
 
-        return param
+        with cls._lock:
+            if cls._prefetched.get(param_names, 0) > time.monotonic():
+                return
+
+            cls._prefetched[param_names] = time.monotonic() + cls._ttl()
+            client = cls._get_client()
+
+            try:
+                for start in range(0, len(param_names), GET_PARAMETERS_MAX_NAMES):
+                    response = client.get_parameters(
+                        Names=list(
+                            param_names[start : start + GET_PARAMETERS_MAX_NAMES]
+                        ),
+                        WithDecryption=True,
+                    )
+                    for param in response.get("Parameters", []):
+                        if "Name" in param and param.get("Value") is not None:
+                            cls._set_cached(param["Name"], param)
+
+            except (BotoCoreError, ClientError) as err:
+                logger.warning(
+                    "Failed to prefetch SSM parameters.", names=param_names, err=err
+                )
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear all cached parameters."""
+        with cls._lock:
+            cls._cache.clear()
+            cls._prefetched.clear()
 
     @classmethod
     def put_parameter(
@@ -92,6 +173,26 @@ class SSM:
             Overwrite=overwrite,
         )
 
+        with cls._lock:
+            cls._cache.pop(param_name, None)
+
+    @classmethod
+    def _get_cached(cls, param_name: str) -> "type_defs.ParameterTypeDef | None":
+        cached = cls._cache.get(param_name)
+
+        if cached is None or cached[0] <= time.monotonic():
+            return None
+
+        return cached[1]
+
+    @classmethod
+    def _set_cached(cls, param_name: str, param: "type_defs.ParameterTypeDef") -> None:
+        cls._cache[param_name] = (time.monotonic() + cls._ttl(), param)
+
+    @classmethod
+    def _ttl(cls) -> float:
+        return float(config.SSM_CACHE_TTL_SECONDS)
+
     @classmethod
     def _build_param_name(cls, name: str, path: str = "") -> str:
         param_name = f"{path}/{name}" if len(path) > 0 else f"/{name}"
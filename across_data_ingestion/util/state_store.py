@@ -0,0 +1,52 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..core.config import config
+
+
+class StateStore:
+    """
+    Persistent JSON key-value store for task state that should survive
+    restarts, such as checkpoints of completed work.
+
+    State is stored at `CACHE_DIR/state/<name>.json`, and every `set` is
+    written through to disk atomically so a crash never loses completed keys.
+    """
+
+    def __init__(self, name: str, state_dir: str | None = None) -> None:
+        self._path = Path(state_dir or config.CACHE_DIR) / "state" / f"{name}.json"
+        self._lock = threading.Lock()
+        self._state: dict[str, Any] = self._load()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._state.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._state[key] = value
+            self._save()
+
+    def update(self, values: dict[str, Any]) -> None:
+        """Set several keys at once, writing them to disk together"""
+        with self._lock:
+            self._state.update(values)
+            self._save()
+
+    def _load(self) -> dict[str, Any]:
+        if not self._path.exists():
+            return {}
+
+        with open(self._path) as state_file:
+            return json.load(state_file)
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so a crash never leaves a partial file
+        tmp_path = self._path.with_suffix(".tmp")
+        with open(tmp_path, "w") as state_file:
+            json.dump(self._state, state_file)
+
+        tmp_path.replace(self._path)
@@ -0,0 +1,80 @@
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import structlog
+from astropy.table import Table  # type: ignore[import-untyped]
+
+from ..core.config import config
+
+logger: structlog.stdlib.BoundLogger = structlog.get_logger()
+
+
+class TableCache:
+    """
+    File based cache of astropy Tables with a time to live.
+
+    Tables are stored as Parquet files under `CACHE_DIR/<namespace>`, named by
+    a hash of their key, and expire `ttl` after they were written.
+
+    Usage:
+    ```
+    cache = TableCache("namespace", ttl=timedelta(hours=1))
+    table = cache.get(key)
+    if table is None:
+        table = ...
+        cache.put(key, table)
+    ```
+    """
+
+    def __init__(
+        self, namespace: str, ttl: timedelta, cache_dir: str | None = None
+    ) -> None:
+        self._dir = Path(cache_dir or config.CACHE_DIR) / namespace
+        self._ttl = ttl
+
+    def get(self, key: str) -> Table | None:
+        """Returns the cached table for the key, or None if missing or expired"""
+        path = self._path(key)
+
+        if not path.exists():
+            return None
+
+        written_at = datetime.fromtimestamp(path.stat().st_mtime)
+        if datetime.now() - written_at > self._ttl:
+            return None
+
+        try:
+            return Table.read(path, format="parquet")
+        except (OSError, ValueError) as err:
+            logger.warning("Could not read cached table", path=str(path), err=err)
+            return None
+
+    def put(self, key: str, table: Table) -> None:
+        """Writes the table to the cache under the key"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first so readers never see a partial file
+        tmp_path = path.with_suffix(".tmp")
+        self._with_string_columns(table).write(
+            tmp_path, format="parquet", overwrite=True
+        )
+        tmp_path.replace(path)
+
+    @staticmethod
+    def _with_string_columns(table: Table) -> Table:
+        """
+        Converts object columns, such as VOTable `char arraysize="*"` fields,
+        to fixed-width strings, since the parquet writer cannot encode them
+        """
+        table = table.copy(copy_data=False)
+        for name in table.colnames:
+            if table[name].dtype.kind == "O":
+                table[name] = table[name].astype(str)
+
+        return table
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self._dir / f"{digest}.parquet"
@@ -0,0 +1,79 @@
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+from astropy.time import Time, TimeDelta  # type: ignore[import-untyped]
+
+# Formats of the time columns read from the mission schedules.
+# "met" is mission elapsed time, the seconds since a mission epoch.
+TimeFormat = Literal["isot", "iso", "yday", "mjd", "jd", "met"]
+STRING_TIME_FORMATS = {"isot", "iso", "yday"}
+
+
+def to_time(
+    values: Iterable,
+    format: TimeFormat,
+    epoch: Time | None = None,
+) -> Time:
+    """
+    Converts a whole column of times into a single astropy `Time` array, so
+    the conversion is done in one vectorized call instead of once per row.
+
+    Args:
+        values: The times, as strings or numbers depending on the format
+        format: The format of the times
+        epoch: The mission epoch, required for mission elapsed times
+
+    Returns:
+        The times as one `Time` array
+
+    Raises:
+        ValueError: If the format is "met" and no epoch is given
+    """
+    if format == "met":
+        if epoch is None:
+            raise ValueError("An epoch is required to convert mission elapsed times")
+
+        return epoch + TimeDelta(np.asarray(values, dtype=float), format="sec")
+
+    if format in STRING_TIME_FORMATS:
+        return Time(np.asarray(values).astype(str), format=format)
+
+    return Time(np.asarray(values, dtype=float), format=format)
+
+
+def to_isot(
+    values: Iterable,
+    format: TimeFormat,
+    epoch: Time | None = None,
+) -> list[str]:
+    """Converts a whole column of times into ISO 8601 strings"""
+    times = np.asarray(values)
+    if not times.size:
+        return []
+
+    return to_time(times, format, epoch).isot.tolist()
+
+
+def to_datetimes(
+    values: Iterable,
+    format: TimeFormat,
+    epoch: Time | None = None,
+) -> list[datetime]:
+    """Converts a whole column of times into naive `datetime` objects"""
+    times = np.asarray(values)
+    if not times.size:
+        return []
+
+    return to_time(times, format, epoch).to_datetime().tolist()
+
+
+def to_datetime_column(datetimes: pd.Series) -> pd.Series:
+    """Converts a datetime64 column to a column of `datetime` objects"""
+    return pd.Series(
+        pd.DatetimeIndex(datetimes).to_pydatetime(),
+        index=datetimes.index,
+        dtype=object,
+    )
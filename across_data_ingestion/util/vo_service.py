@@ -1,16 +1,55 @@
 import asyncio
 import contextlib
+import re
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable
+from enum import Enum
 from io import BytesIO
 
 import httpx
 import structlog
 from astropy.io import votable  # type: ignore[import-untyped]
-from astropy.table import Table  # type: ignore[import-untyped]
+from astropy.table import Table, vstack  # type: ignore[import-untyped]
+
+from .table_cache import TableCache
 
 logger: structlog.stdlib.BoundLogger = structlog.get_logger()
 
 
+class ResultFormat(Enum):
+    """
+    TAP result serializations the VOService can request and decode.
+    BINARY2 VOTables and CSV are much smaller to transfer and faster to decode
+    than the default TABLEDATA VOTable, which is parsed cell by cell.
+    """
+
+    VOTABLE = "votable"
+    VOTABLE_BINARY2 = "application/x-votable+xml;serialization=BINARY2"
+    CSV = "csv"
+
+
+# Queries expected to return at most this many rows are run through the
+# synchronous TAP endpoint instead of an async (UWS) job
+SYNC_QUERY_MAX_ROWS = 1000
+
+TOP_CLAUSE_PATTERN = re.compile(r"^\s*SELECT\s+TOP\s+(\d+)", re.IGNORECASE)
+
+# Matches ADQL string literals, including escaped '' quotes
+STRING_LITERAL_PATTERN = re.compile(r"('(?:[^']|'')*')")
+
+# Maximum number of queries in flight at once against a single service
+MAX_CONCURRENT_QUERIES = 4
+
+# Seconds the blocking UWS job request waits for the job to finish
+ASYNC_JOB_WAIT_SECONDS = 10
+
+# Placeholder in keyed lookup queries replaced by each chunk's IN list
+KEYS_PLACEHOLDER = "{keys}"
+
+# Maximum number of keys in a single IN list of a keyed lookup
+KEYED_LOOKUP_CHUNK_SIZE = 200
+
+
 class VOService(contextlib.AbstractAsyncContextManager):
     """
     Class to handle TAP queries to a VO service used within a context manager.
@@ -23,49 +62,244 @@ class VOService(contextlib.AbstractAsyncContextManager):
         res1 = await vo_service.query(...)
         # another query 2
         res2 = await vo_service.query(...)
+        # independent queries 3 and 4, run concurrently
+        res3, res4 = await vo_service.query_many([...])
     ```
+
+    Queries expected to be small (see `_is_small_query`) are run in a single
+    round trip against the synchronous `/sync` TAP endpoint, falling back to
+    an async job when the sync request fails or overflows `sync_max_rows`.
+
+    When a `TableCache` is provided, results are cached by service url and
+    normalized query text, and repeat queries within the cache TTL are
+    returned without contacting the service.
     """
 
     _url: str
+    _sync_url: str
 
-    def __init__(self, url: str) -> None:
+    def __init__(
+        self,
+        url: str,
+        sync_max_rows: int = SYNC_QUERY_MAX_ROWS,
+        max_concurrent_queries: int = MAX_CONCURRENT_QUERIES,
+        result_format: ResultFormat = ResultFormat.VOTABLE,
+        cache: TableCache | None = None,
+    ) -> None:
         self._url = url
+        self._result_format = result_format
+        self._cache = cache
+        self._sync_url = self._build_sync_url(url)
+        self._sync_max_rows = sync_max_rows
         self._lock = asyncio.Lock()
+        self._query_semaphore = asyncio.Semaphore(max_concurrent_queries)
         self._client = httpx.AsyncClient()
 
-    async def query(self, query: str) -> Table | None:
-        """Wrapper to initialize, run, and fetch results from query"""
-        await self._initialize_query(query)
-        query_ran = await self._run_query()
+    async def query(self, query: str, expected_rows: int | None = None) -> Table | None:
+        """
+        Wrapper to initialize, run, and fetch results from query.
 
-        if query_ran:
-            results = self._get_results()
-            if results:
-                return self._to_astropy_table(results)
+        Args:
+            query: The ADQL query to run
+            expected_rows: Optional upper bound of rows the query will return,
+                used to decide if the query can be run synchronously
+        """
+        if self._cache:
+            cache_key = self._build_cache_key(query)
+            cached_table = self._cache.get(cache_key)
+            if cached_table is not None:
+                logger.debug("Using cached TAP query results", url=self._url)
+                return cached_table
 
-        return None
+        table = await self._query_service(query, expected_rows)
 
-    async def _initialize_query(self, query: str) -> None:
-        """Puts the query in a queue to be executed"""
-        data = {
-            "REQUEST": "doQuery",
-            "FORMAT": "votable",
-            "LANG": "ADQL",
-            "QUERY": query,
-        }
+        if self._cache and table is not None:
+            try:
+                self._cache.put(cache_key, table)
+            except Exception as err:
+                # the cache is only a debugging aid, never fail the query over it
+                logger.warning("Could not cache TAP query results", err=err)
+
+        return table
+
+    async def _query_service(
+        self, query: str, expected_rows: int | None
+    ) -> Table | None:
+        """Runs the query against the service, synchronously when small"""
+        async with self._query_semaphore:
+            if self._is_small_query(query, expected_rows):
+                table = await self._run_sync_query(query)
+                if table is not None:
+                    return table
+
+            job_url = await self._initialize_query(query)
+            query_ran = await self._run_query(job_url)
+
+            if query_ran:
+                results = await self._get_results(job_url)
+                if results:
+                    return self._to_astropy_table(results)
+
+            return None
+
+    async def query_many(
+        self, queries: list[str], expected_rows: int | None = None
+    ) -> list[Table | None]:
+        """
+        Runs independent queries concurrently, so their round trips overlap.
+        Returns the results in the same order as the queries.
+        """
+        return await asyncio.gather(
+            *(self.query(query, expected_rows) for query in queries)
+        )
+
+    async def query_by_keys(
+        self,
+        query: str,
+        keys: Iterable[str],
+        chunk_size: int = KEYED_LOOKUP_CHUNK_SIZE,
+        expected_rows_per_key: int | None = None,
+    ) -> Table | None:
+        """
+        Runs a lookup query for a set of keys, e.g. `WHERE obs_id IN ({keys})`.
+        Splits the keys into bounded IN lists, so the ADQL stays small as the
+        key set grows, runs the chunks concurrently and stacks their tables.
+
+        Args:
+            query: The ADQL query containing the `{keys}` placeholder
+            keys: The values to look up, quoted as ADQL strings
+            chunk_size: Maximum number of keys per query
+            expected_rows_per_key: Optional upper bound of rows per key,
+                used to decide if each chunk can be run synchronously
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        chunks = [
+            unique_keys[i : i + chunk_size]
+            for i in range(0, len(unique_keys), chunk_size)
+        ]
+
+        chunk_queries = [
+            query.replace(KEYS_PLACEHOLDER, self._to_adql_in_list(chunk))
+            for chunk in chunks
+        ]
+        expected_rows = (
+            chunk_size * expected_rows_per_key
+            if expected_rows_per_key is not None
+            else None
+        )
+
+        tables = [
+            table
+            for table in await self.query_many(chunk_queries, expected_rows)
+            if table is not None
+        ]
+        if not tables:
+            return None
+
+        return vstack(tables) if len(tables) > 1 else tables[0]
+
+    def _is_small_query(self, query: str, expected_rows: int | None) -> bool:
+        """
+        Whether the query is expected to return few enough rows to be run
+        synchronously, either from the caller's `expected_rows` or from an
+        ADQL `TOP n` clause. Queries of unknown size are run asynchronously.
+        """
+        if expected_rows is None:
+            top_clause = TOP_CLAUSE_PATTERN.match(query)
+            if not top_clause:
+                return False
+
+            expected_rows = int(top_clause.group(1))
+
+        return expected_rows <= self._sync_max_rows
+
+    async def _run_sync_query(self, query: str) -> Table | None:
+        """
+        Runs the query against the synchronous TAP endpoint in a single request.
+        The results are capped with MAXREC, so a query that turns out to be larger
+        than expected overflows and returns None for the caller to run it async.
+        """
+        data = self._build_query_data(query)
+        data["MAXREC"] = str(self._sync_max_rows)
+
+        try:
+            response = await self._client.request(
+                method="POST",
+                url=self._sync_url,
+                follow_redirects=True,
+                data=data,
+            )
+        except httpx.HTTPError as err:
+            logger.warning("Sync TAP query failed, falling back to async", err=err)
+            return None
+
+        if response.status_code != httpx.codes.OK or not response.content:
+            logger.warning(
+                "Sync TAP query failed, falling back to async",
+                status_code=response.status_code,
+            )
+            return None
+
+        # an HTML error page or an unsupported FORMAT is not a valid result
+        try:
+            return self._parse_sync_results(response.content)
+        except (ValueError, IndexError) as err:
+            logger.warning(
+                "Sync TAP query returned invalid results, falling back to async",
+                err=err,
+            )
+            return None
+
+    def _parse_sync_results(self, content: bytes) -> Table | None:
+        """
+        Parses the sync query results, returning None when the service reports
+        the query did not complete or the results were truncated
+        """
+        if self._result_format == ResultFormat.CSV:
+            table = self._to_astropy_table(content)
+
+            # CSV has no overflow marker, so a full page may have been truncated
+            if len(table) >= self._sync_max_rows:
+                logger.warning(
+                    "Sync TAP query may have overflowed, falling back to async",
+                    rows=len(table),
+                )
+                return None
+
+            return table
+
+        tabledata = votable.parse(BytesIO(content))
+
+        # the sync endpoint reports errors and truncated results in the VOTable
+        # itself, an OVERFLOW status follows the table after a leading OK status
+        query_statuses = [
+            info.value for info in tabledata.get_infos_by_name("QUERY_STATUS")
+        ]
+        if any(status != "OK" for status in query_statuses):
+            logger.warning(
+                "Sync TAP query did not complete, falling back to async",
+                query_statuses=query_statuses,
+            )
+            return None
+
+        return tabledata.get_first_table().to_table()
+
+    async def _initialize_query(self, query: str) -> str:
+        """Puts the query in a queue to be executed, returning the UWS job url"""
+        data = self._build_query_data(query)
         response = await self._client.request(
             method="POST",
             url=self._url,
             follow_redirects=True,
             data=data,
         )
-        self.job_url = str(response.url)
+        return str(response.url)
 
-    async def _run_query(self) -> bool:
+    async def _run_query(self, job_url: str) -> bool:
         """Runs the queued query"""
         response = await self._client.request(
             method="POST",
-            url=self.job_url + "/phase",
+            url=job_url + "/phase",
             data={"PHASE": "RUN"},
             follow_redirects=True,
         )
@@ -75,29 +309,81 @@ class VOService(contextlib.AbstractAsyncContextManager):
 
         return bool(response.text)
 
-    def _get_results(self) -> str:
+    async def _get_results(self, job_url: str) -> bytes:
         """
         Gets the results from the ran query.
         Begins with a blocking GET request with a maximum wait time of 10s
         to wait for the query to run, and checks that it was completed
         before proceeding (from TAP documentation).
         """
-        block_query_response = httpx.get(self.job_url + "?WAIT=10")
+        block_query_response = await self._client.request(
+            method="GET",
+            url=job_url + f"?WAIT={ASYNC_JOB_WAIT_SECONDS}",
+            follow_redirects=True,
+            # allow the server to hold the request open for the whole wait
+            timeout=ASYNC_JOB_WAIT_SECONDS + 5,
+        )
         root = ET.fromstring(block_query_response.text)
         phase = root.find("{http://www.ivoa.net/xml/UWS/v1.0}phase")
 
         if phase is None or phase.text != "COMPLETED":
-            return ""
+            return b""
+
+        response = await self._client.request(
+            method="GET",
+            url=job_url + "/results/result",
+            follow_redirects=True,
+        )
+        return response.content
+
+    def _build_query_data(self, query: str) -> dict[str, str]:
+        """Builds the TAP request parameters for the query"""
+        return {
+            "REQUEST": "doQuery",
+            "FORMAT": self._result_format.value,
+            "LANG": "ADQL",
+            "QUERY": query,
+        }
 
-        response = httpx.get(self.job_url + "/results/result")
-        return response.text
+    def _to_astropy_table(self, response_content: bytes) -> Table:
+        """
+        Decodes the raw response bytes into an astropy Table,
+        without round-tripping through a decoded string
+        """
+        if self._result_format == ResultFormat.CSV:
+            return Table.read(BytesIO(response_content), format="ascii.csv")
 
-    def _to_astropy_table(self, response_text: str) -> Table:
-        """Transforms XML response text into astropy Table"""
-        tabledata = votable.parse(BytesIO(response_text.encode()))
+        # BINARY2 and TABLEDATA VOTables are both decoded by the votable parser
+        tabledata = votable.parse(BytesIO(response_content))
         table = tabledata.get_first_table().to_table()
         return table
 
+    def _build_cache_key(self, query: str) -> str:
+        """
+        Builds the cache key from the service url, result format, and the query
+        with whitespace collapsed outside of string literals, so formatting
+        differences in the same query share cached results.
+        """
+        parts = STRING_LITERAL_PATTERN.split(query.strip())
+        # odd parts are the captured string literals, which are kept verbatim
+        normalized_query = "".join(
+            part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts)
+        )
+
+        return f"{self._url}|{self._result_format.value}|{normalized_query}"
+
+    @staticmethod
+    def _to_adql_in_list(keys: list[str]) -> str:
+        """Quotes the keys as ADQL string literals for an IN list"""
+        escaped_keys = (key.replace("'", "''") for key in keys)
+        return ", ".join(f"'{key}'" for key in escaped_keys)
+
+    @staticmethod
+    def _build_sync_url(url: str) -> str:
+        """Builds the synchronous TAP endpoint from the async or base service url"""
+        base_url = url.rstrip("/").removesuffix("/async")
+        return f"{base_url}/sync"
+
     def _require_client(self):
         if not self._entered or self._client is None or self._client.is_closed:
             raise RuntimeError("MyHttpxService must be used inside an async with block")
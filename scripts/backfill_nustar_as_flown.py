@@ -0,0 +1,20 @@
+import argparse
+import asyncio
+from datetime import datetime
+
+from across_data_ingestion.tasks.schedules.nustar.as_flown import backfill
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Backfill NuSTAR as-flown schedules for a historical date range."
+    )
+    parser.add_argument("begin", type=datetime.fromisoformat, help="e.g. 2012-07-01")
+    parser.add_argument("end", type=datetime.fromisoformat, help="e.g. 2025-01-01")
+    args = parser.parse_args()
+
+    asyncio.run(backfill(args.begin, args.end))
+
+
+if __name__ == "__main__":
+    main()
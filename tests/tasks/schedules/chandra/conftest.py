@@ -106,6 +106,8 @@ def mock_vo_service_query(
 def mock_vo_service(mock_vo_service_query: AsyncMock) -> AsyncMock:
     mock_instance = AsyncMock()
     mock_instance.query = mock_vo_service_query
+    # exposure times are looked up by key, sharing the ordered query side effects
+    mock_instance.query_by_keys = mock_vo_service_query
     # mock the context management so it actually returns the expected instance
     mock_instance.__aenter__.return_value = mock_instance
 
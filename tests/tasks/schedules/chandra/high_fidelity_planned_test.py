@@ -1,15 +1,33 @@
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from astropy.table import Table  # type: ignore[import-untyped]
 
+import across_data_ingestion.tasks.schedules.chandra.high_fidelity_planned as task
+from across_data_ingestion.core.enums import Environments
 from across_data_ingestion.tasks.schedules.chandra.high_fidelity_planned import (
+    ChandraObservation,
+    create_schedule,
     get_observation_data_from_tap,
     ingest,
-    match_instrument_from_tap_observation,
+    match_instrument,
+    match_instrument_short_names,
+    prepare_observations,
 )
 from across_data_ingestion.util.across_server import sdk
 
+FAKE_CHANDRA_OBSERVATION = ChandraObservation(
+    obs_id="28845",
+    target_name="Abell 370",
+    begin="2025-06-30T22:23:23",
+    end="2025-07-01T03:56:43.000",
+    ra=39.96041666666667,
+    dec=-1.5856000000000001,
+    exposure_time=20000.0,
+    instrument_short_name="ACIS",
+)
+
 
 class TestChandraHighFidelityPlannedScheduleIngestionTask:
     @pytest.mark.asyncio
@@ -79,18 +97,92 @@ class TestChandraHighFidelityPlannedScheduleIngestionTask:
             ),
         ],
     )
-    def test_should_match_instrument_from_tap_observation(
+    def test_should_match_instrument_short_names(
+        self, mock_tap_row: dict, expected_instrument_short_name: str
+    ) -> None:
+        """Should construct the instrument short name from the observation row"""
+        short_names = match_instrument_short_names(Table([mock_tap_row]))
+
+        assert short_names.tolist() == [expected_instrument_short_name]
+
+    @pytest.mark.parametrize("short_name", ["ACIS", "HRC-Timing"])
+    def test_should_match_instrument_by_short_name(
         self,
-        mock_tap_row: dict,
-        expected_instrument_short_name: str,
+        short_name: str,
         fake_instruments_by_short_name: dict[str, sdk.TelescopeInstrument],
     ) -> None:
-        """Should return correct instrument name and id from observation row"""
-        instrument = match_instrument_from_tap_observation(
-            fake_instruments_by_short_name, mock_tap_row
+        """Should return the across-server instrument for the matched short name"""
+        observation = FAKE_CHANDRA_OBSERVATION._replace(
+            instrument_short_name=short_name
+        )
+
+        instrument = match_instrument(fake_instruments_by_short_name, observation)
+
+        assert instrument == fake_instruments_by_short_name[short_name]
+
+    def test_should_log_warning_when_instrument_not_matched(
+        self,
+        fake_instruments_by_short_name: dict[str, sdk.TelescopeInstrument],
+        mock_logger: MagicMock,
+    ) -> None:
+        """Should log the observation and return an empty instrument when unmatched"""
+        observation = FAKE_CHANDRA_OBSERVATION._replace(instrument_short_name="")
+
+        instrument = match_instrument(fake_instruments_by_short_name, observation)
+
+        assert instrument.short_name == ""
+        assert mock_logger.warning.call_args.kwargs["tap_observation"] == observation
+
+    def test_should_match_instrument_short_names_for_whole_table(self):
+        """Should construct the instrument short name of every observation row"""
+        table = Table(
+            {
+                "instrument": ["ACIS-I", "ACIS-S", "HRC-S", "HRC-I", "BAD_INSTRUMENT"],
+                "grating": ["NONE", "HETG", "LETG", "NONE", ""],
+                "exposure_mode": ["NONE", "CC", "", "TIMING", ""],
+            }
+        )
+
+        short_names = match_instrument_short_names(table)
+
+        assert short_names.tolist() == [
+            "ACIS",
+            "ACIS-HETG",
+            "HRC-LETG",
+            "HRC-Timing",
+            "",
+        ]
+
+    def test_should_prepare_observations_from_columns(
+        self, fake_observation_data: dict, fake_exposure_times_data: dict
+    ):
+        """Should convert end times, coordinates and instruments as columns"""
+        table = Table([{**fake_observation_data, **fake_exposure_times_data}])
+
+        [observation] = prepare_observations(table)
+
+        assert observation.begin == "2025-06-30T22:23:23"
+        assert observation.end == "2025-07-01T03:56:43.000"
+        assert observation.ra == 39.96041666666667
+        assert observation.dec == -1.5856000000000001
+        assert observation.exposure_time == 20000.0
+        assert observation.instrument_short_name == "ACIS"
+
+    def test_should_create_schedule_spanning_start_dates(
+        self, fake_observation_data: dict
+    ):
+        """Should name the schedule after the earliest and latest start dates"""
+        table = Table(
+            [
+                {**fake_observation_data, "start_date": "2025-07-02T01:00:00"},
+                fake_observation_data,
+                {**fake_observation_data, "start_date": "2025-07-01T01:00:00"},
+            ]
         )
 
-        assert instrument.short_name == expected_instrument_short_name
+        schedule = create_schedule("telescope-id", table)
+
+        assert schedule.name == "chandra_high_fidelity_planned_2025-06-30_2025-07-02"
 
     class TestGetObservationsFromTap:
         @pytest.mark.asyncio
@@ -123,6 +215,36 @@ class TestChandraHighFidelityPlannedScheduleIngestionTask:
 
             assert expected_table in obs_call.args[0]
 
+        @pytest.mark.asyncio
+        @pytest.mark.parametrize(
+            ["runtime_env", "expected_start_date"],
+            [
+                (Environments.LOCAL, "2025-07-01 12:00:00"),
+                (Environments.PRODUCTION, "2025-07-01 12:34:56"),
+            ],
+        )
+        async def test_should_only_truncate_query_time_when_caching(
+            self,
+            mock_vo_service_query: AsyncMock,
+            monkeypatch: pytest.MonkeyPatch,
+            runtime_env: Environments,
+            expected_start_date: str,
+        ):
+            """Should only truncate the current time to the hour for the local cache"""
+
+            class FixedDatetime(datetime):
+                @classmethod
+                def now(cls, tz=None):
+                    return datetime(2025, 7, 1, 12, 34, 56, tzinfo=tz)
+
+            monkeypatch.setattr(task, "datetime", FixedDatetime)
+            monkeypatch.setattr(task.config, "RUNTIME_ENV", runtime_env)
+
+            await get_observation_data_from_tap()
+
+            query = mock_vo_service_query.call_args_list[0].args[0]
+            assert f"o.start_date > '{expected_start_date}'" in query
+
         @pytest.mark.asyncio
         @pytest.mark.parametrize(
             ["expected_col"],
@@ -2,7 +2,6 @@ import os
 from datetime import datetime
 from unittest.mock import MagicMock
 
-import bs4
 import httpx
 import pandas as pd
 import pytest
@@ -31,15 +30,27 @@ def set_sdk_data(
     mock_instrument_api.get_instruments.return_value = [fake_instrument]
 
 
+@pytest.fixture
+def fake_timeline_file_raw_data() -> str:
+    with open(os.path.join(os.path.dirname(__file__), "mocks/timeline_07_28_25")) as f:
+        return f.read()
+
+
 @pytest.fixture(autouse=True)
 def set_httpx_get(
     mock_httpx_get: MagicMock,
-    # fake_timeline_file_raw_data: str,
+    fake_timeline_file_raw_data: str,
 ) -> None:
-    mock_response = MagicMock(spec=httpx.Response)
-    mock_response.text = "some html"
+    def get(url: str, *args, **kwargs) -> MagicMock:
+        mock_response = MagicMock(spec=httpx.Response)
+        if "timeline_" in url:
+            mock_response.text = fake_timeline_file_raw_data
+        else:
+            mock_response.text = "some html"
 
-    mock_httpx_get.return_value = mock_response
+        return mock_response
+
+    mock_httpx_get.side_effect = get
 
 
 @pytest.fixture(autouse=True)
@@ -59,20 +70,35 @@ def set_mock_csv_files(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
 
-@pytest.fixture()
-def mock_soup(fake_timeline_html_tags: list[MagicMock]) -> MagicMock:
-    mock = MagicMock(spec=bs4.BeautifulSoup)
-    mock.find_all.return_value = fake_timeline_html_tags
+@pytest.fixture(autouse=True)
+def reset_latest_timeline_listing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(task, "latest_timeline_listing", {})
+
+
+@pytest.fixture
+def mock_timeline_listing_response(fake_timeline_listing_html: str) -> MagicMock:
+    mock = MagicMock(spec=httpx.Response)
+    mock.status_code = 200
+    mock.headers = httpx.Headers({"ETag": '"fake-etag"'})
+    # split the links across chunks
+    mock.iter_text.return_value = [
+        fake_timeline_listing_html[i : i + 20]
+        for i in range(0, len(fake_timeline_listing_html), 20)
+    ]
+
     return mock
 
 
 @pytest.fixture(autouse=True)
-def mock_soup_cls(monkeypatch: pytest.MonkeyPatch, mock_soup: MagicMock):
-    mock_soup_cls = MagicMock(return_value=mock_soup)
+def mock_httpx_stream(
+    monkeypatch: pytest.MonkeyPatch, mock_timeline_listing_response: MagicMock
+) -> MagicMock:
+    mock = MagicMock()
+    mock.return_value.__enter__.return_value = mock_timeline_listing_response
 
-    monkeypatch.setattr(bs4, "BeautifulSoup", mock_soup_cls)
+    monkeypatch.setattr(httpx, "stream", mock)
 
-    return mock_soup_cls
+    return mock
 
 
 @pytest.fixture
@@ -289,22 +315,16 @@ def fake_timeline_file_df() -> pd.DataFrame:
 
 
 @pytest.fixture
-def fake_timeline_html_tags() -> list[MagicMock]:
-    dates = [
-        "timeline_01_01_01",
-        "timeline_01_01_25",
-        "timeline_07_28_25",
-    ]
-
-    mocks = []
-
-    for date in dates:
-        mock = MagicMock(spec=bs4.Tag)
-        mock.get = MagicMock(return_value=date)
-
-        mocks.append(mock)
-
-    return mocks
+def fake_timeline_listing_html() -> str:
+    return """
+    <html><body><h1>Index of /ftp/observing/weekly_timeline</h1><pre>
+    <a href="?C=N;O=D">Name</a>
+    <a href="timeline_01_01_25">timeline_01_01_25</a>  2025-01-01 10:00  1.2M
+    <a href="timeline_07_28_25">timeline_07_28_25</a>  2025-07-29 22:51  1.1M
+    <a href="timeline_01_01_01">timeline_01_01_01</a>  2001-01-01 10:00  1.0M
+    <a href="readme.txt">readme.txt</a>  2001-01-01 10:00  1K
+    </pre></body></html>
+    """
 
 
 @pytest.fixture
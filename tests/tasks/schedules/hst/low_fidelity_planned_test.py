@@ -1,9 +1,10 @@
-import re
+from datetime import datetime
 from typing import cast
 from unittest.mock import MagicMock
 
 import pandas as pd
 import pytest
+from astropy.coordinates import SkyCoord  # type: ignore[import-untyped]
 
 import across_data_ingestion.tasks.schedules.hst.low_fidelity_planned as task
 from across_data_ingestion.tasks.schedules.hst.low_fidelity_planned import (
@@ -15,7 +16,6 @@ from across_data_ingestion.tasks.schedules.hst.low_fidelity_planned import (
     read_timeline_file,
     transform_to_across_observation,
 )
-from across_data_ingestion.tasks.schedules.types import Position
 from across_data_ingestion.util.across_server import sdk
 
 
@@ -31,12 +31,7 @@ class TestHSTLowFidelityPlannedScheduleIngestionTask:
             monkeypatch.setattr(
                 task,
                 "extract_observation_pointing_coordinates",
-                MagicMock(
-                    return_value=Position(
-                        ra="1:1:1",
-                        dec="1:1:1",
-                    )
-                ),
+                MagicMock(return_value=sdk.Coordinate(ra=15.25, dec=1.01)),
             )
 
             monkeypatch.setattr(
@@ -125,20 +120,43 @@ class TestHSTLowFidelityPlannedScheduleIngestionTask:
             assert mock_latest_filename == "timeline_07_28_25"
 
         def test_should_get_the_timeline_from_stsci(
-            self, mock_httpx_get: MagicMock
+            self, mock_httpx_stream: MagicMock
         ) -> None:
             """Should get the time timeline from STSCI"""
             get_latest_timeline_file()
 
-            mock_httpx_get.assert_called_once()
+            mock_httpx_stream.assert_called_once()
 
-        def test_should_instantiate_beautiful_soup(
-            self, mock_soup_cls: MagicMock
+        def test_should_send_validators_of_last_listing(
+            self, mock_httpx_stream: MagicMock
         ) -> None:
-            """Should instantiate beautiful soup"""
+            """Should send the ETag of the last listing on the next request"""
+            get_latest_timeline_file()
             get_latest_timeline_file()
 
-            mock_soup_cls.assert_called_once()
+            headers = mock_httpx_stream.call_args.kwargs["headers"]
+            assert headers["If-None-Match"] == '"fake-etag"'
+
+        def test_should_return_last_file_when_listing_unchanged(
+            self, mock_timeline_listing_response: MagicMock
+        ) -> None:
+            """Should return the last newest file without reading an unchanged listing"""
+            get_latest_timeline_file()
+
+            mock_timeline_listing_response.status_code = 304
+            mock_timeline_listing_response.iter_text.reset_mock()
+
+            assert get_latest_timeline_file() == "timeline_07_28_25"
+            mock_timeline_listing_response.iter_text.assert_not_called()
+
+        def test_should_raise_when_no_timeline_files_found(
+            self, mock_timeline_listing_response: MagicMock
+        ) -> None:
+            """Should raise a ValueError when the listing has no timeline files"""
+            mock_timeline_listing_response.iter_text.return_value = ["<html></html>"]
+
+            with pytest.raises(ValueError):
+                get_latest_timeline_file()
 
     class TestReadTimelineFile:
         def test_should_read_timeline_file_as_dataframe(
@@ -157,21 +175,25 @@ class TestHSTLowFidelityPlannedScheduleIngestionTask:
                 ("dec"),
             ],
         )
-        def test_should_return_position_coord_as_formatted_string(
+        def test_should_return_position_coord_in_degrees(
             self,
             test_param: str,
             fake_planned_exposure_catalog_df: pd.DataFrame,
             fake_timeline_row: dict,
         ) -> None:
-            """Should return RA as formatted string"""
+            """Should return the coordinates converted to degrees"""
             fake_timeline_row["target_name"] = "FSR2007-0584"
 
             coord = extract_observation_pointing_coordinates(
-                fake_planned_exposure_catalog_df,
+                task.PlannedExposureIndex(fake_planned_exposure_catalog_df),
                 task.TimelineRow(**fake_timeline_row),
             )
 
-            assert re.match(r"\d*:\d*:\d*", str(coord and coord.get(test_param)))
+            expected = SkyCoord("2:27:15.0", "61:37:28.0", unit=("hourangle", "deg"))
+            assert (
+                coord
+                and getattr(coord, test_param) == getattr(expected, test_param).deg
+            )
 
         def test_should_return_none_if_target_not_found(
             self,
@@ -181,16 +203,102 @@ class TestHSTLowFidelityPlannedScheduleIngestionTask:
             """Should return none if the target is not found in the planned exposure catalog"""
             fake_timeline_row["target_name"] = "mock_fake_target"
             across_observation = extract_observation_pointing_coordinates(
-                fake_planned_exposure_catalog_df, task.TimelineRow(**fake_timeline_row)
+                task.PlannedExposureIndex(fake_planned_exposure_catalog_df),
+                task.TimelineRow(**fake_timeline_row),
             )
             assert across_observation is None
 
+    class TestPlannedExposureIndex:
+        @pytest.fixture
+        def planned_exposure_index(self) -> task.PlannedExposureIndex:
+            names = ["NGC-1234-OFFSET-FIELD", "M31-POS1", "M31", "HD+12.5"]
+            return task.PlannedExposureIndex(
+                pd.DataFrame(
+                    {
+                        "object_name": names,
+                        "ra_h": [1, 2, 3, 4],
+                        "ra_m": [0, 0, 0, 0],
+                        "ra_s": [0.0, 0.0, 0.0, 0.0],
+                        "dec_d": [10, 20, 30, 40],
+                        "dec_m": [0, 0, 0, 0],
+                        "dec_s": [0.0, 0.0, 0.0, 0.0],
+                    }
+                )
+            )
+
+        @pytest.mark.parametrize(
+            "target_name, expected_dec",
+            [
+                ("M31", 30),
+                ("M31-POS", 20),
+                ("NGC-1234-OFFSET-TRUNCATED", 10),
+                ("1234-OFFSET", 10),
+                ("HD+12.5", 40),
+            ],
+        )
+        def test_should_resolve_target_name(
+            self,
+            planned_exposure_index: task.PlannedExposureIndex,
+            target_name: str,
+            expected_dec: float,
+        ) -> None:
+            """Should resolve exact, prefix and substring target name matches"""
+            position = planned_exposure_index.find(target_name)
+
+            assert position and position.dec == expected_dec
+
+        @pytest.mark.parametrize("target_name", ["", "M32", "OFFSET-FIELD\nM31"])
+        def test_should_return_none_when_target_not_found(
+            self,
+            planned_exposure_index: task.PlannedExposureIndex,
+            target_name: str,
+        ) -> None:
+            """Should return None when no catalog object matches the target"""
+            assert planned_exposure_index.find(target_name) is None
+
+    class TestPrepareObservations:
+        def test_should_parse_timestamps(
+            self, fake_timeline_file_df: pd.DataFrame
+        ) -> None:
+            """Should parse the begin and end timestamps of each observation"""
+            prepared = task.prepare_observations(fake_timeline_file_df)
+
+            assert [(p.begin_at, p.end_at) for p in prepared] == [
+                (
+                    datetime.strptime(f"{row.date} {row.begin_time}", "%Y.%j %H:%M:%S"),
+                    datetime.strptime(f"{row.date} {row.end_time}", "%Y.%j %H:%M:%S"),
+                )
+                for row in fake_timeline_file_df.itertuples()
+            ]
+
+        def test_should_convert_exposure_times_and_observation_ids(
+            self, fake_timeline_file_df: pd.DataFrame
+        ) -> None:
+            """Should convert exposure times to floats and observation IDs to strings"""
+            prepared = task.prepare_observations(fake_timeline_file_df)
+
+            assert [(p.exposure_time, p.external_observation_id) for p in prepared] == [
+                (44.11, "1791807"),
+                (41.17, "1791900"),
+                (44.11, "1791910"),
+            ]
+
     class TestTransformToAcrossObservation:
+        @pytest.fixture
+        def fake_prepared_observation(self) -> task.PreparedObservation:
+            return task.PreparedObservation(
+                begin_at=datetime(2025, 7, 28, 1, 7, 54),
+                end_at=datetime(2025, 7, 28, 2, 3, 30),
+                exposure_time=44.11,
+                external_observation_id="1791807",
+            )
+
         def test_should_return_none_when_no_coords(
             self,
             monkeypatch: pytest.MonkeyPatch,
             fake_planned_exposure_catalog_df: pd.DataFrame,
             fake_timeline_row: dict,
+            fake_prepared_observation: task.PreparedObservation,
         ) -> None:
             """Should return None when coordinates cannot be found for the observation"""
             monkeypatch.setattr(
@@ -200,9 +308,10 @@ class TestHSTLowFidelityPlannedScheduleIngestionTask:
             )
 
             across_observation = transform_to_across_observation(
-                fake_planned_exposure_catalog_df,
+                task.PlannedExposureIndex(fake_planned_exposure_catalog_df),
                 task.TimelineRow(**fake_timeline_row),
-                [],
+                task.InstrumentInfoResolver([]),
+                fake_prepared_observation,
             )
 
             assert across_observation is None
@@ -212,24 +321,62 @@ class TestHSTLowFidelityPlannedScheduleIngestionTask:
             monkeypatch: pytest.MonkeyPatch,
             fake_planned_exposure_catalog_df: pd.DataFrame,
             fake_timeline_row: dict,
+            fake_prepared_observation: task.PreparedObservation,
         ) -> None:
             """Should return none when instrument info cannot be found for observation"""
             monkeypatch.setattr(
                 task,
                 "extract_observation_pointing_coordinates",
-                MagicMock(return_value=Position(ra="1:1:1", dec="2:2:2")),
+                MagicMock(return_value=sdk.Coordinate(ra=15.25, dec=2.03)),
             )
             monkeypatch.setattr(
                 task, "extract_instrument_info", MagicMock(return_value=None)
             )
             across_observation = transform_to_across_observation(
-                fake_planned_exposure_catalog_df,
+                task.PlannedExposureIndex(fake_planned_exposure_catalog_df),
                 task.TimelineRow(**fake_timeline_row),
-                [],
+                task.InstrumentInfoResolver([]),
+                fake_prepared_observation,
             )
 
             assert across_observation is None
 
+    class TestInstrumentInfoResolver:
+        @pytest.fixture
+        def mock_extract_instrument_info(
+            self, monkeypatch: pytest.MonkeyPatch
+        ) -> MagicMock:
+            mock = MagicMock(return_value=None)
+            monkeypatch.setattr(task, "extract_instrument_info", mock)
+            return mock
+
+        def test_should_resolve_each_combination_once(
+            self, mock_extract_instrument_info: MagicMock, fake_timeline_row: dict
+        ) -> None:
+            """Should only extract the instrument info once per combination"""
+            resolver = task.InstrumentInfoResolver([])
+
+            for _ in range(3):
+                resolver.resolve(task.TimelineRow(**fake_timeline_row))
+
+            mock_extract_instrument_info.assert_called_once()
+
+        @pytest.mark.parametrize("field", ["instrument", "element", "aperture"])
+        def test_should_resolve_new_combinations(
+            self,
+            mock_extract_instrument_info: MagicMock,
+            fake_timeline_row: dict,
+            field: str,
+        ) -> None:
+            """Should extract the instrument info again for a new combination"""
+            resolver = task.InstrumentInfoResolver([])
+
+            resolver.resolve(task.TimelineRow(**fake_timeline_row))
+            fake_timeline_row[field] = "OTHER"
+            resolver.resolve(task.TimelineRow(**fake_timeline_row))
+
+            assert mock_extract_instrument_info.call_count == 2
+
     class TestExtractInstrumentInfo:
         def test_should_log_warning_when_no_instrument_short_name_match(
             self,
@@ -1,11 +1,14 @@
 from collections.abc import Generator
-from datetime import datetime
+from datetime import datetime, timedelta
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 import structlog
 
+import across_data_ingestion.tasks.schedules.jwst.low_fidelity_planned as task
 from across_data_ingestion.util.across_server import sdk
+from across_data_ingestion.util.table_cache import TableCache
 
 
 ## SET DATA FROM TOP-LEVEL FIXTURES ##
@@ -18,6 +21,18 @@ def set_telescope(
 
 
 ## MOCK BEHAVIOR ##
+@pytest.fixture(autouse=True)
+def mock_mast_proposal_cache(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> TableCache:
+    cache = TableCache(
+        "jwst_mast_proposals", ttl=timedelta(days=7), cache_dir=str(tmp_path)
+    )
+    monkeypatch.setattr(task, "mast_proposal_cache", cache)
+
+    return cache
+
+
 @pytest.fixture
 def mock_logger() -> Generator[MagicMock]:
     # must be patched because it is set at runtime when the file is imported.
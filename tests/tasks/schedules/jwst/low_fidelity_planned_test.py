@@ -1,10 +1,12 @@
 import os
+from datetime import datetime
 from unittest.mock import MagicMock
 
 import httpx
 import pandas as pd
 import pytest
 from astropy.io import ascii  # type: ignore
+from astropy.table import Table as ATable  # type: ignore
 from astroquery.mast import Observations  # type: ignore
 
 import across_data_ingestion.tasks.schedules.jwst.low_fidelity_planned as task
@@ -15,6 +17,49 @@ from .mocks.fake_mast_query_response import fake_mast_query_response
 from .mocks.fake_schedule_file_response import fake_schedule_file_response
 from .mocks.fake_science_execution_page import fake_science_execution_response_text
 
+FAKE_MAST_ASTROPY_TABLE = os.path.join(
+    os.path.dirname(__file__), "mocks", "fake_mast_astropy_table.ecsv"
+)
+
+
+FAKE_CROSSMATCH_SCHEDULE = pd.DataFrame(
+    {
+        "VISIT_ID": ["1:1:1", "1:1:2", "1:1:3", "1:1:4", "1:1:5"],
+        "TARGET_NAME": [
+            "spectroscopy-target",
+            "imaging-target",
+            "missing-target",
+            "no-bandpass",
+            "unknown-instrument",
+        ],
+    },
+    index=[10, 11, 12, 13, 14],
+)
+FAKE_CROSSMATCH_MAST_OBSERVATIONS = pd.DataFrame(
+    {
+        "instrument_name": [
+            "NIRSPEC/SLIT",
+            "NIRCAM/IMAGE",
+            "NIRCAM/IMAGE",
+            "NIRCAM/IMAGE",
+            "FGS/IMAGE",
+        ],
+        "filters": ["F100", "F200", "F300", None, "F500"],
+        "target_name": [
+            "spectroscopy-target",
+            "spectroscopy-target",
+            "imaging-target",
+            "no-bandpass",
+            "unknown-instrument",
+        ],
+        "s_ra": [10.0, 20.0, 30.0, 40.0, 50.0],
+        "s_dec": [-10.0, -20.0, -30.0, -40.0, -50.0],
+        "em_min": [600.0, 700.0, 800.0, None, 900.0],
+        "em_max": [2800.0, 2900.0, 3000.0, None, 3100.0],
+    }
+)
+FAKE_CROSSMATCH_INSTRUMENTS = {"JWST_NIRSPEC": "nirspec-id", "JWST_NIRCAM": "nircam-id"}
+
 
 class mock_response:
     def __init__(self, text: str, raise_response: bool = False):
@@ -111,7 +156,7 @@ class Test:
                 MagicMock(return_value=ascii.read(fake_mast_astropy_table)),
             )
 
-            calculated = task.read_mast_observations([])
+            calculated = task.read_mast_observations(["5924"])
             expected = pd.DataFrame(
                 {
                     "instrument_name": {"0": "NIRISS/IMAGE"},
@@ -128,6 +173,149 @@ class Test:
                 orient="records"
             )
 
+        def test_read_mast_observations_should_query_proposals_in_chunks(
+            self, monkeypatch: pytest.MonkeyPatch
+        ):
+            """Should query MAST once per chunk of proposal IDs"""
+            mock_query = MagicMock(return_value=ascii.read(FAKE_MAST_ASTROPY_TABLE))
+            monkeypatch.setattr(Observations, "query_criteria", mock_query)
+            monkeypatch.setattr(task, "MAST_PROPOSAL_CHUNK_SIZE", 2)
+
+            task.read_mast_observations(["5924", "1", "2", "3", "4"])
+
+            queried = sorted(
+                call.kwargs["proposal_id"] for call in mock_query.call_args_list
+            )
+            assert queried == [["2", "3"], ["4"], ["5924", "1"]]
+
+        def test_read_mast_observations_should_read_cached_proposals(
+            self, monkeypatch: pytest.MonkeyPatch
+        ):
+            """Should not query MAST again for proposals cached by a previous run"""
+            mock_query = MagicMock(return_value=ascii.read(FAKE_MAST_ASTROPY_TABLE))
+            monkeypatch.setattr(Observations, "query_criteria", mock_query)
+
+            first = task.read_mast_observations(["5924"])
+            second = task.read_mast_observations(["5924"])
+
+            assert mock_query.call_count == 1
+            assert first.to_dict(orient="records") == second.to_dict(orient="records")
+
+        def test_read_mast_observations_should_query_proposals_without_rows_again(
+            self, monkeypatch: pytest.MonkeyPatch
+        ):
+            """Should not cache proposals that have no MAST observations yet"""
+            mock_query = MagicMock(return_value=ascii.read(FAKE_MAST_ASTROPY_TABLE))
+            monkeypatch.setattr(Observations, "query_criteria", mock_query)
+
+            task.read_mast_observations(["5924", "1"])
+            task.read_mast_observations(["5924", "1"])
+
+            assert mock_query.call_args.kwargs["proposal_id"] == ["1"]
+
+        def test_read_mast_observations_should_only_query_new_proposals(
+            self, monkeypatch: pytest.MonkeyPatch
+        ):
+            """Should only query MAST for proposals that are not cached"""
+            mock_query = MagicMock(return_value=ascii.read(FAKE_MAST_ASTROPY_TABLE))
+            monkeypatch.setattr(Observations, "query_criteria", mock_query)
+
+            task.read_mast_observations(["5924"])
+            task.read_mast_observations(["5924", "1"])
+
+            assert mock_query.call_args.kwargs["proposal_id"] == ["1"]
+
+        def test_read_mast_observations_should_return_empty_df_without_results(
+            self, monkeypatch: pytest.MonkeyPatch
+        ):
+            """Should return an empty dataframe with the expected columns"""
+            monkeypatch.setattr(
+                Observations, "query_criteria", MagicMock(return_value=ATable())
+            )
+
+            calculated = task.read_mast_observations(["5924"])
+
+            assert calculated.empty
+            assert list(calculated.columns) == task.MAST_OBSERVATION_COLUMNS
+
+        def test_crossmatch_mast_observations_should_use_first_target_match(self):
+            """Should take the parameters from the first MAST observation of a target"""
+            crossmatched = task.crossmatch_mast_observations(
+                FAKE_CROSSMATCH_SCHEDULE.head(1),
+                FAKE_CROSSMATCH_MAST_OBSERVATIONS,
+                FAKE_CROSSMATCH_INSTRUMENTS,
+            )
+
+            row = crossmatched.iloc[0]
+            assert (row["RA"], row["INSTRUMENT"], row["INSTRUMENT_ID"]) == (
+                10.0,
+                "NIRSPEC/SLIT",
+                "nirspec-id",
+            )
+            assert row["OBSERVATION_TYPE"] == "spectroscopy"
+            assert bool(row["VALID"])
+
+        def test_crossmatch_mast_observations_should_keep_schedule_index(self):
+            """Should return the schedule rows in their original order and index"""
+            crossmatched = task.crossmatch_mast_observations(
+                FAKE_CROSSMATCH_SCHEDULE,
+                FAKE_CROSSMATCH_MAST_OBSERVATIONS,
+                FAKE_CROSSMATCH_INSTRUMENTS,
+            )
+
+            assert (
+                crossmatched.index.tolist() == FAKE_CROSSMATCH_SCHEDULE.index.tolist()
+            )
+            assert crossmatched["TARGET_NAME"].tolist() == (
+                FAKE_CROSSMATCH_SCHEDULE["TARGET_NAME"].tolist()
+            )
+
+        @pytest.mark.parametrize(
+            "target_name",
+            ["missing-target", "no-bandpass", "unknown-instrument"],
+        )
+        def test_crossmatch_mast_observations_should_invalidate_rows(
+            self, target_name: str
+        ):
+            """Should set VALID to False for targets without usable MAST parameters"""
+            crossmatched = task.crossmatch_mast_observations(
+                FAKE_CROSSMATCH_SCHEDULE,
+                FAKE_CROSSMATCH_MAST_OBSERVATIONS,
+                FAKE_CROSSMATCH_INSTRUMENTS,
+            )
+
+            row = crossmatched[crossmatched["TARGET_NAME"] == target_name]
+            assert not row["VALID"].item()
+
+        def test_crossmatch_mast_observations_should_set_imaging_type(self):
+            """Should set the observation type to imaging for non spectroscopic modes"""
+            crossmatched = task.crossmatch_mast_observations(
+                FAKE_CROSSMATCH_SCHEDULE,
+                FAKE_CROSSMATCH_MAST_OBSERVATIONS,
+                FAKE_CROSSMATCH_INSTRUMENTS,
+            )
+
+            row = crossmatched[crossmatched["TARGET_NAME"] == "imaging-target"]
+            assert row["OBSERVATION_TYPE"].item() == "imaging"
+            assert row["VALID"].item()
+
+        def test_gen_proposal_ids_should_return_visit_id_prefix(self):
+            """Should return the proposal ID part of each VISIT_ID"""
+            visit_ids = pd.Series(["7615:5:1", "01234:7:1"])
+
+            assert task.gen_proposal_ids(visit_ids).tolist() == ["7615", "01234"]
+
+        def test_with_observation_datetimes_should_return_utc_datetimes(self):
+            """Should convert the scheduled times into naive UTC datetimes"""
+            converted = task.with_observation_datetimes(fake_jwst_plan.head(1))
+
+            assert converted["SCHEDULED_START_TIME"].iloc[0] == datetime(
+                2025, 8, 4, 4, 51, 40
+            )
+            assert converted["SCHEDULED_END_TIME"].iloc[0] == datetime(
+                2025, 8, 4, 6, 49, 6
+            )
+
         def test_parse_science_execution_page_should_return_result(
             self, monkeypatch: pytest.MonkeyPatch
         ):
@@ -1,3 +1,5 @@
+from datetime import datetime, timedelta
+from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
@@ -5,10 +7,13 @@ from astropy.table import Table  # type: ignore[import-untyped]
 
 import across_data_ingestion.tasks.schedules.nustar.as_flown as task
 from across_data_ingestion.tasks.schedules.nustar.as_flown import (
+    backfill,
     ingest,
     query_nustar_catalog,
+    split_windows,
 )
 from across_data_ingestion.util.across_server import sdk
+from across_data_ingestion.util.state_store import StateStore
 
 FAKE_START_TIME = 123456  # Mock start time in MJD
 
@@ -19,7 +24,11 @@ class TestNustarAsFlownScheduleIngestionTask:
         def patch_query_catalog(
             self, monkeypatch: pytest.MonkeyPatch, fake_observation_table: Table
         ) -> MagicMock:
-            mock_query_catalog = MagicMock(return_value=fake_observation_table)
+            # the catalog query only returns SCIENCE mode observations
+            science_observations = fake_observation_table[
+                fake_observation_table["observation_mode"] == "SCIENCE"
+            ]
+            mock_query_catalog = MagicMock(return_value=science_observations)
             monkeypatch.setattr(task, "query_nustar_catalog", mock_query_catalog)
 
             return mock_query_catalog
@@ -84,3 +93,125 @@ class TestNustarAsFlownScheduleIngestionTask:
             mock_heasarc_query_tap.side_effect = ValueError()
             data = query_nustar_catalog(FAKE_START_TIME)
             assert isinstance(data, Table)
+
+        def test_should_raise_value_error_when_raising_errors(
+            self, mock_heasarc_query_tap: MagicMock
+        ):
+            """Should re-raise the ValueError when asked to raise errors"""
+            mock_heasarc_query_tap.side_effect = ValueError()
+            with pytest.raises(ValueError):
+                query_nustar_catalog(FAKE_START_TIME, raise_errors=True)
+
+        def test_should_only_query_ingested_columns(
+            self, mock_heasarc_query_tap: MagicMock
+        ):
+            """Should project the query to the columns used for ingestion"""
+            query_nustar_catalog(FAKE_START_TIME)
+            query = mock_heasarc_query_tap.call_args.args[0]
+            assert query.startswith(f"SELECT {', '.join(task.NUMASTER_COLUMNS)} ")
+
+        def test_should_filter_science_observations_in_query(
+            self, mock_heasarc_query_tap: MagicMock
+        ):
+            """Should filter SCIENCE mode observations in the query"""
+            query_nustar_catalog(FAKE_START_TIME)
+            query = mock_heasarc_query_tap.call_args.args[0]
+            assert "observation_mode = 'SCIENCE'" in query
+
+        def test_should_bound_query_by_end_time_when_provided(
+            self, mock_heasarc_query_tap: MagicMock
+        ):
+            """Should only query observations up to the end time when provided"""
+            query_nustar_catalog(FAKE_START_TIME, FAKE_START_TIME + 7)
+            query = mock_heasarc_query_tap.call_args.args[0]
+            assert f"time <= {FAKE_START_TIME + 7}" in query
+
+    class TestSplitWindows:
+        def test_should_split_range_into_consecutive_windows(self):
+            """Should split the date range into windows covering the full range"""
+            windows = split_windows(
+                datetime(2025, 1, 1), datetime(2025, 1, 20), timedelta(days=7)
+            )
+            assert windows == [
+                (datetime(2025, 1, 1), datetime(2025, 1, 8)),
+                (datetime(2025, 1, 8), datetime(2025, 1, 15)),
+                (datetime(2025, 1, 15), datetime(2025, 1, 20)),
+            ]
+
+    class TestBackfill:
+        @pytest.fixture(autouse=True)
+        def patch_state_store(
+            self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+        ) -> None:
+            monkeypatch.setattr(
+                task,
+                "StateStore",
+                lambda name: StateStore(name, state_dir=str(tmp_path)),
+            )
+
+        @pytest.fixture(autouse=True)
+        def patch_query_catalog(
+            self, monkeypatch: pytest.MonkeyPatch, fake_observation_table: Table
+        ) -> MagicMock:
+            science_observations = fake_observation_table[
+                fake_observation_table["observation_mode"] == "SCIENCE"
+            ]
+            mock_query_catalog = MagicMock(return_value=science_observations)
+            monkeypatch.setattr(task, "query_nustar_catalog", mock_query_catalog)
+
+            return mock_query_catalog
+
+        @pytest.mark.asyncio
+        async def test_should_create_schedule_per_window(
+            self, mock_schedule_api: MagicMock
+        ):
+            """Should upload one schedule per backfilled window"""
+            await backfill(datetime(2025, 1, 1), datetime(2025, 1, 15))
+            assert mock_schedule_api.create_schedule.call_count == 2
+
+        @pytest.mark.asyncio
+        async def test_should_skip_completed_windows_when_resumed(
+            self, patch_query_catalog: MagicMock
+        ):
+            """Should not query windows completed by a previous run"""
+            await backfill(datetime(2025, 1, 1), datetime(2025, 1, 15))
+            patch_query_catalog.reset_mock()
+
+            await backfill(datetime(2025, 1, 1), datetime(2025, 1, 22))
+            patch_query_catalog.assert_called_once()
+
+        @pytest.mark.asyncio
+        async def test_should_retry_failed_windows_when_resumed(
+            self, patch_query_catalog: MagicMock, mock_logger: MagicMock
+        ):
+            """Should not checkpoint windows that failed"""
+            patch_query_catalog.side_effect = Exception("boom")
+            await backfill(datetime(2025, 1, 1), datetime(2025, 1, 8))
+            assert "Backfill failed" in mock_logger.error.call_args.args[0]
+
+            patch_query_catalog.side_effect = None
+            patch_query_catalog.reset_mock()
+            await backfill(datetime(2025, 1, 1), datetime(2025, 1, 8))
+            patch_query_catalog.assert_called_once()
+
+        @pytest.mark.asyncio
+        async def test_should_retry_windows_whose_query_failed_when_resumed(
+            self,
+            monkeypatch: pytest.MonkeyPatch,
+            mock_heasarc_query_tap: MagicMock,
+            fake_observation_table: Table,
+        ):
+            """Should not checkpoint windows whose catalog query failed as empty"""
+            monkeypatch.setattr(task, "query_nustar_catalog", query_nustar_catalog)
+            mock_heasarc_query_tap.return_value.to_table.return_value = (
+                fake_observation_table[
+                    fake_observation_table["observation_mode"] == "SCIENCE"
+                ]
+            )
+            mock_heasarc_query_tap.side_effect = ValueError()
+            await backfill(datetime(2025, 1, 1), datetime(2025, 1, 8))
+
+            mock_heasarc_query_tap.side_effect = None
+            mock_heasarc_query_tap.reset_mock()
+            await backfill(datetime(2025, 1, 1), datetime(2025, 1, 8))
+            mock_heasarc_query_tap.assert_called_once()
@@ -88,17 +88,15 @@ def fake_swift_obs_entries(
 
 @pytest.fixture
 def mock_uvot_mode_cls(fake_uvot_mode_entries: dict) -> MagicMock:
-    mock_instance = MagicMock()
-    mock_instance.entries = []
-
     def mock_init(mode: str) -> MagicMock:
-        # set the entries and return the instance, when
-        # there is a mode that dne return an empty list.
+        # set the entries and return a new instance, since modes are looked up
+        # concurrently, when there is a mode that dne return an empty list.
         try:
             entries = fake_uvot_mode_entries[mode]
         except KeyError:
             entries = []
 
+        mock_instance = MagicMock()
         mock_instance.entries = [
             FakeUVOTModeEntry.model_validate(entry) for entry in entries
         ]
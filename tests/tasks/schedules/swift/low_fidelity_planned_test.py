@@ -52,6 +52,50 @@ class TestBuildUVOTModeDict:
         assert len(dict) == 0
 
 
+class TestCustomSwiftObsEntry:
+    def test_should_build_pointing_position_from_entry(
+        self, fake_swift_obs_entries: list[task.CustomSwiftObsEntry]
+    ):
+        entry = fake_swift_obs_entries[0]
+
+        assert entry.pointing_position == sdk.Coordinate(
+            ra=float(entry.ra), dec=float(entry.dec)
+        )
+
+    def test_should_build_date_range_from_entry(
+        self, fake_swift_obs_entries: list[task.CustomSwiftObsEntry]
+    ):
+        entry = fake_swift_obs_entries[0]
+
+        assert entry.date_range == sdk.DateRange.model_validate(
+            {"begin": entry.begin, "end": entry.end}
+        )
+
+
+class TestCreateObservations:
+    def test_should_share_pointing_data_between_instruments(
+        self, fake_swift_obs_entries: list[task.CustomSwiftObsEntry]
+    ):
+        xrt_observations = task.create_observations(
+            "xrt-id",
+            fake_swift_obs_entries,
+            sdk.Bandpass(task.SWIFT_XRT_BANDPASS),
+            sdk.ObservationType.SPECTROSCOPY,
+        )
+        bat_observations = task.create_observations(
+            "bat-id",
+            fake_swift_obs_entries,
+            sdk.Bandpass(task.SWIFT_BAT_BANDPASS),
+            sdk.ObservationType.IMAGING,
+        )
+
+        assert xrt_observations[0].date_range is bat_observations[0].date_range
+        assert (
+            xrt_observations[0].pointing_position
+            is bat_observations[0].pointing_position
+        )
+
+
 class TestCreateUVOTObservations:
     def test_should_return_list_of_across_uvot_observations(
         self, fake_swift_obs_entries: list[task.CustomSwiftObsEntry]
@@ -169,46 +213,82 @@ class TestIngest:
 
         mock_logger.warning.assert_called_once()
 
-    @pytest.mark.parametrize(
-        "telescope_name, call_idx",
-        [("swift_xrt", 0), ("swift_bat", 1), ("swift_uvot", 2)],
-    )
+    @staticmethod
+    def created_schedule(mock_schedule_api: MagicMock, type: str) -> sdk.ScheduleCreate:
+        """Finds the schedule created for the telescope, the uploads run concurrently"""
+        (schedule,) = [
+            call.args[0]
+            for call in mock_schedule_api.create_schedule.call_args_list
+            if call.args[0].name.startswith(f"swift_{type}_")
+        ]
+        return schedule
+
+    @pytest.mark.parametrize("telescope_name", ["swift_xrt", "swift_bat", "swift_uvot"])
     def test_should_transform_swift_plan_to_across_schedule(
         self,
         telescope_name: str,
-        call_idx: int,
         mock_create_swift_across_schedule: MagicMock,
     ):
         task.ingest()
-        call = mock_create_swift_across_schedule.call_args_list[call_idx]
+        telescope_names = [
+            call.kwargs["telescope_name"]
+            for call in mock_create_swift_across_schedule.call_args_list
+        ]
 
-        assert call.kwargs["telescope_name"] == telescope_name
+        assert telescope_names.count(telescope_name) == 1
 
     @pytest.mark.parametrize(
-        "obs_type, call_idx",
+        "telescope_name, obs_type",
         [
-            (sdk.ObservationType.SPECTROSCOPY, 0),
-            (sdk.ObservationType.IMAGING, 1),
-            (sdk.ObservationType.IMAGING, 2),
+            ("swift_xrt", sdk.ObservationType.SPECTROSCOPY),
+            ("swift_bat", sdk.ObservationType.IMAGING),
+            ("swift_uvot", sdk.ObservationType.IMAGING),
         ],
     )
     def test_should_use_expected_observation_type_for_each_telescope(
         self,
+        telescope_name: str,
         obs_type: sdk.ObservationType,
-        call_idx: int,
         mock_create_swift_across_schedule: MagicMock,
     ):
         task.ingest()
-        call = mock_create_swift_across_schedule.call_args_list[call_idx]
+        observation_types = {
+            call.kwargs["telescope_name"]: call.kwargs["observation_type"]
+            for call in mock_create_swift_across_schedule.call_args_list
+        }
+
+        assert observation_types[telescope_name] == obs_type
+
+    def test_should_post_all_schedules(self, mock_schedule_api: MagicMock):
+        task.ingest()
+
+        assert mock_schedule_api.create_schedule.call_count == 3
+
+    def test_should_post_other_schedules_when_one_fails(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        mock_schedule_api: MagicMock,
+    ):
+        create_schedule = task.create_swift_across_schedule
+
+        def fail_for_bat(**kwargs):
+            if kwargs["telescope_name"] == "swift_bat":
+                raise ValueError("failed to create schedule")
+            return create_schedule(**kwargs)
+
+        monkeypatch.setattr(task, "create_swift_across_schedule", fail_for_bat)
+
+        with pytest.raises(ValueError):
+            task.ingest()
 
-        assert call.kwargs["observation_type"] == obs_type
+        assert mock_schedule_api.create_schedule.call_count == 2
 
     @pytest.mark.parametrize(
-        "type, expected_schedule, call_idx",
+        "type, expected_schedule",
         [
-            ("xrt", expected_schedules.expected_xrt, 0),
-            ("bat", expected_schedules.expected_bat, 1),
-            ("uvot", expected_schedules.expected_uvot, 2),
+            ("xrt", expected_schedules.expected_xrt),
+            ("bat", expected_schedules.expected_bat),
+            ("uvot", expected_schedules.expected_uvot),
         ],
     )
     @pytest.mark.parametrize(
@@ -224,21 +304,19 @@ class TestIngest:
         type: str,
         expected_schedule: sdk.ScheduleCreate,
         field: str,
-        call_idx: int,
         mock_schedule_api: MagicMock,
     ):
         task.ingest()
-        call = mock_schedule_api.create_schedule.call_args_list[call_idx]
-        created_sched = call.args[0]
+        created_sched = self.created_schedule(mock_schedule_api, type)
 
         assert getattr(created_sched, field) == getattr(expected_schedule, field)
 
     @pytest.mark.parametrize(
-        "type, expected_obs, call_idx",
+        "type, expected_obs",
         [
-            ("xrt", expected_schedules.expected_xrt.observations[0], 0),
-            ("bat", expected_schedules.expected_bat.observations[0], 1),
-            ("uvot", expected_schedules.expected_uvot.observations[0], 2),
+            ("xrt", expected_schedules.expected_xrt.observations[0]),
+            ("bat", expected_schedules.expected_bat.observations[0]),
+            ("uvot", expected_schedules.expected_uvot.observations[0]),
         ],
     )
     @pytest.mark.parametrize("field", sdk.ObservationCreate.model_fields)
@@ -247,11 +325,9 @@ class TestIngest:
         type: str,
         expected_obs: sdk.ObservationCreate,
         field: str,
-        call_idx: int,
         mock_schedule_api: MagicMock,
     ):
         task.ingest()
-        call = mock_schedule_api.create_schedule.call_args_list[call_idx]
-        created_obs = call.args[0].observations[0]
+        created_obs = self.created_schedule(mock_schedule_api, type).observations[0]
 
         assert getattr(created_obs, field) == getattr(expected_obs, field)
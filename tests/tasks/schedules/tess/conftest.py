@@ -1,11 +1,14 @@
 from collections.abc import Generator
 from datetime import datetime
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 import structlog
 
+import across_data_ingestion.tasks.schedules.tess.low_fidelity_planned as task
 from across_data_ingestion.util.across_server import sdk
+from across_data_ingestion.util.state_store import StateStore
 
 from . import mocks
 
@@ -23,6 +26,13 @@ def set_telescope(
 
 
 ## MOCK BEHAVIOR ##
+@pytest.fixture(autouse=True)
+def mock_state_store(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(
+        task, "StateStore", lambda name: StateStore(name, state_dir=str(tmp_path))
+    )
+
+
 @pytest.fixture
 def mock_logger() -> Generator[MagicMock]:
     # must be patched because it is set at runtime when the file is imported.
@@ -1,6 +1,8 @@
 import os
+from datetime import datetime
 from unittest.mock import MagicMock
 
+import pandas as pd
 import pytest
 
 import across_data_ingestion.tasks.schedules.tess.low_fidelity_planned as task
@@ -122,6 +124,93 @@ class Test:
                 fake_create_many_schedules[mock_data_dir].schedules
             )
 
+    @pytest.mark.parametrize(("mock_data_dir"), ["orbit_observations"])
+    class TestIngestChangedSectors:
+        def test_should_not_post_unchanged_sectors(self, mock_schedule_api: MagicMock):
+            """Should not post the sectors again when they have not changed"""
+            task.ingest()
+            schedules = task.ingest()
+
+            assert schedules == []
+            mock_schedule_api.create_many_schedules.assert_called_once()
+
+        def test_should_only_post_changed_sectors(
+            self, monkeypatch: pytest.MonkeyPatch, mock_schedule_api: MagicMock
+        ):
+            """Should only post the sectors whose pointing changed"""
+            task.ingest()
+
+            read_csv = pd.read_csv
+
+            def read_changed_pointings(file, **kwargs):
+                df = read_csv(file, **kwargs)
+                if file == task.TESS_POINTINGS_FILE:
+                    df.loc[df["Sector"] == 86, "Roll"] += 1.0
+                return df
+
+            monkeypatch.setattr(pd, "read_csv", read_changed_pointings)
+            task.ingest()
+
+            create_many = mock_schedule_api.create_many_schedules.call_args[0][0]
+            assert [s.name for s in create_many.schedules] == ["TESS_sector_86"]
+
+        def test_should_post_sectors_again_after_failure(
+            self, mock_schedule_api: MagicMock
+        ):
+            """Should post the sectors again when the previous post failed"""
+            mock_schedule_api.create_many_schedules.side_effect = [
+                sdk.ApiException(status=500),
+                None,
+            ]
+
+            with pytest.raises(sdk.ApiException):
+                task.ingest()
+            schedules = task.ingest()
+
+            assert len(schedules) == 2
+
+        def test_should_post_new_sectors_when_batch_conflicts(
+            self, mock_schedule_api: MagicMock
+        ):
+            """Should post each sector on its own when one sector already exists"""
+            mock_schedule_api.create_many_schedules.side_effect = sdk.ApiException(
+                status=409
+            )
+            mock_schedule_api.create_schedule.side_effect = [
+                sdk.ApiException(status=409),
+                None,
+            ]
+
+            schedules = task.ingest()
+
+            posted = [
+                call.args[0]
+                for call in mock_schedule_api.create_schedule.call_args_list
+            ]
+            assert posted == schedules
+            assert task.ingest() == []
+
+        def test_should_post_sector_again_when_its_post_failed(
+            self, mock_schedule_api: MagicMock
+        ):
+            """Should only remember the sectors confirmed by the server"""
+            mock_schedule_api.create_many_schedules.side_effect = sdk.ApiException(
+                status=409
+            )
+            mock_schedule_api.create_schedule.side_effect = [
+                None,
+                sdk.ApiException(status=500),
+            ]
+
+            with pytest.raises(sdk.ApiException):
+                task.ingest()
+
+            mock_schedule_api.create_many_schedules.side_effect = None
+            task.ingest()
+
+            create_many = mock_schedule_api.create_many_schedules.call_args[0][0]
+            assert len(create_many.schedules) == 1
+
     @pytest.mark.parametrize("mock_data_dir", ["placeholder_observations"])
     class TestIngestPlaceholder:
         def test_should_use_schedule_date_range_when_creating_observation(
@@ -140,6 +229,98 @@ class Test:
             assert placeholder_obs.date_range == placeholder_schedule.date_range
 
 
+class TestFingerprintSectors:
+    @pytest.fixture
+    def fake_pointings(self) -> pd.DataFrame:
+        return pd.DataFrame({"sector": [85, 86], "roll": [45.8, 32.6]})
+
+    @pytest.fixture
+    def fake_orbits(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "sector": [85, 85],
+                "orbit": [177, 178],
+                "start_of_orbit": ["2024-10-27 01:20:00", "2024-11-08 22:45:00"],
+                "end_of_orbit": ["2024-11-02 11:45:00", "2024-11-15 06:15:00"],
+            }
+        )
+
+    def test_should_change_fingerprint_when_orbits_change(
+        self, fake_pointings: pd.DataFrame, fake_orbits: pd.DataFrame
+    ):
+        """Should only change the fingerprint of the sector whose orbits changed"""
+        before = task.fingerprint_sectors(
+            fake_pointings, task.group_orbits_by_sector(fake_orbits)
+        )
+
+        fake_orbits.loc[1, "orbit"] = 179
+        after = task.fingerprint_sectors(
+            fake_pointings, task.group_orbits_by_sector(fake_orbits)
+        )
+
+        assert before["85"] != after["85"]
+        assert before["86"] == after["86"]
+
+    def test_should_group_orbits_once_per_ingest(
+        self, monkeypatch: pytest.MonkeyPatch, mock_schedule_api: MagicMock
+    ):
+        """Should group the orbits once and share them with the fingerprints"""
+        override_csv_paths(monkeypatch, "orbit_observations")
+        group_orbits_by_sector = MagicMock(wraps=task.group_orbits_by_sector)
+        monkeypatch.setattr(task, "group_orbits_by_sector", group_orbits_by_sector)
+
+        task.ingest()
+
+        group_orbits_by_sector.assert_called_once()
+
+
+class TestPrepareSectorPointings:
+    def test_should_convert_jd_to_datetimes(self):
+        """Should convert the sector JD start and end to datetimes"""
+        pointings = pd.DataFrame({"start": [2460609.5], "end": [2460635.75]})
+
+        prepared = task.prepare_sector_pointings(pointings)
+
+        assert prepared["begin"].tolist() == [datetime(2024, 10, 26)]
+        assert prepared["end"].tolist() == [datetime(2024, 11, 21, 6)]
+
+
+class TestGroupOrbitsBySector:
+    @pytest.fixture
+    def fake_orbits(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "sector": [85, 86, 85],
+                "orbit": [177, 179, 178],
+                "start_of_orbit": [
+                    "2024-10-27 01:20:00",
+                    "2024-11-22 00:00:00",
+                    "2024-11-08 22:45:00",
+                ],
+                "end_of_orbit": [
+                    "2024-11-02 11:45:00",
+                    "2024-11-29 00:00:00",
+                    "2024-11-15 06:15:00",
+                ],
+            }
+        )
+
+    def test_should_group_orbits_by_sector(self, fake_orbits: pd.DataFrame):
+        """Should group the orbits of each sector in their original order"""
+        orbits_by_sector = task.group_orbits_by_sector(fake_orbits)
+
+        assert orbits_by_sector[85]["orbit"].tolist() == [177, 178]
+        assert orbits_by_sector[86]["orbit"].tolist() == [179]
+
+    def test_should_add_orbit_date_range(self, fake_orbits: pd.DataFrame):
+        """Should add the orbit begin, end and exposure time columns"""
+        orbit = task.group_orbits_by_sector(fake_orbits)[86].iloc[0]
+
+        assert orbit["begin"] == datetime(2024, 11, 22)
+        assert orbit["end"] == datetime(2024, 11, 29)
+        assert orbit["exposure_time"] == 7 * 24 * 3600
+
+
 @pytest.mark.parametrize(
     "schedule_idx",
     schedule_indices(mocks.placeholder_observations.ACROSS_schedule_output.expected),
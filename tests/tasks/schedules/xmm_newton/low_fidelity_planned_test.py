@@ -1,3 +1,4 @@
+from datetime import datetime
 from unittest.mock import MagicMock
 
 import pandas as pd
@@ -6,6 +7,8 @@ import pytest
 from across_data_ingestion.tasks.schedules.xmm_newton.low_fidelity_planned import (
     extract_om_exposures_from_timeline_data,
     ingest,
+    parse_durations,
+    prepare_schedule_data,
     read_planned_schedule_table,
     read_revolution_timeline_file,
 )
@@ -153,3 +156,107 @@ class TestXMMNewtonLowFidelityPlannedScheduleIngestionTask:
             )
             assert type(exposures) is dict
             assert len(exposures) > 0
+
+        def test_extract_om_exposures_should_return_exposures_per_observation(
+            self,
+        ) -> None:
+            """Should pair each observation's OM filters with its unique exposure times"""
+            timeline_df = pd.DataFrame(
+                {
+                    "Date & Time": [
+                        f"2025-01-01 | 00:00:{second:02d}" for second in range(8)
+                    ],
+                    "Event": [
+                        "OBS_START",
+                        "ID: 0001",
+                        None,
+                        None,
+                        None,
+                        None,
+                        None,
+                        "OBS_END",
+                    ],
+                    "OM": [
+                        "RA: 05:34:32.00",
+                        "Crab",
+                        "B",
+                        "Image 001: 100 sec",
+                        "Image 001: 100 sec",
+                        "UVW1",
+                        "Image 002: 200 sec",
+                        None,
+                    ],
+                }
+            )
+
+            assert extract_om_exposures_from_timeline_data(timeline_df) == {
+                "0001": [
+                    {
+                        "filter": "B",
+                        "start_time": "2025-01-01 00:00:02",
+                        "exposure_time": 100,
+                    },
+                    {
+                        "filter": "UVW1",
+                        "start_time": "2025-01-01 00:00:05",
+                        "exposure_time": 200,
+                    },
+                ]
+            }
+
+        def test_extract_om_exposures_should_ignore_rows_outside_observations(
+            self,
+        ) -> None:
+            """Should ignore the OM logs that are not between OBS_START and OBS_END"""
+            timeline_df = pd.DataFrame(
+                {
+                    "Date & Time": ["2025-01-01 | 00:00:00"] * 4,
+                    "Event": ["ID: 0001", None, "OBS_START", "ID: 0002"],
+                    "OM": ["Crab", "V", "RA: 05:34:32.00", "U"],
+                }
+            )
+
+            assert extract_om_exposures_from_timeline_data(timeline_df) == {}
+
+    class TestPrepareScheduleData:
+        def test_parse_durations_should_ignore_closed_filter_parentheses(
+            self,
+        ) -> None:
+            """Should parse closed filter "( ... )" durations as seconds"""
+            durations = parse_durations(pd.Series(["( 5.5)", "10.6", 1.5]))
+
+            assert durations.tolist() == [5500.0, 10600.0, 1500.0]
+
+        def test_parse_durations_should_return_longest_duration(self) -> None:
+            """Should return the longest duration of each row"""
+            durations = parse_durations(
+                pd.Series(["( 12.5)", "3.0"]), pd.Series(["3.0", "4.0"])
+            )
+
+            assert durations.tolist() == [12500.0, 4000.0]
+
+        def test_should_add_instrument_date_ranges(
+            self, mock_planned_schedule_table: pd.DataFrame
+        ) -> None:
+            """Should add the start and end datetimes of each instrument"""
+            prepared = prepare_schedule_data(mock_planned_schedule_table)
+            row = prepared.iloc[0]
+
+            assert row["start"] == datetime(2025, 9, 4, 13, 36, 52)
+            assert (row["mos_exposure"], row["mos_end"]) == (
+                10600.0,
+                datetime(2025, 9, 4, 16, 33, 32),
+            )
+            assert row["rgs_end"] == datetime(2025, 9, 4, 16, 40, 12)
+            assert row["pn_end"] == datetime(2025, 9, 4, 16, 0, 12)
+
+        def test_should_not_modify_schedule_data(
+            self, mock_planned_schedule_table: pd.DataFrame
+        ) -> None:
+            """Should return a copy of the schedule data with the new columns"""
+            columns = mock_planned_schedule_table.columns.tolist()
+
+            prepared = prepare_schedule_data(mock_planned_schedule_table)
+
+            assert mock_planned_schedule_table.columns.tolist() == columns
+            assert "pointing_position" in prepared.columns
@@ -0,0 +1,43 @@
+import astropy.units as u  # type: ignore[import-untyped]
+import numpy as np
+import pytest
+from astropy.coordinates import SkyCoord  # type: ignore[import-untyped]
+
+from across_data_ingestion.util.coordinates import (
+    dms_to_degrees,
+    hms_to_degrees,
+    sexagesimal_to_degrees,
+)
+
+RA_VALUES = ["05:34:32", "00:00:00.5", "23:59:59.99", "12 30 15.25", "5:34:32.123"]
+DEC_VALUES = ["+22:00:52", "-00:30:00", "-89:59:59.9", "+12 34 56", "0:0:1"]
+
+
+class TestSexagesimalToDegrees:
+    def test_should_match_astropy_ra(self):
+        """Should convert right ascensions to the same degrees as astropy"""
+        expected = SkyCoord(RA_VALUES, DEC_VALUES, unit=(u.hourangle, u.deg))
+        np.testing.assert_array_equal(hms_to_degrees(RA_VALUES), expected.ra.deg)
+
+    def test_should_match_astropy_dec(self):
+        """Should convert declinations to the same degrees as astropy"""
+        expected = SkyCoord(RA_VALUES, DEC_VALUES, unit=(u.hourangle, u.deg))
+        np.testing.assert_array_equal(dms_to_degrees(DEC_VALUES), expected.dec.deg)
+
+    def test_should_keep_sign_of_negative_zero_degrees(self):
+        """Should return a negative angle when the degrees are -00"""
+        assert dms_to_degrees(["-00:30:00"])[0] == -0.5
+
+    def test_should_allow_missing_seconds(self):
+        """Should convert angles without a seconds field"""
+        assert sexagesimal_to_degrees(["10:30"])[0] == 10.5
+
+    def test_should_raise_for_invalid_values(self):
+        """Should raise a ValueError when a value is not a sexagesimal angle"""
+        with pytest.raises(ValueError):
+            dms_to_degrees(["10:30:00", "not an angle"])
+
+    def test_should_coerce_invalid_values_to_nan(self):
+        """Should return NaN for invalid values when coercing"""
+        degrees = dms_to_degrees(["10:30:00", "not an angle"], errors="coerce")
+        assert degrees[0] == 10.5 and np.isnan(degrees[1])
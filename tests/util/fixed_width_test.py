@@ -0,0 +1,94 @@
+import re
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from across_data_ingestion.util.fixed_width import FixedWidthColumn, read_fixed_width
+
+FAKE_TEXT = """HEADER      LINE
+NAME  VALUE  COUNT
+----  -----  -----
+abc    1.5     10
+de            20
+
+fgh   22.25     3
+"""
+
+FAKE_COLUMNS = [
+    FixedWidthColumn("name", 0, 4),
+    FixedWidthColumn("value", 6, 11, type=float),
+    FixedWidthColumn("count", 13, 18, type=int),
+]
+
+
+class TestReadFixedWidth:
+    def test_should_parse_typed_columns(self):
+        """Should slice each column by offset and cast it to its type"""
+        df = read_fixed_width(FAKE_TEXT, FAKE_COLUMNS, skip_rows=3)
+
+        assert df["name"].tolist() == ["abc", "de", "fgh"]
+        np.testing.assert_array_equal(df["value"], [1.5, np.nan, 22.25])
+        assert df["count"].tolist() == [10, 20, 3]
+
+    def test_should_set_empty_strings_to_nan(self):
+        """Should parse empty string fields as NaN by default"""
+        df = read_fixed_width(
+            "a  b\n   c\n", [FixedWidthColumn("x", 0, 1), FixedWidthColumn("y", 3, 4)]
+        )
+
+        assert df["x"].isna().tolist() == [False, True]
+
+    def test_should_keep_empty_strings(self):
+        """Should keep empty string fields when empty_as_na is False"""
+        df = read_fixed_width(
+            "a  b\n   c\n",
+            [FixedWidthColumn("x", 0, 1), FixedWidthColumn("y", 3, 4)],
+            empty_as_na=False,
+        )
+
+        assert df["x"].tolist() == ["a", ""]
+
+    def test_should_only_keep_rows_matching_pattern(self):
+        """Should drop the lines that do not match the row pattern"""
+        df = read_fixed_width(FAKE_TEXT, FAKE_COLUMNS, row_pattern=re.compile(r"[a-z]"))
+
+        assert df["name"].tolist() == ["abc", "de", "fgh"]
+
+    def test_should_use_character_offsets(self):
+        """Should slice non-ASCII text by characters instead of bytes"""
+        df = read_fixed_width(
+            "Señor 1\n".encode(),
+            [FixedWidthColumn("x", 0, 5), FixedWidthColumn("y", 6, 7, type=int)],
+        )
+
+        assert df.to_dict(orient="records") == [{"x": "Señor", "y": 1}]
+
+    def test_should_raise_for_invalid_numbers(self):
+        """Should raise a ValueError when a numeric field cannot be parsed"""
+        with pytest.raises(ValueError):
+            read_fixed_width("abc", [FixedWidthColumn("x", 0, 3, type=float)])
+
+    def test_should_return_empty_dataframe_without_rows(self):
+        """Should return an empty DataFrame with the column names"""
+        df = read_fixed_width("", FAKE_COLUMNS)
+
+        assert df.empty
+        assert list(df.columns) == ["name", "value", "count"]
+
+    def test_should_match_read_fwf(self):
+        """Should parse the same DataFrame as pandas read_fwf"""
+        columns = [FixedWidthColumn("name", 0, 4), FixedWidthColumn("count", 13, 18)]
+
+        expected = pd.read_fwf(
+            StringIO(FAKE_TEXT),
+            colspecs=[(0, 4), (13, 18)],
+            names=["name", "count"],
+            skiprows=3,
+            dtype=str,
+        )
+
+        pd.testing.assert_frame_equal(
+            read_fixed_width(FAKE_TEXT, columns, skip_rows=3), expected
+        )
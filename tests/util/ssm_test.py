@@ -0,0 +1,169 @@
+from collections.abc import Generator
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+import across_data_ingestion.util.ssm as module
+from across_data_ingestion.core.enums.environments import Environments
+from across_data_ingestion.util.ssm import SSM
+
+ENV_PATH = "/test-env"
+PARAMETER_NAMES = ["user", "pwd"]
+
+
+def fake_param(name: str, value: str) -> dict:
+    return {"Name": f"{ENV_PATH}/{name}", "Value": value, "Type": "SecureString"}
+
+
+@pytest.fixture(autouse=True)
+def stubber(monkeypatch: pytest.MonkeyPatch) -> Generator[Stubber]:
+    client = boto3.client(
+        "ssm",
+        region_name="us-east-2",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+    monkeypatch.setattr(module.config, "RUNTIME_ENV", Environments.DEV)
+    monkeypatch.setattr(SSM, "_client", client)
+    monkeypatch.setattr(
+        type(module.config), "ssm_parameter_names", lambda self: PARAMETER_NAMES
+    )
+    SSM.clear_cache()
+
+    with Stubber(client) as stubber:
+        yield stubber
+
+    SSM.clear_cache()
+
+
+def add_prefetch_response(
+    stubber: Stubber, params: list[dict], names: list[str] = PARAMETER_NAMES
+) -> None:
+    stubber.add_response(
+        "get_parameters",
+        {"Parameters": params},
+        {"Names": [f"{ENV_PATH}/{name}" for name in names], "WithDecryption": True},
+    )
+
+
+class TestGetParameter:
+    def test_should_prefetch_parameters_under_path(self, stubber: Stubber):
+        """Should return the service parameters under the path from a single call"""
+        add_prefetch_response(
+            stubber, [fake_param("user", "fake-user"), fake_param("pwd", "fake-pwd")]
+        )
+
+        user = SSM.get_parameter("user", ENV_PATH)
+        pwd = SSM.get_parameter("pwd", ENV_PATH)
+
+        assert (user["Value"], pwd["Value"]) == ("fake-user", "fake-pwd")
+        stubber.assert_no_pending_responses()
+
+    def test_should_fall_back_to_single_lookup_when_not_prefetched(
+        self, stubber: Stubber
+    ):
+        """Should fetch a parameter missing from the prefetch individually"""
+        add_prefetch_response(stubber, [])
+        stubber.add_response(
+            "get_parameter",
+            {"Parameter": fake_param("user", "fake-user")},
+            {"Name": f"{ENV_PATH}/user", "WithDecryption": True},
+        )
+
+        assert SSM.get_parameter("user", ENV_PATH)["Value"] == "fake-user"
+
+    def test_should_fall_back_to_single_lookup_when_prefetch_fails(
+        self, stubber: Stubber
+    ):
+        """Should fetch parameters individually when the batch call fails"""
+        stubber.add_client_error("get_parameters", "AccessDeniedException")
+        stubber.add_response(
+            "get_parameter",
+            {"Parameter": fake_param("user", "fake-user")},
+            {"Name": f"{ENV_PATH}/user", "WithDecryption": True},
+        )
+
+        assert SSM.get_parameter("user", ENV_PATH)["Value"] == "fake-user"
+
+    def test_should_not_retry_failed_prefetch_until_ttl(self, stubber: Stubber):
+        """Should only attempt the batch call once when it fails"""
+        # the stubber raises on any get_parameters call after the first
+        stubber.add_client_error("get_parameters", "AccessDeniedException")
+        for name in PARAMETER_NAMES:
+            stubber.add_response(
+                "get_parameter",
+                {"Parameter": fake_param(name, f"fake-{name}")},
+                {"Name": f"{ENV_PATH}/{name}", "WithDecryption": True},
+            )
+
+        SSM.get_parameter("user", ENV_PATH)
+        SSM.get_parameter("pwd", ENV_PATH)
+
+        stubber.assert_no_pending_responses()
+
+    def test_should_raise_when_parameter_not_found(self, stubber: Stubber):
+        """Should raise a ValueError when the parameter does not exist"""
+        add_prefetch_response(stubber, [])
+        stubber.add_client_error("get_parameter", "ParameterNotFound")
+
+        with pytest.raises(ValueError):
+            SSM.get_parameter("user", ENV_PATH)
+
+    def test_should_skip_cache_when_forced(self, stubber: Stubber):
+        """Should fetch the parameter from AWS when forced"""
+        add_prefetch_response(stubber, [fake_param("user", "cached-user")])
+        stubber.add_response(
+            "get_parameter",
+            {"Parameter": fake_param("user", "forced-user")},
+            {"Name": f"{ENV_PATH}/user", "WithDecryption": True},
+        )
+
+        SSM.get_parameter("user", ENV_PATH)
+
+        assert SSM.get_parameter("user", ENV_PATH, force=True)["Value"] == (
+            "forced-user"
+        )
+
+    def test_should_prefetch_again_after_ttl(
+        self, stubber: Stubber, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Should fetch the parameters again once the cache expires"""
+        now = [0.0]
+        monkeypatch.setattr(module.time, "monotonic", lambda: now[0])
+        add_prefetch_response(stubber, [fake_param("user", "old-user")])
+        add_prefetch_response(stubber, [fake_param("user", "new-user")])
+
+        SSM.get_parameter("user", ENV_PATH)
+        now[0] += module.config.SSM_CACHE_TTL_SECONDS
+
+        assert SSM.get_parameter("user", ENV_PATH)["Value"] == "new-user"
+
+
+class TestPrefetchParameters:
+    def test_should_split_names_into_batches(self, stubber: Stubber):
+        """Should request at most the GetParameters limit of names per call"""
+        names = [f"param-{idx}" for idx in range(module.GET_PARAMETERS_MAX_NAMES + 2)]
+        add_prefetch_response(stubber, [], names[: module.GET_PARAMETERS_MAX_NAMES])
+        add_prefetch_response(stubber, [], names[module.GET_PARAMETERS_MAX_NAMES :])
+
+        SSM.prefetch_parameters(names, ENV_PATH)
+
+        stubber.assert_no_pending_responses()
+
+
+class TestPutParameter:
+    def test_should_invalidate_cached_parameter(self, stubber: Stubber):
+        """Should fetch the parameter again after it is updated"""
+        add_prefetch_response(stubber, [fake_param("user", "old-user")])
+        stubber.add_response("put_parameter", {"Version": 2})
+        stubber.add_response(
+            "get_parameter",
+            {"Parameter": fake_param("user", "new-user")},
+            {"Name": f"{ENV_PATH}/user", "WithDecryption": True},
+        )
+
+        SSM.get_parameter("user", ENV_PATH)
+        SSM.put_parameter(value="new-user", name="user", path=ENV_PATH)
+
+        assert SSM.get_parameter("user", ENV_PATH)["Value"] == "new-user"
@@ -0,0 +1,28 @@
+from across_data_ingestion.util.state_store import StateStore
+
+
+class TestStateStore:
+    def test_should_return_default_for_missing_key(self, tmp_path):
+        """Should return the default when the key was never set"""
+        store = StateStore("test", state_dir=str(tmp_path))
+        assert store.get("missing", "default") == "default"
+
+    def test_should_return_set_value(self, tmp_path):
+        """Should return the value that was set for the key"""
+        store = StateStore("test", state_dir=str(tmp_path))
+        store.set("key", {"value": 1})
+        assert store.get("key") == {"value": 1}
+
+    def test_should_persist_values_across_instances(self, tmp_path):
+        """Should load previously set values from disk"""
+        StateStore("test", state_dir=str(tmp_path)).set("key", True)
+
+        store = StateStore("test", state_dir=str(tmp_path))
+        assert store.get("key") is True
+
+    def test_should_persist_updated_values(self, tmp_path):
+        """Should set and persist every key of an update"""
+        StateStore("test", state_dir=str(tmp_path)).update({"a": 1, "b": 2})
+
+        store = StateStore("test", state_dir=str(tmp_path))
+        assert (store.get("a"), store.get("b")) == (1, 2)
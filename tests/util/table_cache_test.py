@@ -0,0 +1,57 @@
+import os
+import time
+from datetime import timedelta
+
+from astropy.io import votable  # type: ignore[import-untyped]
+from astropy.table import MaskedColumn, Table  # type: ignore[import-untyped]
+
+from across_data_ingestion.util.table_cache import TableCache
+
+
+class TestTableCache:
+    def test_should_return_None_for_missing_key(self, tmp_path):
+        """Should return None when nothing was cached for the key"""
+        cache = TableCache("test", ttl=timedelta(hours=1), cache_dir=str(tmp_path))
+        assert cache.get("missing") is None
+
+    def test_should_return_cached_table(self, tmp_path):
+        """Should return the table that was cached for the key"""
+        cache = TableCache("test", ttl=timedelta(hours=1), cache_dir=str(tmp_path))
+        table = Table(
+            {
+                "obs_id": ["1", "2"],
+                "t_plan_exptime": MaskedColumn([1.0, 2.0], mask=[False, True]),
+            }
+        )
+
+        cache.put("key", table)
+        cached_table = cache.get("key")
+
+        assert list(cached_table["obs_id"]) == ["1", "2"]
+        assert list(cached_table["t_plan_exptime"].mask) == [False, True]
+
+    def test_should_cache_votable_string_columns(self, tmp_path):
+        """Should cache TAP results whose char fields decode to object columns"""
+        cache = TableCache("test", ttl=timedelta(hours=1), cache_dir=str(tmp_path))
+        mock_votable_file = os.path.join(
+            os.path.dirname(__file__), "mocks/", "mock_votable.xml"
+        )
+        table = votable.parse(mock_votable_file).get_first_table().to_table()
+
+        cache.put("key", table)
+        cached_table = cache.get("key")
+
+        assert cached_table.colnames == table.colnames
+        assert list(cached_table["start_date"]) == list(table["start_date"])
+        assert list(cached_table["obsid"]) == list(table["obsid"])
+
+    def test_should_return_None_for_expired_table(self, tmp_path):
+        """Should return None once the cached table is older than the TTL"""
+        cache = TableCache("test", ttl=timedelta(hours=1), cache_dir=str(tmp_path))
+        cache.put("key", Table({"obs_id": ["1"]}))
+
+        # age the cached file past the TTL
+        two_hours_ago = time.time() - 2 * 60 * 60
+        os.utime(cache._path("key"), (two_hours_ago, two_hours_ago))
+
+        assert cache.get("key") is None
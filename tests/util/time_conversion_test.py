@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from astropy.time import Time  # type: ignore[import-untyped]
+
+from across_data_ingestion.util.time_conversion import (
+    to_datetime_column,
+    to_datetimes,
+    to_isot,
+)
+
+MJD_VALUES = [60000.5, 60001.123456789, 60002.999999]
+YDAY_VALUES = ["2025:230:12:00:00", "2025:001:00:00:00.123"]
+
+
+class TestToIsot:
+    def test_should_match_astropy_mjd(self):
+        """Should convert MJD times to the same isot strings as astropy"""
+        expected = [Time(f"{mjd}", format="mjd").isot for mjd in MJD_VALUES]
+        assert to_isot(MJD_VALUES, format="mjd") == expected
+
+    def test_should_match_astropy_yday(self):
+        """Should convert yday times to the same isot strings as astropy"""
+        expected = [Time(yday, format="yday").isot for yday in YDAY_VALUES]
+        assert to_isot(pd.Series(YDAY_VALUES), format="yday") == expected
+
+    def test_should_convert_isot_strings(self):
+        """Should normalize isot strings to millisecond precision"""
+        assert to_isot(pd.Series(["2025-08-04T12:00:00"]), format="isot") == [
+            "2025-08-04T12:00:00.000"
+        ]
+
+    def test_should_convert_mission_elapsed_times(self):
+        """Should add the mission elapsed seconds to the epoch"""
+        epoch = Time("2001-01-01T00:00:00", scale="utc")
+        assert to_isot([0.0, 3600.5], format="met", epoch=epoch) == [
+            "2001-01-01T00:00:00.000",
+            "2001-01-01T01:00:00.500",
+        ]
+
+    def test_should_raise_without_epoch_for_mission_elapsed_times(self):
+        """Should raise a ValueError when no epoch is given for mission elapsed times"""
+        with pytest.raises(ValueError):
+            to_isot([0.0], format="met")
+
+    def test_should_return_empty_list_for_empty_column(self):
+        """Should return an empty list when there are no times"""
+        assert to_isot(pd.Series([], dtype=object), format="isot") == []
+
+
+class TestToDatetimes:
+    def test_should_convert_jd_to_datetimes(self):
+        """Should convert JD times to naive datetimes"""
+        assert to_datetimes([2460609.5, 2460610.25], format="jd") == [
+            datetime(2024, 10, 26),
+            datetime(2024, 10, 26, 18),
+        ]
+
+
+class TestToDatetimeColumn:
+    def test_should_convert_datetime64_column_to_datetimes(self):
+        """Should convert a datetime64 column to datetime objects, keeping its index"""
+        column = pd.Series(pd.to_datetime(["2025-08-04T12:00:00"]), index=[5])
+
+        converted = to_datetime_column(column)
+
+        assert converted.dtype == object
+        assert converted.to_dict() == {5: datetime(2025, 8, 4, 12)}
+        assert type(converted[5]) is datetime
@@ -1,9 +1,14 @@
 import os
+from datetime import timedelta
+from io import BytesIO
 from unittest.mock import patch
 
 import pytest
+from astropy.io import votable  # type: ignore[import-untyped]
+from astropy.table import Table  # type: ignore[import-untyped]
 
-from across_data_ingestion.util.vo_service import VOService
+from across_data_ingestion.util.table_cache import TableCache
+from across_data_ingestion.util.vo_service import ResultFormat, VOService
 
 
 class TestVOService:
@@ -12,6 +17,7 @@ class TestVOService:
         class MockResponse:
             url = "mock_url"
             text = "response text"
+            content = b"response content"
 
         class MockHttpxAsyncClient:
             response = MockResponse()
@@ -35,20 +41,19 @@ class TestVOService:
         self.mock_xml_root = MockXMLRoot
 
     @pytest.mark.asyncio
-    async def test_initialize_should_save_job_url_as_attr(self):
-        """Should save job url as model attribute when successful"""
+    async def test_initialize_should_return_job_url(self):
+        """Should return the job url when successful"""
         with patch("httpx.AsyncClient", self.mock_client):
             service = VOService(self.url)
-            await service._initialize_query("mock query")
-            assert hasattr(service, "job_url")
+            job_url = await service._initialize_query("mock query")
+            assert job_url == "mock_url"
 
     @pytest.mark.asyncio
     async def test_run_query_should_return_true_when_successful(self):
         """Should return True when run query is successful"""
         with patch("httpx.AsyncClient", self.mock_client):
             service = VOService(self.url)
-            service.job_url = "mock_job_url"
-            query_ran = await service._run_query()
+            query_ran = await service._run_query("mock_job_url")
             assert query_ran is True
 
     @pytest.mark.asyncio
@@ -57,25 +62,24 @@ class TestVOService:
         self.mock_client.response.text = None
         with patch("httpx.AsyncClient", self.mock_client):
             service = VOService(self.url)
-            service.job_url = "mock_job_url"
-            query_ran = await service._run_query()
+            query_ran = await service._run_query("mock_job_url")
             assert query_ran is False
 
-    def test_get_results_should_return_results(self):
+    @pytest.mark.asyncio
+    async def test_get_results_should_return_results(self):
         """Should return query results when running get_results"""
         with (
             patch("httpx.AsyncClient", self.mock_client),
-            patch("httpx.get", return_value=self.mock_client.response),
             patch(
                 "xml.etree.ElementTree.fromstring", return_value=self.mock_xml_root()
             ),
         ):
             service = VOService(self.url)
-            service.job_url = "mock_job_url"
-            results = service._get_results()
+            results = await service._get_results("mock_job_url")
             assert len(results) > 0
 
-    def test_get_results_should_return_empty_string_if_no_results_found(self):
+    @pytest.mark.asyncio
+    async def test_get_results_should_return_empty_string_if_no_results_found(self):
         """Should return an empty string if no results are found"""
 
         class MockBadXMLElement:
@@ -87,12 +91,10 @@ class TestVOService:
 
         with (
             patch("httpx.AsyncClient", self.mock_client),
-            patch("httpx.get", return_value=self.mock_client.response),
             patch("xml.etree.ElementTree.fromstring", return_value=MockBadXMLRoot()),
         ):
             service = VOService(self.url)
-            service.job_url = "mock_job_url"
-            results = service._get_results()
+            results = await service._get_results("mock_job_url")
             assert len(results) == 0
 
     @pytest.mark.asyncio
@@ -101,19 +103,17 @@ class TestVOService:
         mock_votable_file = os.path.join(
             os.path.dirname(__file__), "mocks/", "mock_votable.xml"
         )
-        with open(mock_votable_file, "r") as f:
+        with open(mock_votable_file, "rb") as f:
             table = f.read()
-            self.mock_client.response.text = table
+            self.mock_client.response.content = table
             with (
                 patch("httpx.AsyncClient", self.mock_client),
-                patch("httpx.get", return_value=self.mock_client.response),
                 patch(
                     "xml.etree.ElementTree.fromstring",
                     return_value=self.mock_xml_root(),
                 ),
             ):
                 service = VOService(self.url)
-                service.job_url = "mock_job_url"
                 results = await service.query("mock query")
                 assert len(results) > 0
 
@@ -121,11 +121,295 @@ class TestVOService:
     async def test_query_should_return_None_for_no_results(self):
         """Should return None when query finds no results"""
         self.mock_client.response.text = None
+        self.mock_client.response.content = None
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            results = await service.query("mock query")
+            assert results is None
+
+    @pytest.mark.parametrize(
+        ["url", "expected_sync_url"],
+        [
+            ("https://mock.tap/async", "https://mock.tap/sync"),
+            ("https://mock.tap/async/", "https://mock.tap/sync"),
+            ("https://mock.tap", "https://mock.tap/sync"),
+        ],
+    )
+    def test_should_build_sync_url_from_service_url(
+        self, url: str, expected_sync_url: str
+    ):
+        """Should derive the synchronous TAP endpoint from the service url"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(url)
+            assert service._sync_url == expected_sync_url
+
+    @pytest.mark.parametrize(
+        ["query", "expected_rows", "is_small"],
+        [
+            ("SELECT * FROM mock", None, False),
+            ("SELECT TOP 10 * FROM mock", None, True),
+            ("select top 100000 * from mock", None, False),
+            ("SELECT * FROM mock", 10, True),
+            ("SELECT * FROM mock", 100000, False),
+        ],
+    )
+    def test_should_only_consider_bounded_queries_small(
+        self, query: str, expected_rows: int | None, is_small: bool
+    ):
+        """Should run queries synchronously only when their size is known and small"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            assert service._is_small_query(query, expected_rows) is is_small
+
+    @pytest.mark.asyncio
+    async def test_query_should_use_sync_endpoint_for_small_queries(self):
+        """Should return the sync results without submitting an async job"""
+        mock_votable_file = os.path.join(
+            os.path.dirname(__file__), "mocks/", "mock_votable.xml"
+        )
+        with open(mock_votable_file, "rb") as f:
+            self.mock_client.response.status_code = 200
+            self.mock_client.response.content = f.read()
+
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with patch.object(service, "_initialize_query") as mock_initialize:
+                results = await service.query("mock query", expected_rows=1)
+                mock_initialize.assert_not_called()
+                assert len(results) > 0
+
+    @pytest.mark.asyncio
+    async def test_query_should_fall_back_to_async_when_sync_overflows(self):
+        """Should submit an async job when the sync results were truncated"""
+        mock_votable_file = os.path.join(
+            os.path.dirname(__file__), "mocks/", "mock_votable.xml"
+        )
+        with open(mock_votable_file, "rb") as f:
+            self.mock_client.response.status_code = 200
+            # services report truncation in a trailing INFO after the table
+            self.mock_client.response.content = f.read().replace(
+                b"</TABLE>", b"</TABLE>\n<INFO name='QUERY_STATUS' value='OVERFLOW'/>"
+            )
+
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with (
+                patch.object(service, "_initialize_query") as mock_initialize,
+                patch.object(service, "_run_query", return_value=False),
+            ):
+                await service.query("mock query", expected_rows=1)
+                mock_initialize.assert_called_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "content",
+        [b"<html><body>Internal Server Error</body></html>", b"not a votable"],
+    )
+    async def test_query_should_fall_back_to_async_when_sync_results_are_invalid(
+        self, content: bytes
+    ):
+        """Should submit an async job when the sync response is not a VOTable"""
+        self.mock_client.response.status_code = 200
+        self.mock_client.response.content = content
+
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url, result_format=ResultFormat.VOTABLE_BINARY2)
+            with (
+                patch.object(service, "_initialize_query") as mock_initialize,
+                patch.object(service, "_run_query", return_value=False),
+            ):
+                await service.query("mock query", expected_rows=1)
+                mock_initialize.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_query_many_should_return_results_in_query_order(self):
+        """Should return one result per query, in the order of the queries"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with patch.object(
+                service, "query", side_effect=lambda query, expected_rows: query
+            ):
+                results = await service.query_many(["query 1", "query 2"])
+                assert results == ["query 1", "query 2"]
+
+    @pytest.mark.asyncio
+    async def test_query_many_should_keep_job_state_per_query(self):
+        """Should run each concurrent query against its own job url"""
+        job_urls_by_query = {"query 1": "job_1", "query 2": "job_2"}
+
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with (
+                patch.object(
+                    service,
+                    "_initialize_query",
+                    side_effect=lambda query: job_urls_by_query[query],
+                ),
+                patch.object(
+                    service, "_run_query", return_value=False
+                ) as mock_run_query,
+            ):
+                await service.query_many(list(job_urls_by_query))
+
+                ran_job_urls = [call.args[0] for call in mock_run_query.call_args_list]
+                assert sorted(ran_job_urls) == ["job_1", "job_2"]
+
+    @pytest.mark.asyncio
+    async def test_query_by_keys_should_split_keys_into_chunks(self):
+        """Should run one query per chunk of keys"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with patch.object(service, "query", return_value=None) as mock_query:
+                await service.query_by_keys(
+                    "SELECT * FROM mock WHERE id IN ({keys})",
+                    keys=[str(key) for key in range(5)],
+                    chunk_size=2,
+                )
+                assert mock_query.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_query_by_keys_should_quote_keys_as_adql_strings(self):
+        """Should replace the placeholder with quoted and escaped keys"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with patch.object(service, "query", return_value=None) as mock_query:
+                await service.query_by_keys(
+                    "SELECT * FROM mock WHERE id IN ({keys})", keys=["1", "o'b"]
+                )
+                query = mock_query.call_args.args[0]
+                assert query == "SELECT * FROM mock WHERE id IN ('1', 'o''b')"
+
+    @pytest.mark.asyncio
+    async def test_query_by_keys_should_stack_chunk_tables(self):
+        """Should concatenate the tables of each chunk"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with patch.object(
+                service,
+                "query",
+                side_effect=[Table({"id": ["1", "2"]}), Table({"id": ["3"]})],
+            ):
+                table = await service.query_by_keys(
+                    "SELECT * FROM mock WHERE id IN ({keys})",
+                    keys=["1", "2", "3"],
+                    chunk_size=2,
+                )
+                assert list(table["id"]) == ["1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_query_by_keys_should_return_None_when_no_chunk_has_results(self):
+        """Should return None when no chunk returns results"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url)
+            with patch.object(service, "query", return_value=None):
+                table = await service.query_by_keys(
+                    "SELECT * FROM mock WHERE id IN ({keys})", keys=["1"]
+                )
+                assert table is None
+
+    @pytest.mark.parametrize(
+        ["result_format", "expected_format"],
+        [
+            (ResultFormat.VOTABLE, "votable"),
+            (
+                ResultFormat.VOTABLE_BINARY2,
+                "application/x-votable+xml;serialization=BINARY2",
+            ),
+            (ResultFormat.CSV, "csv"),
+        ],
+    )
+    def test_should_request_configured_result_format(
+        self, result_format: ResultFormat, expected_format: str
+    ):
+        """Should request the results in the configured serialization"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url, result_format=result_format)
+            data = service._build_query_data("mock query")
+            assert data["FORMAT"] == expected_format
+
+    def test_should_decode_binary2_votable_bytes(self):
+        """Should decode BINARY2 serialized VOTable bytes into a table"""
+        table = Table({"obsid": [1, 2], "instrument": ["ACIS", "HRC"]})
+        votable_file = votable.from_table(table)
+        votable_file.get_first_table().format = "binary2"
+        content = BytesIO()
+        votable_file.to_xml(content)
+
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url, result_format=ResultFormat.VOTABLE_BINARY2)
+            decoded = service._to_astropy_table(content.getvalue())
+            assert list(decoded["instrument"]) == ["ACIS", "HRC"]
+
+    def test_should_decode_csv_bytes(self):
+        """Should decode CSV bytes into a table with typed columns"""
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url, result_format=ResultFormat.CSV)
+            decoded = service._to_astropy_table(b"obsid,ra\n1,10.5\n2,11.5\n")
+            assert decoded["ra"].dtype.kind == "f"
+
+    @pytest.mark.asyncio
+    async def test_query_should_return_cached_table_without_querying(self, tmp_path):
+        """Should return the cached results without contacting the service"""
+        cache = TableCache("test", ttl=timedelta(hours=1), cache_dir=str(tmp_path))
+
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url, cache=cache)
+            cache.put(
+                service._build_cache_key("SELECT * FROM mock"),
+                Table({"obsid": [1]}),
+            )
+
+            with patch.object(service, "_query_service") as mock_query_service:
+                table = await service.query("SELECT * FROM mock")
+                mock_query_service.assert_not_called()
+                assert list(table["obsid"]) == [1]
+
+    @pytest.mark.asyncio
+    async def test_query_should_cache_results(self, tmp_path):
+        """Should cache the results of a query against the service"""
+        cache = TableCache("test", ttl=timedelta(hours=1), cache_dir=str(tmp_path))
+        mock_votable_file = os.path.join(
+            os.path.dirname(__file__), "mocks/", "mock_votable.xml"
+        )
+        tap_table = votable.parse(mock_votable_file).get_first_table().to_table()
+
+        with patch("httpx.AsyncClient", self.mock_client):
+            service = VOService(self.url, cache=cache)
+            with patch.object(service, "_query_service", return_value=tap_table):
+                await service.query("SELECT * FROM mock")
+
+            cached_table = cache.get(service._build_cache_key("SELECT * FROM mock"))
+            assert list(cached_table["instrument"]) == list(tap_table["instrument"])
+
+    @pytest.mark.asyncio
+    async def test_query_should_return_results_when_caching_fails(self, tmp_path):
+        """Should log the cache write failure and still return the results"""
+        cache = TableCache("test", ttl=timedelta(hours=1), cache_dir=str(tmp_path))
+
         with (
             patch("httpx.AsyncClient", self.mock_client),
-            patch("httpx.get", return_value=self.mock_client.response),
+            patch("across_data_ingestion.util.vo_service.logger") as mock_logger,
         ):
+            service = VOService(self.url, cache=cache)
+            with (
+                patch.object(
+                    service, "_query_service", return_value=Table({"obsid": [1]})
+                ),
+                patch.object(cache, "put", side_effect=OSError("disk full")),
+            ):
+                table = await service.query("SELECT * FROM mock")
+
+            assert list(table["obsid"]) == [1]
+            assert "Could not cache" in mock_logger.warning.call_args.args[0]
+
+    def test_cache_key_should_ignore_whitespace_outside_string_literals(self):
+        """Should normalize whitespace without changing string literals"""
+        with patch("httpx.AsyncClient", self.mock_client):
             service = VOService(self.url)
-            service.job_url = "mock_job_url"
-            results = await service.query("mock query")
-            assert results is None
+
+            key = service._build_cache_key("SELECT *\n   FROM mock WHERE a = 'x  y'")
+            same_key = service._build_cache_key(" SELECT * FROM mock WHERE a = 'x  y'")
+            other_key = service._build_cache_key("SELECT * FROM mock WHERE a = 'x y'")
+
+            assert key == same_key
+            assert key != other_key